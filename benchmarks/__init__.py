@@ -0,0 +1,17 @@
+"""
+Offline benchmarks of litewax hot paths against a local node stand-in.
+Run with `python -m benchmarks --help`
+"""
+from .fakenode import FakeNode, LocalTransport
+from .suite import BENCHMARKS, BenchEnv, benchmark
+from .runner import run, compare
+
+__all__ = [
+    'FakeNode',
+    'LocalTransport',
+    'BENCHMARKS',
+    'BenchEnv',
+    'benchmark',
+    'run',
+    'compare',
+]
@@ -0,0 +1,35 @@
+import sys
+import json
+import argparse
+
+from .runner import run, compare
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="litewax benchmarks against a local node stand-in")
+    parser.add_argument("-k", dest="names", action="append", help="run benchmarks containing this substring (repeatable)")
+    parser.add_argument("--rounds", type=int, help="fixed number of timed calls per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to spend per benchmark (default 0.5)")
+    parser.add_argument("--latency", type=float, default=0.0, help="node response delay in ms")
+    parser.add_argument("--save", help="write results to json file")
+    parser.add_argument("--compare", help="baseline json file, exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown against baseline (default 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run(args.names, rounds=args.rounds, min_time=args.min_time, latency=args.latency / 1000)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({x.name: x.to_dict() for x in results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
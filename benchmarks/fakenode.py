@@ -0,0 +1,313 @@
+import json
+import base64
+import time
+import hashlib
+import threading
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from requests.adapters import HTTPAdapter
+
+from litewax.serializer import AbiSerializer, NAME_CHARMAP, abi_to_bin
+from litewax.transport import Transport
+
+WAX_CHAIN_ID = "1064487b3cd1a897ce03ae5b6a865651747e2e152090f99c1d19d44e01aea5a4"
+
+# default node, hardcoded WCW, payer and push endpoints served by the stand-in
+REMOTE_HOSTS = (
+    "https://wax.greymass.com",
+    "https://api-idm.wax.io",
+    "https://public-wax-on.wax.io",
+    "https://wax-mainnet-signer.api.atomichub.io",
+    "https://cpu.neftyblocks.com",
+    "https://cpu-test.neftyblocks.com",
+    "https://wax.neftyblocks.com",
+    "https://wax-testnet.neftyblocks.com",
+)
+
+# valid K1 signature (signatures are not verified by the stand-in)
+SIGNATURE = "SIG_K1_KfQ57wLFFiPR85zjuQyZsn7hK3jRicHXg4qETxLvxH6fbgMacWHtXV3i3nAYKr7yrEchk8v5JmbQ3KLgLVG1NHNwDbLHgA"
+
+ABIS = {
+    "eosio.token": {
+        "version": "eosio::abi/1.1",
+        "structs": [
+            {"name": "transfer", "base": "", "fields": [
+                {"name": "from", "type": "name"},
+                {"name": "to", "type": "name"},
+                {"name": "quantity", "type": "asset"},
+                {"name": "memo", "type": "string"}
+            ]},
+            {"name": "account", "base": "", "fields": [{"name": "balance", "type": "asset"}]},
+            {"name": "row", "base": "", "fields": [
+                {"name": "id", "type": "uint64"},
+                {"name": "owner", "type": "name"},
+                {"name": "balance", "type": "asset"}
+            ]}
+        ],
+        "actions": [{"name": "transfer", "type": "transfer"}],
+        "tables": [
+            {"name": "accounts", "index_type": "i64", "key_names": [], "key_types": [], "type": "account"},
+            {"name": "rows", "index_type": "i64", "key_names": [], "key_types": [], "type": "row"}
+        ]
+    },
+    "res.pink": {
+        "version": "eosio::abi/1.1",
+        "structs": [{"name": "noop", "base": "", "fields": []}],
+        "actions": [{"name": "noop", "type": "noop"}]
+    },
+    "neftybrespay": {
+        "version": "eosio::abi/1.1",
+        "structs": [{"name": "paycpu", "base": "", "fields": []}],
+        "actions": [{"name": "paycpu", "type": "paycpu"}]
+    },
+}
+
+
+def bench_name(index: int) -> str:
+    """
+    Deterministic account name of benchmark cosigner
+    """
+    letters = NAME_CHARMAP[6:]
+    suffix = ""
+    while True:
+        index, rest = divmod(index, len(letters))
+        suffix = letters[rest] + suffix
+        if not index:
+            break
+    return f"bench{suffix}"
+
+
+class FakeNode:
+    """
+    Local HTTP stand-in for a WAX node, WCW and payer signer endpoints
+    ### Methods:
+    - start
+    - stop
+    """
+    def __init__(self, latency: float=0.0, table_size: int=10000):
+        self.latency = latency
+        self.table_size = table_size
+        self.hits = {}
+        self.accounts = {}
+        self.wcw_delay = 0.0
+        self.wcw_in_flight = 0
+        self.wcw_peak = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._serializers = {name: AbiSerializer(abi) for name, abi in ABIS.items()}
+        self._head = 200000000
+        self._rows = None
+
+    def __str__(self):
+        return f"FakeNode(url={self.url}, latency={self.latency})"
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "FakeNode":
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body in one segment, no Nagle / delayed ACK stalls
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, code: int, body):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_OPTIONS(self):
+                with node._lock:
+                    key = f"OPTIONS {urlsplit(self.path).path}"
+                    node.hits[key] = node.hits.get(key, 0) + 1
+                self.send_response(204)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                self._handle({})
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self._handle(json.loads(body) if body else {})
+
+            def _handle(self, payload: dict):
+                if node.latency:
+                    time.sleep(node.latency)
+                path = urlsplit(self.path).path
+                with node._lock:
+                    node.hits[path] = node.hits.get(path, 0) + 1
+
+                route = node.ROUTES.get(path)
+                if route is None:
+                    return self._reply(404, {"code": 404, "message": f"Unknown endpoint {path}"})
+                self._reply(200, route(node, payload, self))
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def get_info(self, payload: dict, request) -> dict:
+        self._head += 1
+        return {
+            "server_version": "fake",
+            "chain_id": WAX_CHAIN_ID,
+            "head_block_num": self._head,
+            "last_irreversible_block_num": self._head - 330,
+            "head_block_time": time.strftime("%Y-%m-%dT%H:%M:%S.000", time.gmtime()),
+        }
+
+    def get_block(self, payload: dict, request) -> dict:
+        num = int(payload["block_num_or_id"])
+        return {"block_num": num, "id": f"{num:08x}" + "ab" * 28, "ref_block_prefix": num * 2654435761 % 2 ** 32}
+
+    def get_accounts_by_authorizers(self, payload: dict, request) -> dict:
+        return {"accounts": [
+            {"account_name": self.account(key), "permission_name": "active", "authorizing_key": key, "weight": 1, "threshold": 1}
+            for key in payload.get("keys", [])
+        ]}
+
+    def account(self, key: str) -> str:
+        with self._lock:
+            if key not in self.accounts:
+                self.accounts[key] = bench_name(len(self.accounts))
+            return self.accounts[key]
+
+    def get_account(self, payload: dict, request) -> dict:
+        return {
+            "account_name": payload["account_name"],
+            "cpu_limit": {"used": 1000, "available": 99000, "max": 100000},
+            "net_limit": {"used": 1000, "available": 999000, "max": 1000000},
+        }
+
+    def get_raw_abi(self, payload: dict, request) -> dict:
+        raw = abi_to_bin(ABIS[payload["account_name"]])
+        return {
+            "account_name": payload["account_name"],
+            "abi_hash": hashlib.sha256(raw).hexdigest(),
+            "abi": base64.b64encode(raw).decode()
+        }
+
+    def get_abi(self, payload: dict, request) -> dict:
+        return {"account_name": payload["account_name"], "abi": ABIS[payload["account_name"]]}
+
+    def abi_json_to_bin(self, payload: dict, request) -> dict:
+        return {"binargs": self._serializers[payload["code"]].json_to_bin(payload["action"], payload["args"])}
+
+    def _table(self) -> tuple:
+        """
+        json and binary rows of eosio.token `rows` table, built once
+        """
+        if self._rows is None:
+            serializer = self._serializers["eosio.token"]
+            rows = [{"id": i, "owner": bench_name(i), "balance": f"{i}.00000000 WAX"} for i in range(self.table_size)]
+            self._rows = rows, [serializer.serialize("row", x).hex() for x in rows]
+        return self._rows
+
+    def get_table_rows(self, payload: dict, request) -> dict:
+        lower = int(payload.get("lower_bound") or 0)
+        upper = min(int(payload.get("upper_bound") or self.table_size - 1), self.table_size - 1)
+        ids = range(lower, min(upper + 1, lower + int(payload.get("limit", 10))))
+        rows = self._table()[0 if payload.get("json", True) else 1][ids.start:ids.stop]
+
+        more = ids.stop <= upper
+        return {"rows": rows, "more": more, "next_key": str(ids.stop) if more else ""}
+
+    def push_transaction(self, payload: dict, request) -> dict:
+        packed = bytes.fromhex(payload["packed_trx"])
+        return {
+            "transaction_id": hashlib.sha256(packed).hexdigest(),
+            "processed": {
+                "receipt": {"status": "executed", "cpu_usage_us": 250, "net_usage_words": len(packed) // 8 + 12},
+                "action_traces": []
+            }
+        }
+
+    def wcw_login(self, payload: dict, request) -> dict:
+        cookie = request.headers.get("Cookie", "").partition("session_token=")[2].split(";")[0]
+        return {"userAccount": self.account(f"cookie:{cookie}")}
+
+    def wcw_sign(self, payload: dict, request) -> dict:
+        with self._lock:
+            self.wcw_in_flight += 1
+            self.wcw_peak = max(self.wcw_peak, self.wcw_in_flight)
+        try:
+            # slow wallet, lets concurrent sign requests overlap
+            time.sleep(self.wcw_delay)
+        finally:
+            with self._lock:
+                self.wcw_in_flight -= 1
+        return {"signatures": [SIGNATURE]}
+
+    def atomichub_sign(self, payload: dict, request) -> dict:
+        return {"success": True, "data": [SIGNATURE]}
+
+    def nefty_sign(self, payload: dict, request) -> dict:
+        return {"signatures": [SIGNATURE]}
+
+    ROUTES = {
+        "/v1/chain/get_info": get_info,
+        "/v1/chain/get_block": get_block,
+        "/v1/chain/get_accounts_by_authorizers": get_accounts_by_authorizers,
+        "/v1/chain/get_account": get_account,
+        "/v1/chain/get_raw_abi": get_raw_abi,
+        "/v1/chain/get_abi": get_abi,
+        "/v1/chain/abi_json_to_bin": abi_json_to_bin,
+        "/v1/chain/get_table_rows": get_table_rows,
+        "/v1/chain/push_transaction": push_transaction,
+        "/v1/chain/send_transaction": push_transaction,
+        "/v1/accounts/auto-accept/login": wcw_login,
+        "/wam/sign": wcw_sign,
+        "/v1/sign": atomichub_sign,
+        "/": nefty_sign,
+    }
+
+
+class LocalAdapter(HTTPAdapter):
+    """
+    Send requests for remote hosts to the stand-in (path is kept)
+    """
+    def __init__(self, target: str, **kwargs):
+        super().__init__(**kwargs)
+        self.target = target
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = self.target + parts.path + (f"?{parts.query}" if parts.query else "")
+        return super().send(request, **kwargs)
+
+
+class LocalTransport(Transport):
+    """
+    `Transport` whose sessions reach WCW and payer hosts on the stand-in
+    """
+    def __init__(self, target: str, **kwargs):
+        super().__init__(**kwargs)
+        self.local_adapter = LocalAdapter(target, pool_maxsize=self.pool_size)
+        self._mount_local(self.session)
+
+    def _mount_local(self, session):
+        for host in REMOTE_HOSTS:
+            session.mount(host, self.local_adapter)
+
+    def scraper(self, browser: dict=None, headers: dict=None, key: str=None):
+        scraper = super().scraper(browser=browser, headers=headers, key=key)
+        self._mount_local(scraper)
+        return scraper
@@ -0,0 +1,82 @@
+import time
+import statistics
+from typing import List
+
+
+class Result:
+    """
+    Timings of one benchmark (seconds per call)
+    """
+    __slots__ = ('name', 'ops', 'times')
+
+    def __init__(self, name: str, ops: int, times: List[float]):
+        self.name = name
+        self.ops = ops
+        self.times = times
+
+    def __str__(self):
+        return f"{self.name:<34} median {self.median * 1000:10.3f} ms   min {self.min * 1000:10.3f} ms   {self.ops_per_sec:12.1f} ops/s   ({len(self.times)} rounds)"
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def min(self) -> float:
+        return min(self.times)
+
+    @property
+    def ops_per_sec(self) -> float:
+        return self.ops / self.median if self.median else float('inf')
+
+    def to_dict(self) -> dict:
+        return {"ops": self.ops, "median": self.median, "min": self.min, "rounds": len(self.times)}
+
+
+def measure(func, ops: int=1, rounds: int=None, min_time: float=0.5, max_rounds: int=1000) -> List[float]:
+    """
+    Time `func` calls after one warmup call, at least `min_time` seconds
+    (or exactly `rounds` calls)
+    """
+    func()
+    times = []
+    start = time.perf_counter()
+    while True:
+        t = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t)
+        if rounds is not None:
+            if len(times) >= rounds:
+                return times
+        elif time.perf_counter() - start >= min_time or len(times) >= max_rounds:
+            return times
+
+
+def run(names: List[str]=None, rounds: int=None, min_time: float=0.5, latency: float=0.0, echo=print) -> List[Result]:
+    """
+    Run benchmarks (all or `names` substrings) in a fresh environment
+    """
+    from .suite import BENCHMARKS, BenchEnv
+
+    results = []
+    with BenchEnv(latency=latency) as env:
+        for name, (setup, ops) in BENCHMARKS.items():
+            if names and not any(x in name for x in names):
+                continue
+            result = Result(name, ops, measure(setup(env), ops, rounds=rounds, min_time=min_time))
+            if echo:
+                echo(str(result))
+            results.append(result)
+    return results
+
+
+def compare(results: List[Result], baseline: dict, threshold: float=0.25) -> List[str]:
+    """
+    Benchmarks whose median is more than `threshold` slower than baseline
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base and result.median > base["median"] * (1 + threshold):
+            regressions.append(f"{result.name}: {base['median'] * 1000:.3f} ms -> {result.median * 1000:.3f} ms")
+    return regressions
@@ -0,0 +1,212 @@
+import os
+import sys
+import shutil
+import tempfile
+from typing import Callable
+
+import eospy.keys
+
+import litewax
+from litewax.transport import get_transport, set_transport
+from litewax.contract import registry
+from litewax.action import serialize_actions
+from litewax.signer import Signer, BACKENDS, coincurve, sign_batch
+from litewax.pipeline import TransactionPipeline
+from litewax.batcher import ActionBatcher
+
+from .fakenode import FakeNode, LocalTransport
+
+# eosio development key
+DEV_KEY = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str, ops: int=1):
+    """
+    Register benchmark. Decorated function gets `BenchEnv`, does its setup
+    and returns the callable to time, `ops` operations per call
+    """
+    def wrap(func: Callable) -> Callable:
+        BENCHMARKS[name] = (func, ops)
+        return func
+    return wrap
+
+
+class BenchEnv:
+    """
+    Fake node, process transport and working directory (generated contracts) of a run
+    ### Methods:
+    - start
+    - close
+    - client
+    - multisig
+    - transfer
+    """
+    def __init__(self, latency: float=0.0):
+        self.node = FakeNode(latency=latency)
+        self.workdir = None
+        self._cwd = None
+        self._transport = None
+        self._keys = {}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self) -> "BenchEnv":
+        self.node.start()
+        self.url = self.node.url
+        self.workdir = tempfile.mkdtemp(prefix="litewax-bench-")
+        self._cwd = os.getcwd()
+        os.chdir(self.workdir)
+        sys.path.insert(0, self.workdir)
+
+        self._transport = get_transport()
+        self.transport = LocalTransport(self.url)
+        set_transport(self.transport)
+        registry.invalidate()
+        return self
+
+    def close(self):
+        registry.invalidate()
+        set_transport(self._transport)
+        self.transport.close()
+        os.chdir(self._cwd)
+        sys.path.remove(self.workdir)
+        for module in [x for x in sys.modules if x == "contracts" or x.startswith("contracts.")]:
+            del sys.modules[module]
+        shutil.rmtree(self.workdir, ignore_errors=True)
+        self.node.stop()
+
+    def key(self, index: int) -> str:
+        if index == 0:
+            return DEV_KEY
+        if index not in self._keys:
+            self._keys[index] = str(eospy.keys.EOSKey().to_wif())
+        return self._keys[index]
+
+    def client(self, index: int=0, **kwargs) -> litewax.Client:
+        return litewax.Client(private_key=self.key(index), node=self.url, transport=self.transport, **kwargs)
+
+    def wcw_client(self, index: int=0) -> litewax.Client:
+        return litewax.Client(cookie=f"cookie{index}", node=self.url, transport=self.transport)
+
+    def multisig(self, keys: int=0, cookies: int=0) -> litewax.MultiSigClient:
+        return litewax.MultiSigClient(
+            private_keys=[self.key(i) for i in range(keys)],
+            cookies=[f"cookie{i}" for i in range(cookies)],
+            node=self.url, transport=self.transport)
+
+    def transfer(self, actor: str, amount: int=1):
+        token = litewax.Contract("eosio.token", actor=actor, node=self.url)
+        return token.transfer(_from=actor, to="eosio", quantity=f"{amount}.00000000 WAX", memo="bench")
+
+
+@benchmark("contract.cached")
+def contract_cached(env: BenchEnv):
+    litewax.Contract("eosio.token", actor="bencha", node=env.url)
+    return lambda: litewax.Contract("eosio.token", actor="bencha", node=env.url)
+
+@benchmark("contract.load")
+def contract_load(env: BenchEnv):
+    litewax.Contract("eosio.token", actor="bencha", node=env.url)
+
+    def run():
+        registry.invalidate()
+        litewax.Contract("eosio.token", actor="bencha", node=env.url)
+    return run
+
+@benchmark("actions.serialize", ops=100)
+def actions_serialize(env: BenchEnv):
+    env.transfer("bencha")
+    return lambda: serialize_actions([env.transfer("bencha", i) for i in range(100)])
+
+@benchmark("tx.extend_info")
+def tx_extend_info(env: BenchEnv):
+    client = env.client()
+    action = env.transfer(client.name)
+    return lambda: client.Transaction(action).get_trx_extend_info()
+
+@benchmark("tx.push")
+def tx_push(env: BenchEnv):
+    client = env.client()
+    action = env.transfer(client.name)
+    return lambda: client.Transaction(action).push()
+
+@benchmark("tx.push_wcw")
+def tx_push_wcw(env: BenchEnv):
+    client = env.wcw_client()
+    action = env.transfer(client.name)
+    return lambda: client.Transaction(action).push()
+
+for _backend in BACKENDS:
+    if _backend == "coincurve" and coincurve is None:
+        continue
+
+    def _sign(env: BenchEnv, backend=_backend):
+        signer = Signer(DEV_KEY, backend=backend)
+        digest = "ab" * 32
+        return lambda: signer.sign(digest)
+    benchmark(f"sign.{_backend}")(_sign)
+
+@benchmark("sign.batch", ops=64)
+def sign_batch_64(env: BenchEnv):
+    signer = Signer(DEV_KEY)
+    items = [(f"{i:064x}", signer) for i in range(64)]
+    return lambda: sign_batch(items)
+
+@benchmark("paywith.atomichub")
+def paywith_atomichub(env: BenchEnv):
+    client = env.client()
+    action = env.transfer(client.name)
+    return lambda: client.Transaction(action).pay_with(litewax.Payers.ATOMICHUB).push()
+
+@benchmark("paywith.nefty")
+def paywith_nefty(env: BenchEnv):
+    client = env.client()
+    action = env.transfer(client.name)
+    return lambda: client.Transaction(action).pay_with(litewax.Payers.NEFTY).push()
+
+for _keys, _cookies in ((1, 0), (4, 0), (16, 0), (4, 4)):
+    def _multisig(env: BenchEnv, keys=_keys, cookies=_cookies):
+        client = env.multisig(keys=keys, cookies=cookies)
+        actions = [env.transfer(x.name) for x in client]
+        return lambda: client.Transaction(*actions).push()
+    benchmark(f"multisig.push[{_keys}keys+{_cookies}wcw]")(_multisig)
+
+@benchmark("multisig.init[64keys]", ops=64)
+def multisig_init(env: BenchEnv):
+    keys = [env.key(i) for i in range(64)]
+    return lambda: litewax.MultiSigClient(private_keys=keys, node=env.url, transport=env.transport)
+
+@benchmark("pipeline.push", ops=100)
+def pipeline_push(env: BenchEnv):
+    client = env.client()
+    action = env.transfer(client.name)
+
+    def run():
+        with TransactionPipeline(workers=8, node_rate=None) as pipeline:
+            futures = pipeline.map(client.Transaction(action) for _ in range(100))
+        for future in futures:
+            future.result()
+    return run
+
+@benchmark("batcher.transactions", ops=1000)
+def batcher_transactions(env: BenchEnv):
+    client = env.client()
+    batcher = ActionBatcher(client, cpu_budget_us=10 ** 6)
+    actions = [env.transfer(client.name, i) for i in range(1000)]
+    return lambda: list(batcher.transactions(actions))
+
+@benchmark("table.json", ops=5000)
+def table_json(env: BenchEnv):
+    token = litewax.Contract("eosio.token", node=env.url)
+    return lambda: sum(row["id"] for row in token.rows(upper_bound=4999, limit=1000))
+
+@benchmark("table.binary", ops=5000)
+def table_binary(env: BenchEnv):
+    token = litewax.Contract("eosio.token", node=env.url)
+    return lambda: sum(row["id"] for row in token.rows(upper_bound=4999, limit=1000, binary=True))
@@ -1,17 +1,40 @@
+import importlib
+
 from .contract import Contract
 from .abigen import abigen
-from .client import Client
-from .multisigclient import MultiSigClient
-from .paywith import Payers
+from .types import Payers
+
+# clients are imported on first access, `import litewax` doesn't load
+# http, crypto and eospy machinery until it is used
+_LAZY = {
+    'Client': '.client',
+    'MultiSigClient': '.multisigclient',
+    'AsyncClient': '.asyncclient',
+    'AsyncMultiSigClient': '.asyncmultisigclient',
+}
 
 __all__ = [
-    'Contract', 
+    'Contract',
     'Client',
     'MultiSigClient',
+    'AsyncClient',
+    'AsyncMultiSigClient',
     'Payers',
     'abigen'
 ]
 
 __author__ = 'abuztrade'
 __version__ = '0.1.6'
-__email__ = 'abuztrade.work@gmail.com'
\ No newline at end of file
+__email__ = 'abuztrade.work@gmail.com'
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module 'litewax' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
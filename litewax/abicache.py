@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import base64
+
+from .transport import Transport, PooledCleos, get_transport
+from .nodepool import node_source, node_dir
+from .exceptions import AbiNotFound
+
+
+class AbiCache:
+    """
+    Content-addressed on-disk ABI cache.
+    ABIs are stored once per `abi_hash`, every (node, account) pair points to a hash
+    and is revalidated with a single `get_raw_abi` call after `ttl` seconds
+    (hash and ABI always come from the same reply).
+    `node` may be an url, list of urls, `NodePool` or node api (requests fail over between pool nodes)
+    ### Methods:
+    - get
+    - get_hash
+    - revalidate
+    - fetch
+    - read
+    - async_get_hash
+    - async_revalidate
+    - invalidate
+    """
+    def __init__(self, node="https://wax.greymass.com", path: str="contracts/.abi_cache", ttl: float=300, transport: Transport=None):
+        self.node = node_source(node)
+        self._transport = transport
+        self.path = path
+        self.ttl = ttl
+
+    @property
+    def transport(self) -> Transport:
+        # without explicit transport follow `set_transport`
+        return self._transport or get_transport()
+
+    @property
+    def wax(self) -> PooledCleos:
+        return self.transport.cleos(self.node)
+
+    def _account_file(self, account_name: str) -> str:
+        return os.path.join(self.path, 'accounts', node_dir(self.node), account_name + '.json')
+
+    def _abi_file(self, abi_hash: str) -> str:
+        return os.path.join(self.path, 'abi', abi_hash + '.json')
+
+    @staticmethod
+    def _read(path: str):
+        try:
+            with open(path, "r", encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write(path: str, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _raw_abi_payload(account_name: str, known_hash: str=None) -> dict:
+        payload = {"account_name": account_name}
+        if known_hash:
+            payload["abi_hash"] = known_hash
+        return payload
+
+    @staticmethod
+    def _parse_raw_abi(account_name: str, resp: dict) -> tuple:
+        if not isinstance(resp, dict) or "abi_hash" not in resp:
+            error = resp.get("error", resp) if isinstance(resp, dict) else resp
+            raise AbiNotFound(f"Can't get ABI of {account_name}: {error}")
+        if not resp.get("abi"):
+            return resp["abi_hash"], None
+        from .serializer import abi_from_bin
+        return resp["abi_hash"], abi_from_bin(base64.b64decode(resp["abi"]))
+
+    def fetch(self, account_name: str, known_hash: str=None) -> tuple:
+        """
+        Get current abi_hash and json ABI of account with one `get_raw_abi` call
+        ### Returns:
+        - (abi_hash, abi), abi is None when node skipped body of `known_hash`
+        """
+        resp = self.wax.post("chain.get_raw_abi", json=self._raw_abi_payload(account_name, known_hash), raise_for_status=False)
+        return self._parse_raw_abi(account_name, resp)
+
+    async def _async_fetch(self, wax, account_name: str, known_hash: str=None) -> tuple:
+        resp = await wax.post("chain.get_raw_abi", json=self._raw_abi_payload(account_name, known_hash), raise_for_status=False)
+        return self._parse_raw_abi(account_name, resp)
+
+    def _entry(self, account_name: str, force: bool) -> dict:
+        """
+        Fresh cached entry of account, None when it must be revalidated
+        """
+        entry = self._read(self._account_file(account_name))
+        if entry and not force and time.time() - entry['checked_at'] < self.ttl:
+            return entry
+        return None
+
+    def _known_hash(self, account_name: str) -> str:
+        entry = self._read(self._account_file(account_name))
+        known_hash = entry['abi_hash'] if entry else None
+        # body is skipped only when the stored ABI can be reused
+        if known_hash and os.path.exists(self._abi_file(known_hash)):
+            return known_hash
+        return None
+
+    def _store(self, account_name: str, abi_hash: str, abi: dict) -> dict:
+        if abi is not None and not os.path.exists(self._abi_file(abi_hash)):
+            self._write(self._abi_file(abi_hash), abi)
+        if not os.path.exists(self._abi_file(abi_hash)):
+            raise AbiNotFound(f"Account {account_name} has no contract")
+
+        entry = {"abi_hash": abi_hash, "checked_at": time.time()}
+        self._write(self._account_file(account_name), entry)
+        return entry
+
+    def get_hash(self, account_name: str, force: bool=False) -> str:
+        """
+        Get abi_hash of account, hitting the node only when the entry is older than ttl
+        """
+        entry = self._entry(account_name, force)
+        if entry:
+            return entry['abi_hash']
+        return self.revalidate(account_name)['abi_hash']
+
+    def revalidate(self, account_name: str) -> dict:
+        """
+        Compare cached abi_hash with node and store ABI only if contract was redeployed
+        ### Returns:
+        - {"abi_hash": str, "checked_at": float}
+        """
+        abi_hash, abi = self.fetch(account_name, self._known_hash(account_name))
+        return self._store(account_name, abi_hash, abi)
+
+    async def async_get_hash(self, wax, account_name: str, force: bool=False) -> str:
+        """
+        `get_hash` over async node api (`AsyncCleos`), disk access runs in executor
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        entry = await loop.run_in_executor(None, self._entry, account_name, force)
+        if entry:
+            return entry['abi_hash']
+        return (await self.async_revalidate(wax, account_name))['abi_hash']
+
+    async def async_revalidate(self, wax, account_name: str) -> dict:
+        """
+        `revalidate` over async node api (`AsyncCleos`)
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        known_hash = await loop.run_in_executor(None, self._known_hash, account_name)
+        abi_hash, abi = await self._async_fetch(wax, account_name, known_hash)
+        return await loop.run_in_executor(None, self._store, account_name, abi_hash, abi)
+
+    def read(self, abi_hash: str) -> dict:
+        """
+        Get stored json ABI by hash (no node requests), None if it isn't stored
+        """
+        return self._read(self._abi_file(abi_hash))
+
+    def get(self, account_name: str, force: bool=False) -> dict:
+        """
+        Get json ABI of account
+        """
+        abi = self.read(self.get_hash(account_name, force=force))
+        if abi is None:
+            abi = self.read(self.revalidate(account_name)['abi_hash'])
+        return abi
+
+    def invalidate(self, account_name: str):
+        """
+        Expire cached pointer, next access will revalidate with node
+        """
+        entry = self._read(self._account_file(account_name))
+        if entry:
+            self._write(self._account_file(account_name), {**entry, "checked_at": 0})
@@ -1,39 +1,52 @@
 import os
-import requests
+import re
+
+from .abicache import AbiCache
+from .transport import Transport, get_transport
+from .nodepool import node_source
+
+# bump when generated code changes, contracts generated by older template are regenerated
+TEMPLATE_VERSION = 11
 
 file_start = """from __future__ import annotations
-import eospy.cleos
-import eospy.keys
-import pytz
 import datetime as dt
 from typing import Tuple, Any
+from litewax.action import Action
+from litewax.serializer import AbiSerializer
+from litewax.tables import TableReader, table_reader
+from litewax.transport import get_transport
 
-class Action:
-    def __init__(self, contract: {name}, action: str, args: dict):
-        self.contract = contract
-        self.action = action
-        self.args = args
+TEMPLATE_VERSION = {template_version}
+ABI_HASH = "{abi_hash}"
+ABI = {abi}
 
-        self.result = self()
-    
-    def __str__(self):
-        return f"{name}::{self.action}({self.args})"
-    
-    def __repr__(self):
-        return self.__str__()
+class {name}:
+    __slots__ = ('actor', 'permission', 'node', '_wax')
 
-    def __call__(self):
-        return self.contract.call(self.action, self.args)
+    account = "{normal_name}"
+    serializer = AbiSerializer(ABI)
+    # action name -> field names
+    ACTIONS = {actions}
+    # table name -> row field names
+    TABLES = {tables}
 
-class {name}:
-    def __init__(self, actor: str="", permission: str="active", node: str="https://wax.greymass.com"):
-        self.wax = eospy.cleos.Cleos(url=node, version='v1')
+    def __init__(self, actor: str="", permission: str="active", node="https://wax.greymass.com", wax=None):
         self.actor = actor
         self.permission = permission
+        self.node = node
+        # node api of the client (pool failover, async api)
+        self._wax = wax
 
     def __str__(self):
         return f"{name}(actor={self.actor}, permission={self.permission}, node={self.wax.url})"
 
+    @property
+    def wax(self):
+        if self._wax is not None:
+            return self._wax
+        # one node api for all contracts of the node
+        return get_transport().cleos(self.node)
+
     def set_actor(self, actor: str):
         self.actor = actor
 
@@ -54,13 +67,8 @@ class {name}:
         if not args:
             payload['data'] = ''
             return payload
-            
-        data = self.wax.abi_json_to_bin(
-            payload['account'], 
-            payload['name'], 
-            args
-        )
-        payload['data'] = data['binargs']
+
+        payload['data'] = self.serializer.json_to_bin(payload['name'], args)
         return payload
 
     # ACTIONS
@@ -75,14 +83,32 @@ class {name}:
             - dict
         \"\"\"
 
+        if action not in self.ACTIONS:
+            raise ValueError(f"Unknown action {action} of {normal_name}")
+
         base = self.generatePayload("{normal_name}", action)
 
         return self.return_payload(base, args)
 
 """
 
+file_table = """
+    def {method}(self, scope: str=None, lower_bound=None, upper_bound=None, index_position: int=1, key_type: str="i64", limit: int=100, reverse: bool=False, binary: bool=False) -> TableReader:
+        \"\"\"
+        ## TABLE: {name}.{table}
+        - Row:
+            {description}
+
+        - Returns:
+            - TableReader
+        \"\"\"
+
+        return self.table("{table}", scope, lower_bound, upper_bound, index_position, key_type, limit, reverse, binary)
+
+"""
+
 file_action = """
-    def {action}(self, {args}) -> dict:
+    def {method}(self, {args}) -> dict:
         \"\"\"
         ## ACTION: {name}.{action}
         - Parametrs:
@@ -92,20 +118,48 @@ file_action = """
             - dict
         \"\"\"
 
-        {action}_args = {genargs}
-        return Action(self, "{action}", {action}_args)
+        {method}_args = {genargs}
+        return Action(self, "{action}", {method}_args)
 
 """
 
-file_final = """    # ACTIONS END
+file_tables = """    # ACTIONS END
+
+    # TABLES
+    def table(self, table: str, scope: str=None, lower_bound=None, upper_bound=None, index_position: int=1, key_type: str="i64", limit: int=100, reverse: bool=False, binary: bool=False) -> TableReader:
+        \"\"\"
+        ## READ ANY TABLE
+        Rows are fetched lazily page by page (`limit` rows per request)
+        - Parametrs:
+            - table: str
+            - scope: str (contract account by default)
+            - lower_bound, upper_bound: keys of `index_position` index
+            - key_type: i64, i128, name, sha256, float64...
+            - binary: fetch rows in binary and decode them locally into `__slots__` records
+              (less memory, read fields are decoded lazily; json rows are faster to read whole)
+
+        - Returns:
+            - TableReader (iterate rows, `.parallel(parts)` to scan key subranges concurrently),
+              AsyncTableReader (`async for`) for contracts of async clients
+        \"\"\"
+
+        if table not in self.TABLES:
+            raise ValueError(f"Unknown table {table} of {normal_name}")
+
+        record = self.serializer.table_record(table) if binary else None
+        return table_reader(self.wax, "{normal_name}", table, scope, lower_bound, upper_bound, index_position, key_type, limit, reverse, record=record)
+
+"""
+
+file_final = """    # TABLES END
 
     def push_actions(self, private_keys: Any, *actions) -> Tuple[dict, bool]:
+        import eospy.keys
         trx = {
             "actions": [a.result for a in list(actions)]
         }
             
-        trx['expiration'] = str(
-            (dt.datetime.utcnow() + dt.timedelta(seconds=60)).replace(tzinfo=pytz.UTC))
+        trx['expiration'] = str(dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=60))
 
         if isinstance(private_keys, str):
             private_keys = eospy.keys.EOSKey(private_keys)
@@ -156,6 +210,22 @@ TYPES = {
     'signature': 'str'
 }
 
+PLACEHOLDER = re.compile(r"\{(normal_name|name|template_version|abi_hash|actions|abi|action|description|args|genargs|tables|method|table)\}")
+
+def render(template: str, values: dict) -> str:
+    """
+    Substitute template placeholders in one pass
+    (inserted values are never scanned for placeholders again)
+    """
+    return PLACEHOLDER.sub(lambda m: values.get(m.group(1), m.group(0)), template)
+
+# attributes of generated class
+RESERVED = {
+    'actor', 'permission', 'node', 'account', 'serializer', 'wax', 'set_actor',
+    'generatePayload', 'return_payload', 'call', 'table', 'push_actions', 'create_trx',
+    'ACTIONS', 'TABLES',
+}
+
 def check_ban(text):
     banwords = {
         "from": "_from",
@@ -167,53 +237,107 @@ def check_ban(text):
     else:
         return banwords.get(text)
 
-class abigen():
-    def __init__(self, node: str="https://wax.greymass.com"):
-        self.node = node
-
-    def gen(self, name):
-        actions = self.get_abi(name)
-        out = file_start
-        for action in actions:
-            if action['name'].isupper(): # it's a table
-                continue
-
-        for action in actions:
-            amtext = file_action
-            if action['name'].isupper(): # it's a table
-                continue
-
-            if action.get('fields', {}): 
-
-                formargs = []
-                for x in action.get('fields', {}):
-                    formargs.append(f"{check_ban(x['name'])}: {TYPES.get(x['type'], 'str') if '[]' not in x['type'] else 'list'}")
-
-                args = ', '.join(formargs)
-
-                desc = '\n            '.join([f"- {x['name']}: {x['type']}" for x in action.get('fields', {})])
-
-            else:
-                args= ''
-                desc = ''
-
-            action_args = "{\n" + str(',\n'.join([f"            \"{x['name']}\": {check_ban(x['name'])}" for x in action.get('fields', {})])) + "\n        }"
-
-            for text, target in [
-                ['{action}', action['name']],
-                ['{description}', desc],
-                ['{args}', args],
-                ['{name}', name],
-                ['{genargs}', action_args]
-            ]:
-                amtext = amtext.replace(text, target)
-            
-            out += amtext
+def strip_abi(abi: dict) -> dict:
+    """
+    Keep only ABI parts required for serialization
+    """
+    return {
+        "version": abi.get("version", "eosio::abi/1.1"),
+        "types": abi.get("types", []),
+        "structs": abi.get("structs", []),
+        "actions": [{"name": x["name"], "type": x["type"]} for x in abi.get("actions", [])],
+        "tables": abi.get("tables", []),
+        "variants": abi.get("variants", []),
+    }
 
-        out += file_final
+def struct_fields(structs: dict, name: str) -> list:
+    """
+    Fields of struct `name`, fields of its base structs first
+    """
+    struct = structs.get(name)
+    if struct is None:
+        return []
+    base = struct_fields(structs, struct['base']) if struct.get('base') else []
+    return base + struct.get('fields', [])
 
-        out = out.replace('{normal_name}', name)
-        out = out.replace('{name}', name.replace('.', '_'))
+class abigen():
+    def __init__(self, node="https://wax.greymass.com", cache: AbiCache=None, transport: Transport=None):
+        # url, tuple of urls or NodePool
+        self.node = node_source(node)
+        self._transport = transport
+        self.cache = cache or AbiCache(self.node, transport=transport)
+
+    @property
+    def transport(self) -> Transport:
+        return self._transport or get_transport()
+
+    def gen(self, name, force: bool=False, abi_hash: str=None):
+        # known abi_hash (checked by the caller) is generated from disk without node requests
+        if abi_hash is None:
+            abi_hash = self.cache.get_hash(name, force=force)
+        abi = self.cache.read(abi_hash) or self.cache.get(name)
+        structs = {x['name']: x for x in abi.get('structs', [])}
+        aliases = {x['new_type_name']: x['type'] for x in abi.get('types', [])}
+        out = [file_start]
+
+        # generated methods must not shadow class attributes
+        taken = set(RESERVED)
+        actions = {}
+        for action in abi.get('actions', []):
+            fields = struct_fields(structs, aliases.get(action['type'], action['type']))
+            actions[action['name']] = tuple(x['name'] for x in fields)
+
+            method = action['name'].replace('.', '_')
+            if method in taken:
+                method += '_action'
+            taken.add(method)
+
+            args = ', '.join([
+                f"{check_ban(x['name'])}: {TYPES.get(x['type'], 'str') if '[]' not in x['type'] else 'list'}"
+                for x in fields
+            ])
+            desc = '\n            '.join([f"- {x['name']}: {x['type']}" for x in fields])
+            action_args = "{\n" + str(',\n'.join([f"            \"{x['name']}\": {check_ban(x['name'])}" for x in fields])) + "\n        }"
+
+            out.append(render(file_action, {
+                'action': action['name'],
+                'method': method,
+                'description': desc,
+                'args': args,
+                'name': name,
+                'genargs': action_args
+            }))
+
+        out.append(file_tables)
+
+        tables = {}
+        for x in abi.get('tables', []):
+            fields = struct_fields(structs, aliases.get(x['type'], x['type']))
+            tables[x['name']] = tuple(f['name'] for f in fields)
+
+            method = x['name'].replace('.', '_')
+            if method in taken:
+                method += '_table'
+            taken.add(method)
+
+            out.append(render(file_table, {
+                'method': method,
+                'table': x['name'],
+                'name': name,
+                'description': '\n            '.join([f"- {f['name']}: {f['type']}" for f in fields]),
+            }))
+
+        out.append(file_final)
+
+        out = render(''.join(out), {
+            'tables': repr(tables),
+            'normal_name': name,
+            'name': name.replace('.', '_'),
+            'template_version': str(TEMPLATE_VERSION),
+            'abi_hash': abi_hash,
+            'actions': repr(actions),
+            'abi': repr(strip_abi(abi)),
+        })
 
         if not os.path.exists('contracts'):
             os.makedirs('contracts')
@@ -222,13 +346,21 @@ class abigen():
             f.write(out)
         return out
         
-    def get_abi(self, account_name: str):
-        r = requests.post(f"{self.node}/v1/chain/get_abi", json={"account_name": account_name}).json()
-        return r['abi']['structs']
+    def get_abi(self, account_name: str) -> list:
+        """
+        Structs of contract ABI
+        """
+        return self.get_full_abi(account_name)['structs']
+
+    def get_full_abi(self, account_name: str) -> dict:
+        """
+        Contract ABI (cached)
+        """
+        return self.cache.get(account_name)
 
     def get_tx_info(self, tx: str):
-        return requests.post(f"{self.node}/v1/history/get_transaction",
-                   json={"id": tx, "block_num_hint": 0}).json()
+        return self.transport.cleos(self.node).post("history.get_transaction",
+                   json={"id": tx, "block_num_hint": 0}, raise_for_status=False)
 
 if __name__ == "__main__":
     app = abigen()
@@ -0,0 +1,153 @@
+import os
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import base58
+from eospy.utils import ripemd160
+
+from .abicache import AbiCache
+from .nodepool import node_dir
+
+
+def legacy_key(public_key: str) -> str:
+    """
+    `EOS...` form of `PUB_K1_...` public key (nodes may return either)
+    """
+    if not public_key.startswith('PUB_K1_'):
+        return public_key
+    raw = base58.b58decode(public_key[7:])[:33]
+    return 'EOS' + base58.b58encode(raw + bytes.fromhex(ripemd160(raw)[:8])).decode()
+
+def pick_authorization(accounts: List[dict], permission: str="active") -> dict:
+    """
+    `get_accounts_by_authorizers` entry of `permission`, first entry otherwise
+    """
+    for acc in accounts:
+        if acc['permission_name'] == permission:
+            return acc
+    return accounts[0]
+
+def pick_account(accounts: List[dict], permission: str="active") -> str:
+    """
+    Account authorized by `permission`, first account otherwise
+    """
+    return pick_authorization(accounts, permission)['account_name']
+
+
+class AccountCache:
+    """
+    On-disk account names of public keys and WCW sessions. Entries are stored
+    under sha256 of the key or session token, expire after `ttl` seconds and
+    are refetched when cached permission differs from the requested one
+    ### Methods:
+    - get
+    - set
+    - invalidate
+    """
+    _read = staticmethod(AbiCache._read)
+    _write = staticmethod(AbiCache._write)
+
+    def __init__(self, node="https://wax.greymass.com", path: str="contracts/.account_cache", ttl: float=86400):
+        self.node = node
+        self.path = path
+        self.ttl = ttl
+
+    def __str__(self):
+        return f"AccountCache(node={self.node}, path={self.path}, ttl={self.ttl})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def _file(self, identity: str) -> str:
+        return os.path.join(self.path, node_dir(self.node), hashlib.sha256(identity.encode()).hexdigest() + '.json')
+
+    def get(self, identity: str, permission: str="active") -> Optional[str]:
+        """
+        Cached account of public key or session token, None when missing, expired or of other permission
+        """
+        entry = self._read(self._file(identity))
+        if entry and entry.get('permission') == permission and time.time() - entry['cached_at'] < self.ttl:
+            return entry['account']
+        return None
+
+    def set(self, identity: str, account: str, permission: str="active"):
+        self._write(self._file(identity), {"account": account, "permission": permission, "cached_at": time.time()})
+
+    def invalidate(self, identity: str):
+        try:
+            os.remove(self._file(identity))
+        except OSError:
+            pass
+
+def _group(keys: List[str], accounts: List[dict]) -> Dict[str, List[dict]]:
+    if len(keys) == 1:
+        return {keys[0]: accounts}
+    by_key = {legacy_key(x): x for x in keys}
+    grouped = {}
+    for acc in accounts:
+        key = by_key.get(legacy_key(acc.get('authorizing_key') or ''))
+        if key is not None:
+            grouped.setdefault(key, []).append(acc)
+    return grouped
+
+def _chunks(public_keys: Iterable[str], chunk: int) -> List[List[str]]:
+    keys = list(dict.fromkeys(public_keys))
+    return [keys[i:i + chunk] for i in range(0, len(keys), chunk)]
+
+def _cached(cache: AccountCache, public_keys: Iterable[str], permission: str) -> tuple:
+    names, missing = {}, []
+    for key in dict.fromkeys(public_keys):
+        name = cache.get(key, permission) if cache is not None else None
+        if name is None:
+            missing.append(key)
+        else:
+            names[key] = name
+    return names, missing
+
+def _names(names: Dict[str, str], grouped: List[Dict[str, List[dict]]], permission: str, cache: AccountCache) -> Dict[str, str]:
+    for part in grouped:
+        for key, accounts in part.items():
+            if accounts:
+                acc = pick_authorization(accounts, permission)
+                names[key] = acc['account_name']
+                if cache is not None:
+                    # stored under requested permission, fallback account is cached too
+                    cache.set(key, acc['account_name'], permission)
+    return names
+
+def accounts_by_keys(wax, public_keys: Iterable[str], permission: str="active", chunk: int=100, workers: int=4, cache: AccountCache=None) -> Dict[str, str]:
+    """
+    Account names of many public keys: `chunk` keys per `get_accounts_by_authorizers`
+    request, `workers` requests in parallel, keys found in `cache` are not requested.
+    Keys without account are left out
+    ### Returns:
+    - {public_key: account_name}
+    """
+    def fetch(keys: List[str]) -> Dict[str, List[dict]]:
+        resp = wax.post("chain.get_accounts_by_authorizers", json={"keys": keys, "accounts": []})
+        return _group(keys, resp["accounts"])
+
+    names, missing = _cached(cache, public_keys, permission)
+    chunks = _chunks(missing, chunk)
+    if len(chunks) <= 1:
+        grouped = [fetch(x) for x in chunks]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            grouped = list(executor.map(fetch, chunks))
+
+    return _names(names, grouped, permission, cache)
+
+async def async_accounts_by_keys(wax, public_keys: Iterable[str], permission: str="active", chunk: int=100, cache: AccountCache=None) -> Dict[str, str]:
+    """
+    `accounts_by_keys` over `AsyncCleos`, chunks are requested concurrently
+    """
+    async def fetch(keys: List[str]) -> Dict[str, List[dict]]:
+        resp = await wax.post("chain.get_accounts_by_authorizers", json={"keys": keys, "accounts": []})
+        return _group(keys, resp["accounts"])
+
+    import asyncio
+    names, missing = _cached(cache, public_keys, permission)
+    grouped = await asyncio.gather(*[fetch(x) for x in _chunks(missing, chunk)])
+    return _names(names, grouped, permission, cache)
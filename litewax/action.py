@@ -0,0 +1,112 @@
+from types import MappingProxyType
+from typing import List
+
+from .instrument import span
+from .exceptions import SerializationError
+
+
+class Action:
+    """
+    Immutable action descriptor. Account, name and authorization are known
+    on creation and argument names are checked against `contract.ACTIONS`,
+    action data is serialized on first access of `result`
+    (usually when `TX` packs the transaction) and memoized, every `result` is a fresh copy.
+    ### Methods:
+    - matches
+    - result
+    """
+    __slots__ = ('contract', 'action', 'args', 'account', 'name', 'authorization', '_data')
+
+    def __init__(self, contract, action: str, args: dict):
+        if contract.actor == "":
+            raise ValueError("actor is not set")
+        self._check(contract, action, args)
+
+        set_ = object.__setattr__
+        set_(self, 'contract', contract)
+        set_(self, 'action', action)
+        set_(self, 'args', MappingProxyType(dict(args)))
+        set_(self, 'account', contract.account)
+        set_(self, 'name', action)
+        set_(self, 'authorization', (MappingProxyType({"actor": contract.actor, "permission": contract.permission}),))
+        set_(self, '_data', None)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __str__(self):
+        return f"{type(self.contract).__name__}::{self.action}({dict(self.args)})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __call__(self) -> dict:
+        return self.result
+
+    @staticmethod
+    def _check(contract, action: str, args: dict):
+        """
+        Field names of `args` must be the fields of `action` (no serialization)
+        """
+        actions = getattr(contract, 'ACTIONS', None)
+        if actions is None:
+            return
+        if action not in actions:
+            raise ValueError(f"Unknown action {action} of {contract.account}")
+        fields = set(actions[action])
+        if set(args) != fields:
+            unknown = ', '.join(sorted(set(args) - fields)) or '-'
+            missing = ', '.join(sorted(fields - set(args))) or '-'
+            raise ValueError(f"Wrong fields of {contract.account}::{action}: unknown {unknown}, missing {missing}")
+
+    @property
+    def actor(self) -> str:
+        return self.authorization[0]["actor"]
+
+    @property
+    def permission(self) -> str:
+        return self.authorization[0]["permission"]
+
+    def matches(self, account: str, name: str, actor: str, permission: str) -> bool:
+        """
+        Check action without serializing it
+        """
+        return self.account == account and self.name == name and \
+               self.actor == actor and self.permission == permission
+
+    def _serialize(self) -> str:
+        if not self.args:
+            return ""
+        try:
+            return self.contract.serializer.json_to_bin(self.name, dict(self.args))
+        except SerializationError:
+            # contract may have been redeployed, loaded class is rechecked on next use
+            from .contract import registry
+            registry.invalidate(self.account)
+            raise
+
+    @property
+    def result(self) -> dict:
+        """
+        Action payload for transaction (`account`, `name`, `authorization`, `data`)
+        """
+        if self._data is None:
+            object.__setattr__(self, '_data', self._serialize())
+        # callers may change the payload, memoized data stays intact
+        return {
+            "account": self.account,
+            "name": self.name,
+            "authorization": [dict(x) for x in self.authorization],
+            "data": self._data,
+        }
+
+
+def serialize_actions(actions: List[Action]) -> List[dict]:
+    """
+    Serialize actions of a transaction, already serialized ones are reused
+    """
+    with span("serialize"):
+        return [action.result for action in actions]
@@ -0,0 +1,370 @@
+import asyncio
+import time
+
+try:
+    import httpx
+except ImportError: # optional dependency: pip install litewax[async]
+    httpx = None
+
+from .transport import get_transport
+from .nodepool import NodePool, FAILOVER_STATUSES
+from .contract import Contract, AsyncContract
+from .chaincontext import AsyncChainContext
+from .action import serialize_actions
+from .transaction import PackedTransaction, SignedTransaction
+from .resources import AsyncResourceMonitor
+from .push import check_push_result, push_payload, push_outcome, broadcast_nodes, async_broadcast_transaction
+from .instrument import span
+from .accounts import AccountCache, pick_authorization
+from .exceptions import (
+    AuthNotFound, AuthorizationError, NodeUnavailable
+)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.77 Safari/537.36 Edg/91.0.864.37"
+
+
+def create_session(timeout: float=30) -> "httpx.AsyncClient":
+    """
+    Create pooled async http session (settings of default `Transport`)
+    """
+    return get_transport().async_session(headers={"user-agent": USER_AGENT}, timeout=timeout)
+
+class AsyncCleos:
+    """
+    Minimal async node api (`eospy.cleos.Cleos` counterpart).
+    `url` may be a list of urls or `NodePool` to route requests with failover
+    ### Methods:
+    - get
+    - post
+    - get_info
+    - get_block
+    - get_chain_lib_info
+    - get_account
+    """
+    # coroutine api, contracts read its tables with `AsyncTableReader`
+    asynchronous = True
+
+    def __init__(self, url="https://wax.greymass.com", session: "httpx.AsyncClient"=None, version: str="v1"):
+        if isinstance(url, (list, tuple)):
+            url = NodePool(list(url))
+        self.pool = url if isinstance(url, NodePool) else None
+        self._url_base = None if self.pool else url
+        self.version = version
+        self.session = session or create_session()
+
+    @property
+    def url(self) -> str:
+        return self.pool.best() if self.pool else self._url_base
+
+    def _path(self, func: str) -> str:
+        return f"/{self.version}/{func.replace('.', '/')}"
+
+    async def _request(self, method: str, func: str, **kwargs) -> "httpx.Response":
+        if self.pool is None:
+            return await self.session.request(method, self._url_base + self._path(func), **kwargs)
+
+        errors = []
+        for stats in self.pool.ranked():
+            start = time.monotonic()
+            try:
+                r = await self.session.request(method, stats.url + self._path(func), **kwargs)
+            except httpx.TransportError as e:
+                self.pool.report(stats.url, error=True)
+                errors.append(f"{stats.url}: {e!r}")
+                continue
+
+            if r.status_code in FAILOVER_STATUSES or (r.status_code >= 500 and not self._is_chain_error(r)):
+                self.pool.report(stats.url, error=True)
+                errors.append(f"{stats.url}: HTTP {r.status_code}")
+                continue
+
+            self.pool.report(stats.url, latency=time.monotonic() - start)
+            return r
+
+        raise NodeUnavailable(f"All nodes failed: {'; '.join(errors)}")
+
+    @staticmethod
+    def _is_chain_error(r: "httpx.Response") -> bool:
+        try:
+            return 'error' in r.json()
+        except ValueError:
+            return False
+
+    async def get(self, func: str, timeout: float=30) -> dict:
+        r = await self._request('GET', func, timeout=timeout)
+        r.raise_for_status()
+        return r.json()
+
+    async def post(self, func: str, json: dict=None, timeout: float=30, raise_for_status: bool=True) -> dict:
+        r = await self._request('POST', func, json=json, timeout=timeout)
+        if raise_for_status and r.is_error:
+            raise httpx.HTTPStatusError(f'Error: {r.text}', request=r.request, response=r)
+        return r.json()
+
+    async def get_info(self, timeout: float=30) -> dict:
+        return await self.get('chain.get_info', timeout=timeout)
+
+    async def get_block(self, block_num: int, timeout: float=30) -> dict:
+        return await self.post('chain.get_block', json={'block_num_or_id': block_num}, timeout=timeout)
+
+    async def get_chain_lib_info(self, timeout: float=30):
+        chain_info = await self.get_info(timeout=timeout)
+        lib_info = await self.get_block(chain_info['last_irreversible_block_num'], timeout=timeout)
+        return chain_info, lib_info
+
+    async def get_account(self, acct_name: str, timeout: float=30) -> dict:
+        return await self.post('chain.get_account', json={'account_name': acct_name}, timeout=timeout)
+
+    async def push_transaction(self, signatures: list, packed: str, timeout: float=30) -> dict:
+        with span("push", node=self.url) as s:
+            resp = await self.post("chain.push_transaction",
+                json=push_payload(signatures, packed),
+                timeout=timeout,
+                raise_for_status=False
+            )
+            s.set(outcome=push_outcome(resp))
+            return resp
+
+    async def close(self):
+        await self.session.aclose()
+
+
+class AsyncClient:
+    """
+    Asyncio version of `Client`.
+    Account name is resolved with `await client.login()`,
+    `await AsyncClient.create(...)` or `async with AsyncClient(...)`.
+    ### Methods:
+    - create
+    - login
+    - Transaction
+    - Contract
+    - contract
+    - GetName
+    - forget_name
+    - SetNode
+    - sign
+    - close
+    """
+    def __init__(self, private_key="", cookie="", node="https://wax.greymass.com", session: "httpx.AsyncClient"=None, chain: AsyncChainContext=None, tapos_ttl: float=30, signer_backend: str=None, resources_ttl: float=10, wcw_concurrency: int=4, name: str=None, account_cache: AccountCache=None):
+        self.session = session or create_session()
+        self.wax = AsyncCleos(url=node, session=self.session)
+        self.node = self.wax.url
+        self.chain = chain or AsyncChainContext(self.wax, ttl=tapos_ttl)
+        # cached get_account of accounts with CPU/NET forecast
+        self.resources = AsyncResourceMonitor(self.wax, ttl=resources_ttl)
+        # known account name skips login lookup, `account_cache` keeps names between restarts
+        self.name = name
+        self.account_cache = account_cache
+
+        if private_key:
+            self.type = "private_key"
+            from .signer import get_signer
+            # parsed key material is cached and shared between clients
+            self.signer = get_signer(private_key, signer_backend)
+            self.private_key = self.signer.key
+            self.public_key = self.signer.public_key
+            self.GetName = self.__GetNameAnchor
+            self.sign = self.__signAnchor
+
+        elif cookie:
+            self.type = "cookie"
+            self.cookie = cookie
+            from .wcw import AsyncWCWSession
+            self.wcw = AsyncWCWSession(cookie, self.session, concurrency=wcw_concurrency)
+            self.GetName = self.__GetNameWCW
+            self.sign = self.wcw.sign
+
+        else:
+            raise AuthNotFound("You must provide a private key or a cookie")
+
+    @classmethod
+    async def create(cls, *args, **kwargs) -> "AsyncClient":
+        """
+        Create client and resolve account name
+        """
+        client = cls(*args, **kwargs)
+        await client.login()
+        return client
+
+    async def login(self) -> str:
+        """
+        Resolve account name
+        """
+        with span("get_name", signer=self.type):
+            self.name = await self.GetName()
+        return self.name
+
+    async def __aenter__(self):
+        if self.name is None:
+            await self.login()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def __str__(self):
+        return f"AsyncClient(name={self.name}, type={self.type}, node={self.node})"
+
+    async def __GetNameAnchor(self, permission="active") -> str:
+        """
+        Get wallet name by public key
+        """
+        if self.account_cache is not None:
+            name = self.account_cache.get(self.public_key, permission)
+            if name is not None:
+                return name
+
+        r = await self.wax.post(
+            "chain.get_accounts_by_authorizers",
+            json={"keys": [self.public_key], "accounts": []})
+        acc = pick_authorization(r["accounts"], permission)
+        if self.account_cache is not None:
+            self.account_cache.set(self.public_key, acc['account_name'], permission)
+        return acc['account_name']
+
+    async def __GetNameWCW(self) -> str:
+        """
+        Get wallet name by session_token
+        """
+        if self.account_cache is not None:
+            name = self.account_cache.get(self.cookie)
+            if name is not None:
+                return name
+
+        name = await self.wcw.login()
+        if self.account_cache is not None:
+            self.account_cache.set(self.cookie, name)
+        return name
+
+    def forget_name(self):
+        """
+        Drop account name (and its `account_cache` entry), `login` resolves it again
+        """
+        if self.account_cache is not None:
+            self.account_cache.invalidate(self.public_key if self.type == "private_key" else self.cookie)
+        self.name = None
+
+    async def __signAnchor(self, trx: bytearray) -> str:
+        """
+        Sign Anchor type transaction (pure python backend runs in executor, it is CPU bound)
+        """
+        if self.signer.backend == "coincurve":
+            return self.signer.sign(trx)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.signer.sign, trx)
+
+    def Contract(self, name: str, actor: str=None, force_recreate: bool=False, node: str=None):
+        """
+        Create a contract object, account name must be resolved (`login` or `async with`).
+        First load of a contract makes blocking node requests, use `await client.contract(...)` in the event loop
+        """
+        if self.name is None:
+            raise AuthNotFound("Account name is not resolved, call `login()` first")
+        return Contract(name, self, actor=actor, force_recreate=force_recreate, node=node)
+
+    async def contract(self, name: str, force_recreate: bool=False, node=None):
+        """
+        Create a contract object without blocking the event loop
+        (ABI is checked with the async node api, file generation runs in executor)
+        """
+        if self.name is None:
+            raise AuthNotFound("Account name is not resolved, call `login()` first")
+        wax = self.wax if node is None else AsyncCleos(url=node, session=self.session)
+        return await AsyncContract(name, wax, actor=self.name, force_recreate=force_recreate)
+
+    def SetNode(self, node):
+        """
+        Change node (url, list of urls or NodePool)
+        """
+        self.wax = AsyncCleos(url=node, session=self.session)
+        self.chain = AsyncChainContext(self.wax, ttl=self.chain.ttl)
+        self.resources.wax = self.wax
+        self.node = self.wax.url
+
+    def Transaction(self, *actions, expiration: float=60):
+        """
+        Create a transaction object
+        - expiration: seconds the signed transaction stays valid
+        """
+        return TX(self, *actions, expiration=expiration)
+
+    async def close(self):
+        """
+        Close http session
+        """
+        await self.session.aclose()
+
+
+class TX:
+    """
+    ### Methods:
+    - pay_with
+    - get_trx_extend_info
+    - push
+    """
+    def __init__(self, client: AsyncClient, *actions, expiration: float=60):
+        self.client = client
+        self.wax = client.wax
+        self.sign = client.sign
+        self.expiration = expiration
+
+        if not actions:
+            raise ValueError("Transaction must have at least one action")
+
+        self.actions = list(actions)
+        self.actions.reverse()
+
+    def __str__(self):
+        actions = ',\n        '.join([str(x) for x in self.actions])
+        return f"""litewax.AsyncTransaction(
+    node={self.client.node},
+    sender={self.client.name},
+    actions=[
+        {actions}
+    ]
+)"""
+
+    def pay_with(self, payer: str, custom_payer_client: AsyncClient=None, network='mainnet'):
+        """Create a paywith object"""
+        from .asyncpaywith import AsyncPayWith
+        return AsyncPayWith(self, payer, custom_payer_client, network)
+
+    async def get_trx_extend_info(self):
+        """
+        Sign transaction and get extend info
+        ### Returns:
+        - `SignedTransaction` (mapping with `signatures`, `packed`, `serealized`)
+        """
+        chain_info, lib_info = await self.client.chain.get()
+        trx = PackedTransaction.build(serialize_actions(self.actions), chain_info, lib_info, self.expiration)
+
+        with span("sign", signer=self.client.type):
+            if self.client.type == "private_key":
+                signatures = [await self.sign(trx.digest)]
+            else:
+                signatures = await self.sign(trx.raw)
+
+        return SignedTransaction(trx, signatures)
+
+    async def push(self, broadcast=None):
+        """
+        Push transaction
+        - broadcast: send to several nodes at once and return first receipt
+          (True - all pool nodes, int - N best pool nodes, list - urls)
+        ### Returns:
+        - dict
+        """
+        info = await self.get_trx_extend_info()
+        try:
+            if broadcast:
+                return await async_broadcast_transaction(
+                    broadcast_nodes(self.wax, broadcast), info['signatures'], info['packed'], self.client.session, timeout=30)
+
+            resp = await self.wax.push_transaction(info['signatures'], info['packed'], timeout=30)
+            return check_push_result(resp, info['packed'])
+        except AuthorizationError:
+            # cached account may no longer be authorized by this key
+            if self.client.account_cache is not None:
+                self.client.forget_name()
+            raise
@@ -0,0 +1,199 @@
+import asyncio
+from typing import List
+
+from .asyncclient import AsyncClient, AsyncCleos, create_session
+from .push import check_push_result, broadcast_nodes, async_broadcast_transaction
+from .chaincontext import AsyncChainContext
+from .contract import Contract, AsyncContract
+from .exceptions import AuthNotFound, AuthorizationError
+from .nodepool import NodePool
+from .action import serialize_actions
+from .transaction import PackedTransaction, SignedTransaction
+from .instrument import span
+from .accounts import AccountCache, async_accounts_by_keys
+
+
+class AsyncMultiSigClient():
+    """
+    Asyncio version of `MultiSigClient`.
+    All cosigners share one http session and one TAPOS provider.
+    ### Methods:
+    - create
+    - login
+    - SetNode
+    - Transaction
+    - Contract
+    - contract
+    - close
+    """
+    def __init__(self,
+            private_keys: list = [],
+            cookies: list = [],
+            clients: List[AsyncClient] = [],
+            node='https://wax.greymass.com',
+            session=None,
+            tapos_ttl: float=30,
+            names: dict = {},
+            account_cache: AccountCache=None,
+            signer_backend: str=None,
+            min_batch: int=None):
+
+        if not cookies and not private_keys and not clients:
+            raise AuthNotFound("You must provide a private key, a cookie or a clients")
+
+        if isinstance(node, (list, tuple)):
+            node = NodePool(list(node))
+
+        self.session = session or create_session()
+        self.wax = AsyncCleos(url=node, session=self.session)
+        self.node = self.wax.url
+        self.chain = AsyncChainContext(self.wax, ttl=tapos_ttl)
+
+        self.account_cache = account_cache
+        # cosigner keys signed by the process pool from this count (`litewax.signer.sign_batch`)
+        self.min_batch = min_batch
+        self.clients = list(clients)
+
+        # known names (by private key or cookie) are not looked up by `login`
+        for private_key in private_keys:
+            self.clients.append(AsyncClient(private_key=private_key, node=node, session=self.session, chain=self.chain, name=names.get(private_key), account_cache=account_cache, signer_backend=signer_backend))
+
+        for cookie in cookies:
+            self.clients.append(AsyncClient(cookie=cookie, node=node, session=self.session, chain=self.chain, name=names.get(cookie), account_cache=account_cache))
+
+        self.Contract = Contract
+
+    @classmethod
+    async def create(cls, *args, **kwargs) -> "AsyncMultiSigClient":
+        """
+        Create client and resolve all account names concurrently
+        """
+        client = cls(*args, **kwargs)
+        await client.login()
+        return client
+
+    async def login(self) -> List[str]:
+        """
+        Resolve unknown account names: all public keys with batched `get_accounts_by_authorizers`
+        requests, WCW logins concurrently
+        """
+        keys = [cl for cl in self.clients if cl.name is None and cl.type == 'private_key']
+        if keys:
+            with span("get_name", signer="bulk"):
+                names = await async_accounts_by_keys(self.wax, [cl.public_key for cl in keys], cache=self.account_cache)
+            for cl in keys:
+                cl.name = names.get(cl.public_key)
+
+        # keys without account fall back to own lookup (and its error)
+        await asyncio.gather(*[cl.login() for cl in self.clients if cl.name is None])
+        return [cl.name for cl in self.clients]
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def SetNode(self, node):
+        if isinstance(node, (list, tuple)):
+            node = NodePool(list(node))
+        self.wax = AsyncCleos(url=node, session=self.session)
+        self.node = self.wax.url
+        self.chain = AsyncChainContext(self.wax, ttl=self.chain.ttl)
+        for client in self.clients:
+            client.SetNode(node)
+            client.chain = self.chain
+
+    def Transaction(self, *actions, expiration: float=60):
+        return TX(self, *actions, node=self.node, expiration=expiration)
+
+    async def contract(self, name: str, actor: str="", permission: str="active", force_recreate: bool=False):
+        """
+        Create a contract object of `actor` without blocking the event loop
+        """
+        return await AsyncContract(name, self.wax, actor=actor, permission=permission, force_recreate=force_recreate)
+
+    async def close(self):
+        await self.session.aclose()
+
+    def __getitem__(self, index):
+        return self.clients[index]
+
+    def __len__(self):
+        return len(self.clients)
+
+    def __iter__(self):
+        return iter(self.clients)
+
+
+class TX():
+    """
+    ### Methods:
+    - pay_with
+    - get_trx_extend_info
+    - push
+    """
+    def __init__(self, client: AsyncMultiSigClient, *actions, node: str='https://wax.greymass.com', expiration: float=60):
+        self.client = client
+        self.node = node
+        self.expiration = expiration
+        self.wax = self.client.wax
+
+        self.actions = list(actions)
+
+    def pay_with(self, payer: str, network='mainnet'):
+        from .asyncpaywith import AsyncPayWith
+        return AsyncPayWith(self, payer, network=network)
+
+    async def get_trx_extend_info(self):
+        from .signer import sign_batch
+        if any(cl.name is None for cl in self.client):
+            await self.client.login()
+        trx_wallets = set()
+        for action in self.actions:
+            trx_wallets.add(action.actor)
+
+        chain_info, lib_info = await self.client.chain.get()
+        trx = PackedTransaction.build(serialize_actions(self.actions), chain_info, lib_info, self.expiration)
+
+        cosigners = [cl for cl in self.client if cl.name in trx_wallets]
+        keys = [cl for cl in cosigners if cl.type == 'private_key']
+        cookies = [cl for cl in cosigners if cl.type == 'cookie']
+
+        # private keys are signed in one batch off the loop, wcw requests concurrently,
+        # order of signatures is kept
+        loop = asyncio.get_running_loop()
+        with span("sign", signer="multisig"):
+            batch = loop.run_in_executor(None, sign_batch, [(trx.digest, cl.signer) for cl in keys], None, self.client.min_batch)
+            key_signatures, wcw_signatures = await asyncio.gather(
+                batch, asyncio.gather(*[cl.sign(trx.raw) for cl in cookies]))
+
+        signed = {}
+        for cl, signature in zip(keys, key_signatures):
+            signed[id(cl)] = [signature]
+        for cl, signature in zip(cookies, wcw_signatures):
+            signed[id(cl)] = signature
+
+        signatures = []
+        for cl in cosigners:
+            signatures += signed[id(cl)]
+
+        return SignedTransaction(trx, signatures)
+
+    async def push(self, broadcast=None):
+        info = await self.get_trx_extend_info()
+        try:
+            if broadcast:
+                return await async_broadcast_transaction(
+                    broadcast_nodes(self.wax, broadcast), info['signatures'], info['packed'], self.client.session, timeout=30)
+
+            resp = await self.wax.push_transaction(info['signatures'], info['packed'], timeout=30)
+            return check_push_result(resp, info['packed'])
+        except AuthorizationError:
+            # cached accounts of cosigners may no longer be authorized by their keys
+            actors = {x.actor for x in self.actions}
+            for cl in self.client:
+                if cl.account_cache is not None and cl.name in actors:
+                    cl.forget_name()
+            raise
@@ -0,0 +1,167 @@
+from .contract import AsyncContract
+from .exceptions import PayWithPushError
+from .push import check_push_result, push_outcome
+from .instrument import span
+
+
+class AsyncAtomicHub:
+    """
+    Allowed actions:
+    - atomicassets
+    - atomicmarket
+
+    """
+    def __init__(self, trx, network="mainnet"):
+        self.trx = trx
+        self.wax = trx.client.wax
+        self.session = trx.client.session
+        self.sign_link = "https://wax-mainnet-signer.api.atomichub.io/v1/sign"
+
+    async def prepare(self):
+        """
+        Add payer action (contract is loaded without blocking the event loop)
+        """
+        if not self.trx.actions[0].matches("res.pink", "noop", "res.pink", "paybw"):
+            contract = await AsyncContract("res.pink", self.wax, actor="res.pink", permission="paybw")
+            self.trx.actions = [contract.noop()] + self.trx.actions
+
+    async def push(self) -> dict:
+        await self.prepare()
+        signed = await self.trx.get_trx_extend_info()
+        signatures = signed['signatures']
+
+        # sign with atomichub
+        with span("cosign", payer="atomichub"):
+            r = await self.session.post(self.sign_link, json={"transaction": signed['packed']})
+            sign_packed = r.json()
+
+        if sign_packed.get('success') is False:
+            raise PayWithPushError(sign_packed.get('message'))
+
+        signatures += sign_packed['data']
+
+        # push transaction
+        resp = await self.wax.push_transaction(signatures, signed['packed'])
+        return check_push_result(resp, signed['packed'])
+
+
+class AsyncNefty:
+    def __init__(self, trx, network="mainnet"):
+        self.trx = trx
+        self.wax = self.trx.wax
+        self.session = trx.client.session
+
+        if network == "testnet":
+            self.sign_link = "https://cpu-test.neftyblocks.com/"
+            self.push_link = "https://wax-testnet.neftyblocks.com/v1/chain/send_transaction"
+
+        elif network == "mainnet":
+            self.sign_link = "https://cpu.neftyblocks.com/"
+            self.push_link = "https://wax.neftyblocks.com/v1/chain/send_transaction"
+
+        else:
+            raise ValueError("Unknown network. Must be 'testnet' or 'mainnet'")
+
+    async def prepare(self):
+        """
+        Add payer action (contract is loaded without blocking the event loop)
+        """
+        if not self.trx.actions[0].matches("neftyblocksd", "paycpu", "neftybrespay", "active"):
+            contract = await AsyncContract("neftybrespay", self.wax, actor="neftybrespay")
+            self.trx.actions = [contract.paycpu()] + self.trx.actions
+
+    async def push(self) -> dict:
+        await self.prepare()
+        signed = await self.trx.get_trx_extend_info()
+        signatures = signed['signatures']
+
+        # sign with neftyblocks
+        with span("cosign", payer="nefty"):
+            r = await self.session.post(self.sign_link, json={"transaction": signed['packed']})
+            sign_packed = r.json()
+
+        if sign_packed.get('error'):
+            raise PayWithPushError(sign_packed['error'])
+
+        signatures += sign_packed['signatures']
+
+        # push transaction
+        with span("push", node=self.push_link) as s:
+            r = await self.session.post(self.push_link, json={
+                "signatures": signatures,
+                "compression": 0,
+                "packed_context_free_data": "",
+                "packed_trx": signed['packed']
+            })
+            resp = r.json()
+            s.set(outcome=push_outcome(resp))
+        return check_push_result(resp, signed['packed'])
+
+
+class AsyncCustomPayer:
+    def __init__(self, trx, payer_client, permission="active"):
+        self.trx = trx
+        self.wax = self.trx.wax
+        self.payer_client = payer_client
+        self.permission = permission
+
+    async def prepare(self):
+        """
+        Add payer action (contract is loaded without blocking the event loop)
+        """
+        if not self.trx.actions[0].matches("abuztradewax", "noop", self.payer_client.name, self.permission):
+            contract = await AsyncContract("abuztradewax", self.wax, actor=self.payer_client.name, permission=self.permission)
+            self.trx.actions = [contract.noop()] + self.trx.actions
+
+    async def push(self) -> dict:
+        await self.prepare()
+        signed = await self.trx.get_trx_extend_info()
+        signatures = signed['signatures']
+
+        with span("cosign", payer="custom"):
+            if self.payer_client.type == 'private_key':
+                signatures.append(await self.payer_client.sign(signed.digest))
+            else:
+                signatures += await self.payer_client.sign(signed.transaction.raw)
+
+        # push transaction
+        resp = await self.wax.push_transaction(signatures, signed['packed'])
+        return check_push_result(resp, signed['packed'])
+
+
+class AsyncPayWith:
+    def __init__(self, trx, pay_with="nefty", custom_payer_client=None, network="mainnet"):
+        self.client = trx.client
+        self.trx = trx
+        if pay_with.lower() == "nefty":
+            self.pay_with = AsyncNefty(trx, network=network)
+
+        elif pay_with.lower() == "atomichub":
+            self.pay_with = AsyncAtomicHub(trx, network=network)
+
+        elif pay_with.lower() == "custom":
+            if not custom_payer_client:
+                raise ValueError("You must specify custom_payer_client")
+            self.pay_with = AsyncCustomPayer(trx, custom_payer_client)
+
+        else:
+            raise ValueError("Unknown payer. Must be 'Nefty', 'AtomicHub' or 'Custom'")
+
+    def __str__(self):
+        actions = ",\n        ".join([str(x) for x in self.pay_with.trx.actions])
+        return f"""litewax.AsyncTransaction(
+    node={self.pay_with.trx.client.node},
+    sender={self.pay_with.trx.client.name},
+    actions=[
+        {actions}
+    ]
+)"""
+
+    async def prepare(self):
+        """
+        Add payer action to the transaction (done by `push`)
+        """
+        await self.pay_with.prepare()
+
+    async def push(self):
+        return await self.pay_with.push()
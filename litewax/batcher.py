@@ -0,0 +1,180 @@
+import threading
+from typing import Iterable, Iterator, List
+
+from .action import Action
+
+# packed transaction header (expiration, TAPOS, limits, delay, counters, extensions) with margin
+TRANSACTION_OVERHEAD = 32
+
+
+def varuint_size(value: int) -> int:
+    size = 1
+    while value >= 0x80:
+        value >>= 7
+        size += 1
+    return size
+
+def action_size(action: Action) -> int:
+    """
+    Size of packed action: account, name, authorization and data
+    """
+    data = len(action.result['data']) // 2
+    auth = len(action.authorization)
+    return 16 + varuint_size(auth) + 16 * auth + varuint_size(data) + data
+
+
+class CostModel:
+    """
+    Estimated CPU usage (us) per contract action, learned from push receipts (EWMA)
+    ### Methods:
+    - estimate
+    - learn
+    """
+    def __init__(self, default_cpu_us: float=500, alpha: float=0.3):
+        self.default_cpu_us = default_cpu_us
+        self.alpha = alpha
+        self.costs = {}
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return f"CostModel(costs={self.costs})"
+
+    def estimate(self, action: Action) -> float:
+        return self.costs.get((action.account, action.name), self.default_cpu_us)
+
+    def learn(self, actions: List[Action], receipt: dict):
+        """
+        Split billed CPU of the transaction between its actions, by action
+        trace `elapsed` when node returns traces, otherwise by current estimates
+        """
+        processed = receipt.get('processed') or {}
+        cpu = (processed.get('receipt') or {}).get('cpu_usage_us')
+        if not cpu or not actions:
+            return
+
+        # top level traces only (inline actions have creator_action_ordinal)
+        traces = [
+            x for x in processed.get('action_traces', [])
+            if x.get('elapsed') is not None and not x.get('creator_action_ordinal')
+        ]
+        weights = [x['elapsed'] for x in traces] if len(traces) == len(actions) else []
+        if not sum(weights):
+            weights = [self.estimate(x) for x in actions]
+        total = sum(weights)
+
+        with self._lock:
+            for action, weight in zip(actions, weights):
+                key = (action.account, action.name)
+                cost = cpu * weight / total
+                old = self.costs.get(key)
+                self.costs[key] = cost if old is None else self.alpha * cost + (1 - self.alpha) * old
+
+
+class ActionBatcher:
+    """
+    Pack a stream of actions into the fewest transactions that fit
+    `max_size` bytes and the CPU budget of the paying account, in original order.
+    The budget is the CPU the first authorizer has available (`client.resources`
+    forecast) up to `cpu_budget_us`, or `cpu_budget_us` when the client has no
+    resource monitor. The cost model is shared with the monitor
+    ### Methods:
+    - batches
+    - budget
+    - transactions
+    - learn
+    - push
+    """
+    def __init__(self,
+            client,
+            max_size: int=65536,
+            cpu_budget_us: float=50000,
+            max_actions: int=None,
+            cost_model: CostModel=None):
+        self.client = client
+        self.max_size = max_size
+        self.cpu_budget_us = cpu_budget_us
+        self.max_actions = max_actions
+        monitor = self._monitor()
+        self.cost_model = cost_model or (monitor.cost_model if monitor is not None else CostModel())
+
+    def _monitor(self):
+        """
+        Resource monitor of the client, None if it has none (batcher is synchronous,
+        `AsyncResourceMonitor` is not used)
+        """
+        from .resources import AsyncResourceMonitor
+        monitor = getattr(self.client, 'resources', None)
+        if isinstance(monitor, AsyncResourceMonitor):
+            return None
+        return monitor
+
+    def budget(self, actor: str) -> float:
+        """
+        CPU budget (us) of a transaction paid by `actor`
+        """
+        monitor = self._monitor()
+        if monitor is None:
+            return self.cpu_budget_us
+        return min(self.cpu_budget_us, monitor.get(actor).cpu_available() / monitor.margin)
+
+    def batches(self, actions: Iterable[Action], sponsored: bool=False) -> Iterator[List[Action]]:
+        """
+        Group actions lazily, an action that exceeds budgets alone gets its own transaction.
+        Budget is read when a batch starts, `push` records receipts so later batches see spent CPU.
+        CPU of `sponsored` transactions (`pay_with`) is not paid by actors, they use `cpu_budget_us`
+        """
+        batch, size, cpu, budget = [], TRANSACTION_OVERHEAD, 0.0, None
+        for action in actions:
+            action_bytes = action_size(action)
+            action_cpu = self.cost_model.estimate(action)
+
+            full = self.max_actions is not None and len(batch) >= self.max_actions
+            if batch and (full or size + action_bytes > self.max_size or cpu + action_cpu > budget):
+                yield batch
+                batch, size, cpu = [], TRANSACTION_OVERHEAD, 0.0
+
+            if not batch:
+                # CPU is billed to the first authorizer of the transaction
+                budget = self.cpu_budget_us if sponsored else self.budget(action.actor)
+            batch.append(action)
+            size += action_bytes
+            cpu += action_cpu
+
+        if batch:
+            yield batch
+
+    def transactions(self, actions: Iterable[Action], sponsored: bool=False) -> Iterator:
+        """
+        `client.Transaction` for every batch. Actions of a transaction execute in
+        stream order: they are set on the transaction as is, whatever order the
+        `Transaction` arguments get (budget was computed for `batch[0]` as payer)
+        """
+        for batch in self.batches(actions, sponsored):
+            tx = self.client.Transaction(*batch)
+            tx.actions = list(batch)
+            yield tx
+
+    def learn(self, tx, receipt: dict):
+        """
+        Update cost model (and spent resources of the payer) with receipt of
+        pushed transaction (`TX` or `PayWith`)
+        """
+        trx = getattr(tx, 'trx', tx)
+        monitor = self._monitor()
+        if monitor is not None:
+            monitor.record(tx, receipt)
+        if monitor is None or monitor.cost_model is not self.cost_model:
+            self.cost_model.learn(trx.actions, receipt)
+
+    def push(self, actions: Iterable[Action], pay_with: str=None) -> List[dict]:
+        """
+        Push all actions batch by batch, learning cost after each receipt
+        """
+        results = []
+        for tx in self.transactions(actions, sponsored=bool(pay_with)):
+            if pay_with:
+                tx = tx.pay_with(pay_with)
+            resp = tx.push()
+            self.learn(tx, resp)
+            results.append(resp)
+        return results
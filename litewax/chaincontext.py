@@ -0,0 +1,191 @@
+import time
+import threading
+
+from .instrument import span
+
+
+class ChainContext:
+    """
+    Shared TAPOS provider: chain_id is cached forever,
+    head/LIB reference block is refreshed every `ttl` seconds
+    (lazily on access or in a background thread).
+    ### Methods:
+    - get
+    - refresh
+    - start
+    - stop
+    """
+    def __init__(self, wax, ttl: float=30, background: bool=False):
+        self.wax = wax
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._chain_id = None
+        self._info = None
+        self._updated_at = 0.0
+
+        self._stop = threading.Event()
+        self._thread = None
+
+        if background:
+            self.start()
+
+    def __str__(self):
+        return f"ChainContext(chain_id={self._chain_id}, ttl={self.ttl})"
+
+    @property
+    def chain_id(self) -> str:
+        if self._chain_id is None:
+            self.get()
+        return self._chain_id
+
+    @property
+    def age(self) -> float:
+        """Seconds since last refresh"""
+        return time.monotonic() - self._updated_at
+
+    def refresh(self):
+        """
+        Fetch fresh chain and LIB block info
+        """
+        with span("tapos", node=self.wax.url):
+            chain_info, lib_info = self.wax.get_chain_lib_info()
+        with self._lock:
+            self._store(chain_info, lib_info)
+        return chain_info, lib_info
+
+    def _store(self, chain_info: dict, lib_info: dict):
+        self._info = (chain_info, lib_info)
+        if self._chain_id is None:
+            self._chain_id = chain_info['chain_id']
+        self._updated_at = time.monotonic()
+
+    def get(self):
+        """
+        Get cached (chain_info, lib_info) for TAPOS
+        ### Returns:
+        - `chain_info`: dict
+        - `lib_info`: dict
+        """
+        info = self._info
+        if info is not None and self.age < self.ttl:
+            return info
+
+        with self._lock:
+            # another thread refreshed while we were waiting
+            if self._info is not None and self.age < self.ttl:
+                return self._info
+
+            with span("tapos", node=self.wax.url):
+                chain_info, lib_info = self.wax.get_chain_lib_info()
+            self._store(chain_info, lib_info)
+            return chain_info, lib_info
+
+    def invalidate(self):
+        """
+        Force refresh on next access (chain_id is kept)
+        """
+        self._updated_at = 0.0
+
+    def start(self, interval: float=None):
+        """
+        Refresh reference block in a background daemon thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        interval = interval or max(self.ttl / 2, 0.1)
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.refresh()
+                except Exception:
+                    # keep serving the previous reference block until the node is back
+                    pass
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=run, name="litewax-chaincontext", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop background refresh thread
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class AsyncChainContext:
+    """
+    Asyncio version of `ChainContext`
+    ### Methods:
+    - get
+    - refresh
+    - invalidate
+    """
+    def __init__(self, wax, ttl: float=30):
+        self.wax = wax
+        self.ttl = ttl
+
+        self._lock = None
+        self._chain_id = None
+        self._info = None
+        self._updated_at = 0.0
+
+    def __str__(self):
+        return f"AsyncChainContext(chain_id={self._chain_id}, ttl={self.ttl})"
+
+    @property
+    def age(self) -> float:
+        """Seconds since last refresh"""
+        return time.monotonic() - self._updated_at
+
+    async def get_chain_id(self) -> str:
+        if self._chain_id is None:
+            await self.get()
+        return self._chain_id
+
+    def _store(self, chain_info: dict, lib_info: dict):
+        self._info = (chain_info, lib_info)
+        if self._chain_id is None:
+            self._chain_id = chain_info['chain_id']
+        self._updated_at = time.monotonic()
+
+    async def refresh(self):
+        """
+        Fetch fresh chain and LIB block info
+        """
+        with span("tapos", node=self.wax.url):
+            chain_info, lib_info = await self.wax.get_chain_lib_info()
+        self._store(chain_info, lib_info)
+        return chain_info, lib_info
+
+    async def get(self):
+        """
+        Get cached (chain_info, lib_info) for TAPOS
+        ### Returns:
+        - `chain_info`: dict
+        - `lib_info`: dict
+        """
+        if self._info is not None and self.age < self.ttl:
+            return self._info
+
+        # created lazily to bind to the running loop
+        if self._lock is None:
+            import asyncio
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._info is not None and self.age < self.ttl:
+                return self._info
+            return await self.refresh()
+
+    def invalidate(self):
+        """
+        Force refresh on next access (chain_id is kept)
+        """
+        self._updated_at = 0.0
@@ -1,18 +1,19 @@
-import cloudscraper
-import eospy.cleos
-import eospy.keys
-from eospy.types import Transaction
-from eospy.utils import sig_digest
-import datetime as dt
-import pytz
+from typing import TYPE_CHECKING
 
-
-from .paywith import PayWith
 from .contract import Contract
-from .exceptions import (
-    CPUlimit, CookiesExpired, 
-    ExpiredTransaction, UnknownError
-)
+from .chaincontext import ChainContext
+from .push import check_push_result, broadcast_nodes, broadcast_transaction
+from .action import serialize_actions
+from .transaction import PackedTransaction, SignedTransaction
+from .transport import Transport, get_transport
+from .resources import ResourceMonitor
+from .accounts import AccountCache, pick_authorization
+from .exceptions import AuthorizationError
+from .instrument import span
+
+# signer, WCW and payers are imported by the clients that use them
+if TYPE_CHECKING:
+    from .paywith import PayWith
 
 
 class Client:
@@ -21,18 +22,29 @@ class Client:
     - Transaction
     - Contract
     - GetName
+    - forget_name
     - SetNode
     - sign
     """
-    def __init__(self, private_key="", cookie="", node="https://wax.greymass.com"):
-        self.node = node
-        self.session = cloudscraper.create_scraper(browser={'custom': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.77 Safari/537.36 Edg/91.0.864.37"})
-        self.wax = eospy.cleos.Cleos(url=node)
+    def __init__(self, private_key="", cookie="", node="https://wax.greymass.com", chain: ChainContext=None, tapos_ttl: float=30, transport: Transport=None, signer_backend: str=None, resources_ttl: float=10, wcw_concurrency: int=None, name: str=None, lazy: bool=False, account_cache: AccountCache=None):
+        self.transport = transport or get_transport()
+        # persistent key / session -> account names, skips lookups after restart
+        self.account_cache = account_cache
+        self._session = None
+        # node may be an url, list of urls or NodePool (failover between nodes)
+        self.wax = self.transport.cleos(node)
+        self.node = self.wax.url
+        self.chain = chain or ChainContext(self.wax, ttl=tapos_ttl)
+        # cached get_account of accounts with CPU/NET forecast
+        self.resources = ResourceMonitor(self.wax, ttl=resources_ttl)
 
         if private_key:
             self.type = "private_key"
-            self.private_key = eospy.keys.EOSKey(private_key)
-            self.public_key = self.private_key.to_public() 
+            from .signer import get_signer
+            # parsed key material is cached and shared between clients
+            self.signer = get_signer(private_key, signer_backend)
+            self.private_key = self.signer.key
+            self.public_key = self.signer.public_key 
             self.GetName = self.__GetNameAnchor
             self.sign = self.__signAnchor
 
@@ -40,75 +52,98 @@ class Client:
         elif cookie:
             self.type = "cookie"
             self.cookie = cookie
+            from .wcw import get_wcw_session
+            # one authenticated session per cookie, shared between clients
+            self.wcw = get_wcw_session(cookie, self.transport, wcw_concurrency)
             self.GetName = self.__GetNameWCW
-            self.sign = self.__signWCW
+            self.sign = self.wcw.sign
 
 
-        self.name = self.GetName()
+        # known account name skips the lookup, lazy client resolves it on first use
+        self._name = name
+        if name is None and not lazy:
+            self._resolve_name()
 
 
     def __str__(self):
         return f"Client(name={self.name}, type={self.type}, node={self.node})"
 
+    @property
+    def session(self):
+        """
+        Cloudscraper session, created on first use (it takes tens of ms)
+        """
+        if self._session is None:
+            from .wcw import BROWSER
+            self._session = self.transport.scraper(browser=BROWSER)
+        return self._session
+
+    def _resolve_name(self) -> str:
+        with span("get_name", signer=self.type):
+            self._name = self.GetName()
+        return self._name
+
+    @property
+    def name(self) -> str:
+        """
+        Account name, resolved on first access by lazy client
+        """
+        if self._name is None:
+            return self._resolve_name()
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
+    @property
+    def resolved(self) -> bool:
+        return self._name is not None
+
+    def forget_name(self):
+        """
+        Drop account name (and its `account_cache` entry), it is resolved again on next use
+        """
+        if self.account_cache is not None:
+            self.account_cache.invalidate(self.public_key if self.type == "private_key" else self.cookie)
+        self._name = None
+
     def __GetNameAnchor(self, permission="active") -> str:
         """
         Get wallet name by public key
         """
-        r =  self.session.post(
-            f"{self.node}/v1/chain/get_accounts_by_authorizers", 
-            json={"keys": [self.public_key], "accounts": []}).json()["accounts"]
-        for acc in r:
-            if acc['permission_name'] == permission:
-                return acc['account_name']
-        else:
-            return r[0]['account_name']
+        if self.account_cache is not None:
+            name = self.account_cache.get(self.public_key, permission)
+            if name is not None:
+                return name
+
+        r = self.wax.post(
+            "chain.get_accounts_by_authorizers",
+            json={"keys": [self.public_key], "accounts": []})["accounts"]
+        acc = pick_authorization(r, permission)
+        if self.account_cache is not None:
+            self.account_cache.set(self.public_key, acc['account_name'], permission)
+        return acc['account_name']
 
     def __GetNameWCW(self) -> str:
         """
         Get wallet name by session_token
         """
-        try:
-            return self.session.get(
-                "https://api-idm.wax.io/v1/accounts/auto-accept/login",
-                headers={"origin":"https://wallet.wax.io"}, 
-                cookies={'session_token': self.cookie}).json()["userAccount"]
-        except KeyError:
-            raise CookiesExpired("Session token is expired")
-    
-    def __signWCW(self, trx: bytearray) -> list:
-        """
-        Sign WCW type transaction
-        """
-        self.session.options(
-            "https://public-wax-on.wax.io/wam/sign", 
-            headers={"origin":"https://all-access.wax.io"}, 
-            cookies={'session_token': self.cookie})
-
-        signed = self.session.post(
-            "https://public-wax-on.wax.io/wam/sign",
-            headers={
-                'origin': 'https://all-access.wax.io',
-                'referer': 'https://all-access.wax.io/',
-                'x-access-token': self.cookie,
-                'content-type': 'application/json;charset=UTF-8',
-            },
-            json={
-                "serializedTransaction": [x for x in trx], # to serialize
-                "website": "wallet.wax.io",
-                "description": "jwt is insecure",
-                "freeBandwidth": True
-            },
-            timeout=120
-        )
-
-        signatures = signed.json()["signatures"]
-        return signatures
-    
+        if self.account_cache is not None:
+            name = self.account_cache.get(self.cookie)
+            if name is not None:
+                return name
+
+        name = self.wcw.login()
+        if self.account_cache is not None:
+            self.account_cache.set(self.cookie, name)
+        return name
+
     def __signAnchor(self, trx: bytearray) -> str:
         """
         Sign Anchor type transaction
         """
-        return self.private_key.sign(trx)
+        return self.signer.sign(trx)
 
     def Contract(self, name: str, actor: str=None, force_recreate: bool=False, node: str=None):
         """
@@ -116,18 +151,21 @@ class Client:
         """
         return Contract(name, self, actor=actor, force_recreate=force_recreate, node=node)
 
-    def SetNode(self, node: str):
+    def SetNode(self, node):
         """
-        Change node
+        Change node (url, list of urls or NodePool)
         """
-        self.wax = eospy.cleos.Cleos(url=node)
-        self.node = node
+        self.wax = self.transport.cleos(node)
+        self.chain = ChainContext(self.wax, ttl=self.chain.ttl)
+        self.resources.wax = self.wax
+        self.node = self.wax.url
 
-    def Transaction(self, *actions):
+    def Transaction(self, *actions, expiration: float=60):
         """
         Create a transaction object
+        - expiration: seconds the signed transaction stays valid
         """
-        return TX(self, *actions)
+        return TX(self, *actions, expiration=expiration)
 
 class TX:
     """
@@ -136,10 +174,11 @@ class TX:
     - get_trx_extend_info
     - push
     """
-    def __init__(self, client: Client, *actions):
+    def __init__(self, client: Client, *actions, expiration: float=60):
         self.client = client
         self.wax = client.wax
         self.sign = client.sign
+        self.expiration = expiration
 
         if not actions:
             raise ValueError("Transaction must have at least one action")
@@ -158,43 +197,33 @@ class TX:
 )"""
 
 
-    def pay_with(self, payer: str, custom_payer_client: Client=None, network='mainnet') -> PayWith:
+    def pay_with(self, payer: str, custom_payer_client: Client=None, network='mainnet') -> "PayWith":
         """Create a paywith object"""
+        from .paywith import PayWith
         return PayWith(self, payer, custom_payer_client, network)
 
     def get_trx_extend_info(self):
         """
         Sign transaction and get extend info
         ### Returns:
-        - `signatures`: List[str]
-        - `packed_trx`: str
-        - `serealized`: List[int]
-        """
-        transaction = {
-            "actions": [a.result for a in self.actions]
-        }
-            
-        transaction['expiration'] = str(
-            (dt.datetime.utcnow() + dt.timedelta(seconds=60)).replace(tzinfo=pytz.UTC))
-
-        chain_info, lib_info = self.wax.get_chain_lib_info()
-        trx = Transaction(transaction, chain_info, lib_info)
-
-        if self.client.type == "private_key":
-            digest = sig_digest(trx.encode(), chain_info['chain_id'])
-            signatures = [self.sign(digest)]
-        else:
-            signatures = self.sign(trx.encode())
-
-        return {
-            "signatures": signatures,
-            "packed": trx.encode().hex(),
-            "serealized": [x for x in trx.encode()]
-        }
-
-    def push(self):
+        - `SignedTransaction` (mapping with `signatures`, `packed`, `serealized`)
+        """
+        chain_info, lib_info = self.client.chain.get()
+        trx = PackedTransaction.build(serialize_actions(self.actions), chain_info, lib_info, self.expiration)
+
+        with span("sign", signer=self.client.type):
+            if self.client.type == "private_key":
+                signatures = [self.sign(trx.digest)]
+            else:
+                signatures = self.sign(trx.raw)
+
+        return SignedTransaction(trx, signatures)
+
+    def push(self, broadcast=None):
         """
         Push transaction
+        - broadcast: send to several nodes at once and return first receipt
+          (True - all pool nodes, int - N best pool nodes, list - urls)
         ### Returns:
         - dict
         """
@@ -202,24 +231,16 @@ class TX:
         signatures = info['signatures']
         packed = info['packed']
 
-        push_create_offer = self.wax.post("chain.push_transaction",
-            json={
-                "signatures": signatures,
-                "compression": 0,
-                "packed_context_free_data": "",
-                "packed_trx": packed
-            },
-            timeout=30
-        )
-        
-        if push_create_offer['transaction_id'] == '':
-            if push_create_offer['error']["what"] == 'Transaction exceeded the current CPU usage limit imposed on the transaction':
-                raise CPUlimit('Error: CPU usage limit!!')
-
-            elif push_create_offer['error']["what"] == 'Expired Transaction':
-                raise ExpiredTransaction('Error: Expired Transaction!!')
-            else:
-                raise UnknownError(
-                    f'Error: {push_create_offer["error"]["details"][0]["message"]}')
-
-        return push_create_offer
\ No newline at end of file
+        try:
+            if broadcast:
+                return broadcast_transaction(
+                    broadcast_nodes(self.wax, broadcast), signatures, packed, self.wax.session, timeout=30)
+
+            # nodeos errors come back as json (http 500), mapped to CPUlimit / ExpiredTransaction / UnknownError
+            resp = self.wax.push_packed(signatures, packed, timeout=30)
+            return check_push_result(resp, packed)
+        except AuthorizationError:
+            # cached account may no longer be authorized by this key
+            if self.client.account_cache is not None:
+                self.client.forget_name()
+            raise
\ No newline at end of file
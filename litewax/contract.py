@@ -1,26 +1,152 @@
 import os
-from .abigen import abigen
+import time
+import threading
+import importlib
+from .abigen import abigen, TEMPLATE_VERSION
+from .nodepool import NodePool, node_key, node_source
+
+
+class ContractRegistry:
+    """
+    Process-wide cache of generated contract classes keyed by (node, name, abi_hash).
+    Node is an url or tuple of pool urls, so clients of one pool share classes.
+    After the first load a class is returned without touching the filesystem or
+    the node, abi_hash is rechecked only after explicit invalidation (`invalidate`,
+    actions failing to serialize) or, if `ttl` is set, after `ttl` seconds.
+    ### Methods:
+    - get
+    - async_get
+    - invalidate
+    """
+    def __init__(self, ttl: float=None):
+        self.ttl = ttl
+        self._classes = {}
+        self._current = {}
+        self._generators = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _node_key(node):
+        return node_key(node)
+
+    def _generator(self, node) -> abigen:
+        key = self._node_key(node)
+        with self._lock:
+            if key not in self._generators:
+                self._generators[key] = abigen(node_source(node))
+            return self._generators[key]
+
+    def _cached(self, name: str, node, force_recreate: bool) -> type:
+        """
+        Loaded class if it doesn't need a recheck
+        """
+        node_key = self._node_key(node)
+        current = self._current.get((node_key, name))
+        if current and not force_recreate and (self.ttl is None or time.monotonic() - current[1] < self.ttl):
+            return self._classes[(node_key, name, current[0])]
+        return None
+
+    def get(self, name: str, node: str="https://wax.greymass.com", force_recreate: bool=False) -> type:
+        """
+        Get generated contract class, generating or regenerating it if needed
+        """
+        klass = self._cached(name, node, force_recreate)
+        if klass is not None:
+            return klass
+        return self._update(name, node, force_recreate)
+
+    async def async_get(self, name: str, wax, force_recreate: bool=False) -> type:
+        """
+        `get` for the event loop: abi_hash is checked with async node api `wax`
+        (`AsyncCleos`), file generation and import run in executor
+        """
+        node = node_source(wax)
+        klass = self._cached(name, node, force_recreate)
+        if klass is not None:
+            return klass
+
+        import asyncio
+        abi_hash = await self._generator(node).cache.async_get_hash(wax, name, force=force_recreate)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._update, name, node, force_recreate, abi_hash)
+
+    def _update(self, name: str, node, force_recreate: bool, abi_hash: str=None) -> type:
+        node_key = self._node_key(node)
+        with self._lock:
+            abi_hash, klass = self._load(name, node, force_recreate, abi_hash)
+            self._classes[(node_key, name, abi_hash)] = klass
+            self._current[(node_key, name)] = (abi_hash, time.monotonic())
+            return klass
+
+    def _load(self, name: str, node, force_recreate: bool, abi_hash: str=None) -> tuple:
+        module_name = name.replace(".", "_")
+        generator = self._generator(node)
+
+        if abi_hash is None:
+            abi_hash = generator.cache.get_hash(name, force=force_recreate)
+        if not os.path.exists(f'contracts/{module_name}.py') or force_recreate:
+            generator.gen(name, abi_hash=abi_hash)
+
+        node_key = self._node_key(node)
+        if (node_key, name, abi_hash) in self._classes:
+            return abi_hash, self._classes[(node_key, name, abi_hash)]
+
+        mod = __import__(f"contracts.{module_name}", fromlist=[module_name])
+
+        # contract was redeployed (or file was generated by older litewax)
+        if getattr(mod, "TEMPLATE_VERSION", None) != TEMPLATE_VERSION or \
+           getattr(mod, "ABI_HASH", None) != abi_hash:
+            generator.gen(name, abi_hash=abi_hash)
+            importlib.invalidate_caches()
+            mod = importlib.reload(mod)
+
+        return abi_hash, getattr(mod, module_name)
+
+    def invalidate(self, name: str=None, node=None):
+        """
+        Forget loaded classes (all, of one contract and/or of one node).
+        abi_hash of invalidated contract is rechecked with the node on next `get`
+        """
+        node_key = self._node_key(node) if node is not None else None
+        with self._lock:
+            for key in list(self._current):
+                if (name is None or key[1] == name) and (node is None or key[0] == node_key):
+                    del self._current[key]
+            for key in list(self._classes):
+                if (name is None or key[1] == name) and (node is None or key[0] == node_key):
+                    del self._classes[key]
+            if name is not None:
+                for key, generator in self._generators.items():
+                    if node is None or key == node_key:
+                        generator.cache.invalidate(name)
+
+
+registry = ContractRegistry()
 
 def Contract(name: str, client=None, actor=None, permission="active", force_recreate=False, node=None):
-    if not node and client:
-        node = client.node
-    else:
-        node = "https://wax.greymass.com"
-    
-    
-    if not os.path.exists(f'contracts/{name.replace(".", "_")}.py') or force_recreate:
-        abigen().gen(name)
-
-    mod = __import__(f"contracts.{name.replace('.', '_')}", fromlist=[name.replace('.', '_')])
-    klass = getattr(mod, name.replace('.', '_'))
+    if not node:
+        node = client.wax if client else "https://wax.greymass.com"
+
+    # node api of the client is kept: contract requests go through its pool
+    wax = None if isinstance(node, (str, list, tuple, NodePool)) else node
+    node = node_source(node)
+
+    klass = registry.get(name, node, force_recreate=force_recreate)
     if client:
-        return klass(actor=client.name, node=node, permission=permission)
+        return klass(actor=client.name, node=node, permission=permission, wax=wax)
     elif actor:
-        return klass(actor=actor, node=node, permission=permission)
+        return klass(actor=actor, node=node, permission=permission, wax=wax)
+
+    return klass(node=node, permission=permission, wax=wax)
 
-    return klass(node=node, permission=permission)
+async def AsyncContract(name: str, wax, actor: str="", permission="active", force_recreate=False):
+    """
+    `Contract` over async node api `wax` (`AsyncCleos`), the class is loaded without blocking the event loop
+    """
+    klass = await registry.async_get(name, wax, force_recreate=force_recreate)
+    return klass(actor=actor, node=node_source(wax), permission=permission, wax=wax)
 
 if __name__ == "__main__":
     c = Contract("res.pink")
     c.set_actor("zknmi.wam")
-    print(c.noop())
\ No newline at end of file
+    print(c.noop())
@@ -10,6 +10,9 @@ class SignError(Exception):
 class UnknownError(Exception):
     pass
 
+class AuthorizationError(UnknownError):
+    pass
+
 class CPUlimit(Exception):
     pass
 
@@ -23,4 +26,13 @@ class CookiesExpired(Exception):
     pass
 
 class PayWithPushError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class SerializationError(Exception):
+    pass
+
+class NodeUnavailable(Exception):
+    pass
+
+class AbiNotFound(Exception):
+    pass
@@ -0,0 +1,267 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List
+
+# stages reported by litewax
+STAGES = ("get_name", "serialize", "tapos", "encode", "sign", "cosign", "push")
+
+# histogram bucket upper bounds, seconds
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+_hooks = []
+_tracer = None
+
+
+class Event:
+    """
+    Timing of one stage with labels (`node`, `signer`, `payer`... and `outcome`)
+    """
+    __slots__ = ('stage', 'duration', 'labels')
+
+    def __init__(self, stage: str, duration: float, labels: dict):
+        self.stage = stage
+        self.duration = duration
+        self.labels = labels
+
+    def __str__(self):
+        return f"Event(stage={self.stage}, duration={self.duration * 1000:.3f}ms, labels={self.labels})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class Span:
+    """
+    Times a stage, reports `Event` to hooks and the tracer on exit.
+    `outcome` label is `ok` or exception class name
+    """
+    __slots__ = ('stage', 'labels', 'start', '_otel', '_otel_span')
+
+    def __init__(self, stage: str, labels: dict):
+        self.stage = stage
+        self.labels = labels
+        self._otel = None
+
+    def __enter__(self):
+        tracer = _tracer
+        if tracer is not None:
+            self._otel = tracer.start_as_current_span(f"litewax.{self.stage}", attributes=dict(self.labels))
+            self._otel_span = self._otel.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.labels['outcome'] = exc_type.__name__
+        else:
+            self.labels.setdefault('outcome', 'ok')
+
+        if self._otel is not None:
+            for key, value in self.labels.items():
+                self._otel_span.set_attribute(f"litewax.{key}", value)
+            self._otel.__exit__(exc_type, exc, tb)
+
+        event = Event(self.stage, duration, self.labels)
+        for hook in tuple(_hooks):
+            try:
+                hook(event)
+            except Exception:
+                # metrics must never break transactions
+                pass
+        return False
+
+    def set(self, **labels):
+        """
+        Add labels known only inside the stage
+        """
+        self.labels.update(labels)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **labels):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+def span(stage: str, **labels):
+    """
+    Context manager timing `stage`, free when nothing is installed
+    """
+    if not _hooks and _tracer is None:
+        return _NOOP
+    return Span(stage, labels)
+
+def add_hook(hook: Callable[[Event], None]):
+    """
+    Call `hook(event)` after every instrumented stage
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+def remove_hook(hook: Callable[[Event], None]):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+def set_tracer(tracer):
+    """
+    Report stages as spans of OpenTelemetry-compatible tracer
+    (`start_as_current_span(name, attributes=...)`), None to disable
+    """
+    global _tracer
+    _tracer = tracer
+
+
+class Histogram:
+    """
+    Bucketed latency distribution
+    ### Methods:
+    - observe
+    - percentile
+    - merge
+    """
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'min', 'max')
+
+    def __init__(self, bounds: tuple=DEFAULT_BUCKETS):
+        self.bounds = bounds
+        # last bucket is +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def __str__(self):
+        return f"Histogram(count={self.count}, mean={self.mean * 1000:.3f}ms, p50={self.percentile(50) * 1000:.3f}ms, p99={self.percentile(99) * 1000:.3f}ms)"
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimated `q` percentile, linear inside a bucket
+        """
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                low = self.bounds[i - 1] if i else 0.0
+                high = self.bounds[i] if i < len(self.bounds) else self.max
+                value = low + (high - low) * (rank - seen) / count
+                return min(max(value, self.min), self.max)
+            seen += count
+        return self.max
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": dict(zip(self.bounds + (float('inf'),), self.counts)),
+        }
+
+
+class HistogramCollector:
+    """
+    In-memory hook: latency histogram per stage and label set
+    ### Methods:
+    - install
+    - uninstall
+    - histogram
+    - snapshot
+    - reset
+    """
+    def __init__(self, buckets: tuple=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event):
+        key = (event.stage, tuple(sorted(event.labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(event.duration)
+
+    def __str__(self):
+        lines = [f"{'stage':<10} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  labels"]
+        # label values may be of mixed types (None, str, int)
+        items = sorted(self._histograms.items(), key=lambda x: (x[0][0], repr(x[0][1])))
+        for (stage, labels), h in items:
+            lines.append(
+                f"{stage:<10} {h.count:>7} {h.percentile(50) * 1000:>9.3f} {h.percentile(95) * 1000:>9.3f} "
+                f"{h.percentile(99) * 1000:>9.3f}  {dict(labels)}")
+        return "\n".join(lines)
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+    def install(self) -> "HistogramCollector":
+        add_hook(self)
+        return self
+
+    def uninstall(self):
+        remove_hook(self)
+
+    def histogram(self, stage: str, **labels) -> Histogram:
+        """
+        Merged histogram of `stage` over label sets matching `labels`
+        """
+        merged = Histogram(self.buckets)
+        with self._lock:
+            for (name, key), histogram in self._histograms.items():
+                values = dict(key)
+                if name == stage and all(values.get(k) == v for k, v in labels.items()):
+                    merged.merge(histogram)
+        return merged
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [
+                dict(stage=stage, labels=dict(labels), **histogram.to_dict())
+                for (stage, labels), histogram in self._histograms.items()
+            ]
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
@@ -1,18 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
-from eospy.types import Transaction
-from eospy.utils import sig_digest
-import pytz
-import datetime as dt
 
 from .client import Client
 from .contract import Contract
+from .chaincontext import ChainContext
+from .push import check_push_result, broadcast_nodes, broadcast_transaction
+from .action import serialize_actions
+from .transaction import PackedTransaction, SignedTransaction
+from .transport import Transport, get_transport
 from .exceptions import *
-from .paywith import PayWith
+from .instrument import span
+from .accounts import AccountCache, accounts_by_keys
 
 
 class MultiSigClient():
     """
     ### Methods:
+    - resolve
     - SetNode
     - Transaction
     - Contract
@@ -21,30 +25,75 @@ class MultiSigClient():
             private_keys: list = [], 
             cookies: list = [],  
             clients: List[Client] = [],
-            node: str='https://wax.greymass.com'):
-
-        self.node = node
+            node='https://wax.greymass.com',
+            tapos_ttl: float=30,
+            transport: Transport=None,
+            names: dict = {},
+            lazy: bool=False,
+            account_cache: AccountCache=None,
+            signer_backend: str=None,
+            min_batch: int=None):
+
+        self.transport = transport or get_transport()
+        self.node = self.transport.cleos(node).url
 
         if not cookies and not private_keys and not clients:
             raise AuthNotFound("You must provide a private key, a cookie or a clients")
 
+        # one TAPOS provider for all cosigners
+        self.chain = ChainContext(self.transport.cleos(node), ttl=tapos_ttl)
+
+        self.account_cache = account_cache
+        # cosigner keys signed by the process pool from this count (`litewax.signer.sign_batch`)
+        self.min_batch = min_batch
         self.clients = list(clients)
 
+        # names are resolved in bulk by `resolve`, known ones (by private key or cookie) are not looked up
         for private_key in private_keys:
-            self.clients.append(Client(private_key=private_key, node=node))
+            self.clients.append(Client(private_key=private_key, node=node, chain=self.chain, transport=self.transport,
+                name=names.get(private_key), lazy=True, account_cache=account_cache, signer_backend=signer_backend))
 
         for cookie in cookies:
-            self.clients.append(Client(cookie=cookie, node=node))
+            self.clients.append(Client(cookie=cookie, node=node, chain=self.chain, transport=self.transport,
+                name=names.get(cookie), lazy=True, account_cache=account_cache))
 
         self.Contract = Contract
 
-    def SetNode(self, node: str):
-        self.node = node
+        if not lazy:
+            self.resolve()
+
+    def resolve(self, workers: int=8) -> List[str]:
+        """
+        Resolve unknown account names: all public keys with batched `get_accounts_by_authorizers`
+        requests, WCW logins in parallel
+        ### Returns:
+        - account names of all clients
+        """
+        keys = [cl for cl in self.clients if not cl.resolved and cl.type == 'private_key']
+        cookies = [cl for cl in self.clients if not cl.resolved and cl.type == 'cookie']
+
+        if keys:
+            with span("get_name", signer="bulk"):
+                names = accounts_by_keys(keys[0].wax, [cl.public_key for cl in keys], workers=workers, cache=self.account_cache)
+            for cl in keys:
+                cl.name = names.get(cl.public_key)
+
+        if cookies:
+            with ThreadPoolExecutor(max_workers=min(workers, len(cookies))) as executor:
+                list(executor.map(lambda cl: cl.name, cookies))
+
+        # keys without account fall back to own lookup (and its error)
+        return [cl.name for cl in self.clients]
+
+    def SetNode(self, node):
+        self.node = self.transport.cleos(node).url
+        self.chain = ChainContext(self.transport.cleos(node), ttl=self.chain.ttl)
         for client in self.clients:
             client.SetNode(node)
+            client.chain = self.chain
 
-    def Transaction(self, *actions):
-        return TX(self, *actions, node=self.node)
+    def Transaction(self, *actions, expiration: float=60):
+        return TX(self, *actions, node=self.node, expiration=expiration)
 
     def __getitem__(self, index):
         return self.clients[index]
@@ -65,77 +114,74 @@ class TX():
     - get_trx_extend_info
     - push
     """
-    def __init__(self, client: MultiSigClient, *actions, node: str='https://wax.greymass.com'):
+    def __init__(self, client: MultiSigClient, *actions, node: str='https://wax.greymass.com', expiration: float=60):
         self.client = client
         self.node = node
+        self.expiration = expiration
         self.wax = self.client[0].wax
 
         self.actions = list(actions)
 
     def pay_with(self, payer: str, network='mainnet'):
+        from .paywith import PayWith
         return PayWith(self, payer, network)
 
     def get_trx_extend_info(self):
+        self.client.resolve()
         trx_wallets = []
         for action in list(self.actions):
-            trx_wallets.append(action.result['authorization'][0]['actor'])
-
-        transaction = {
-            "actions": [a.result for a in self.actions]
-        }
-            
-        transaction['expiration'] = str(
-            (dt.datetime.utcnow() + dt.timedelta(seconds=60)).replace(tzinfo=pytz.UTC))
-
-        chain_info, lib_info = self.wax.get_chain_lib_info()
-        trx = Transaction(transaction, chain_info, lib_info)
-
-        digest_anchor = sig_digest(trx.encode(), chain_info['chain_id'])
+            trx_wallets.append(action.actor)
+
+        chain_info, lib_info = self.client.chain.get()
+        trx = PackedTransaction.build(serialize_actions(self.actions), chain_info, lib_info, self.expiration)
+
+        cosigners = [cl for cl in self.client if cl.name in trx_wallets]
+        keys = [cl for cl in cosigners if cl.type == 'private_key']
+        cookies = [cl for cl in cosigners if cl.type == 'cookie']
+
+        from .signer import sign_batch
+
+        # wcw requests run concurrently while private keys are signed in batch,
+        # order of signatures is kept
+        signed = {}
+        with span("sign", signer="multisig"):
+            wcw = []
+            if cookies:
+                executor = ThreadPoolExecutor(max_workers=len(cookies))
+                wcw = [executor.submit(cl.sign, trx.raw) for cl in cookies]
+                # submitted requests still run, threads exit when they are done
+                executor.shutdown(wait=False)
+            for cl, signature in zip(keys, sign_batch([(trx.digest, cl.signer) for cl in keys], min_batch=self.client.min_batch)):
+                signed[id(cl)] = [signature]
+            for cl, future in zip(cookies, wcw):
+                signed[id(cl)] = future.result()
 
         signatures = []
+        for cl in cosigners:
+            signatures += signed[id(cl)]
 
-        for cl in self.client:
-            if cl.name not in trx_wallets:
-                continue
-
-            if cl.type == 'private_key':
-                signatures.append(cl.sign(digest_anchor))
-
-            if cl.type == 'cookie':
-                signatures += cl.sign(trx.encode())
-
-        return {
-            "signatures": signatures,
-            "packed": trx.encode().hex(),
-            "serealized": [x for x in trx.encode()]
-        }
+        return SignedTransaction(trx, signatures)
 
-    def push(self):
+    def push(self, broadcast=None):
         info = self.get_trx_extend_info()
         signatures = info['signatures']
         packed = info['packed']
 
-        push_create_offer = self.wax.post("chain.push_transaction",
-            json={
-                "signatures": signatures,
-                "compression": 0,
-                "packed_context_free_data": "",
-                "packed_trx": packed
-            },
-            timeout=30
-        )
-        
-        if push_create_offer['transaction_id'] == '':
-            if push_create_offer['error']["what"] == 'Transaction exceeded the current CPU usage limit imposed on the transaction':
-                raise CPUlimit('Error: CPU usage limit!!')
-
-            elif push_create_offer['error']["what"] == 'Expired Transaction':
-                raise ExpiredTransaction('Error: Expired Transaction!!')
-            else:
-                raise UnknownError(
-                    f'Error: {push_create_offer["error"]["details"][0]["message"]}')
-
-        return push_create_offer
+        try:
+            if broadcast:
+                return broadcast_transaction(
+                    broadcast_nodes(self.wax, broadcast), signatures, packed, self.wax.session, timeout=30)
+
+            # nodeos errors come back as json (http 500), mapped to CPUlimit / ExpiredTransaction / UnknownError
+            resp = self.wax.push_packed(signatures, packed, timeout=30)
+            return check_push_result(resp, packed)
+        except AuthorizationError:
+            # cached accounts of cosigners may no longer be authorized by their keys
+            actors = {x.actor for x in self.actions}
+            for cl in self.client:
+                if cl.account_cache is not None and cl.name in actors:
+                    cl.forget_name()
+            raise
 
 
 if __name__ == "__main__":
@@ -0,0 +1,279 @@
+import time
+import hashlib
+import threading
+from collections import deque
+from typing import List, Union, TYPE_CHECKING
+from urllib.parse import urlparse
+
+from .transport import PooledCleos, Transport, get_transport
+from .exceptions import NodeUnavailable
+
+if TYPE_CHECKING:
+    import requests
+
+# statuses meaning "node is overloaded or down", not "transaction is bad"
+FAILOVER_STATUSES = {408, 425, 429, 502, 503, 504}
+
+
+class NodeStats:
+    """
+    Rolling latency (EWMA) and error rate of one api node
+    """
+    def __init__(self, url: str, window: int=50, alpha: float=0.3):
+        self.url = url
+        self.alpha = alpha
+        self.latency = None
+        self.outcomes = deque(maxlen=window)
+        self.failures = 0
+        self.down_until = 0.0
+        self.head_block_num = 0
+
+    def __str__(self):
+        latency = f"{self.latency * 1000:.0f}ms" if self.latency is not None else "?"
+        return f"NodeStats(url={self.url}, latency={latency}, error_rate={self.error_rate:.2f})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def success(self, latency: float):
+        self.latency = latency if self.latency is None else self.alpha * latency + (1 - self.alpha) * self.latency
+        self.outcomes.append(True)
+        self.failures = 0
+
+    def error(self):
+        self.outcomes.append(False)
+        self.failures += 1
+
+
+class NodePool:
+    """
+    Pool of api nodes with health checks, latency-aware routing and failover.
+    Requests go to the fastest healthy node and fall through to the next
+    one on connection errors, timeouts and overload statuses.
+    ### Methods:
+    - ranked
+    - best
+    - report
+    - check
+    - cleos
+    - start
+    - stop
+    """
+    def __init__(self,
+            nodes: List[str],
+            check_interval: float=30,
+            max_error_rate: float=0.5,
+            max_failures: int=3,
+            cooldown: float=30,
+            max_lag: int=20,
+            window: int=50,
+            transport: Transport=None):
+        if not nodes:
+            raise ValueError("NodePool must have at least one node")
+
+        self.nodes = {url.rstrip('/'): NodeStats(url.rstrip('/'), window=window) for url in nodes}
+        self.check_interval = check_interval
+        self.max_error_rate = max_error_rate
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.max_lag = max_lag
+        self.transport = transport or get_transport()
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __str__(self):
+        return f"NodePool(nodes={list(self.nodes.values())})"
+
+    @property
+    def urls(self) -> List[str]:
+        return list(self.nodes)
+
+    def is_healthy(self, stats: NodeStats) -> bool:
+        return stats.down_until <= time.monotonic() and stats.error_rate <= self.max_error_rate
+
+    def ranked(self) -> List[NodeStats]:
+        """
+        Nodes ordered by preference: healthy by latency, then unhealthy as last resort
+        """
+        with self._lock:
+            stats = list(self.nodes.values())
+        healthy = sorted(
+            (x for x in stats if self.is_healthy(x)),
+            key=lambda x: x.latency if x.latency is not None else 0.0)
+        unhealthy = sorted(
+            (x for x in stats if not self.is_healthy(x)),
+            key=lambda x: x.down_until)
+        return healthy + unhealthy
+
+    def best(self) -> str:
+        """
+        Url of the fastest healthy node
+        """
+        return self.ranked()[0].url
+
+    def report(self, url: str, latency: float=None, error: bool=False):
+        """
+        Record outcome of a request
+        """
+        with self._lock:
+            stats = self.nodes[url]
+            if error:
+                stats.error()
+                if stats.failures >= self.max_failures:
+                    # node gets a clean record and is probed again after cooldown
+                    stats.down_until = time.monotonic() + self.cooldown
+                    stats.outcomes.clear()
+                    stats.failures = 0
+            else:
+                stats.success(latency)
+
+    def check(self, timeout: float=5):
+        """
+        Health check all nodes with `get_info`, nodes lagging behind by more
+        than `max_lag` blocks are marked down
+        """
+        from requests.exceptions import RequestException
+        heads = {}
+        for url in self.urls:
+            start = time.monotonic()
+            try:
+                r = self.transport.session.get(f"{url}/v1/chain/get_info", timeout=timeout)
+                r.raise_for_status()
+                heads[url] = r.json()['head_block_num']
+            except (RequestException, ValueError, KeyError):
+                self.report(url, error=True)
+                continue
+            self.report(url, latency=time.monotonic() - start)
+
+        if heads:
+            top = max(heads.values())
+            with self._lock:
+                for url, head in heads.items():
+                    self.nodes[url].head_block_num = head
+                    if top - head > self.max_lag:
+                        self.nodes[url].down_until = time.monotonic() + self.cooldown
+
+    def cleos(self, session: "requests.Session"=None) -> "PoolCleos":
+        """
+        Get node api routed through this pool
+        """
+        return PoolCleos(self, session=session or self.transport.session)
+
+    def start(self):
+        """
+        Run health checks in a background daemon thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                self.check()
+                self._stop.wait(self.check_interval)
+
+        self._thread = threading.Thread(target=run, name="litewax-nodepool", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop background health checks
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class PoolCleos(PooledCleos):
+    """
+    `PooledCleos` sending every request to the best node of `NodePool`
+    """
+    def __init__(self, pool: NodePool, version: str='v1', session: "requests.Session"=None):
+        super().__init__(url=pool.urls[0], version=version, session=session)
+        self.pool = pool
+
+    def __str__(self):
+        return f"PoolCleos(nodes={self.pool.urls})"
+
+    @property
+    def url(self) -> str:
+        return self.pool.best()
+
+    def _request(self, method: str, func: str, **kwargs) -> "requests.Response":
+        if func.startswith('http'):
+            return super()._request(method, func, **kwargs)
+
+        from requests.exceptions import RequestException
+
+        path = self._path(func)
+        errors = []
+        for stats in self.pool.ranked():
+            start = time.monotonic()
+            try:
+                r = self.session.request(method, stats.url + path, **kwargs)
+            except RequestException as e:
+                self.pool.report(stats.url, error=True)
+                errors.append(f"{stats.url}: {e}")
+                continue
+
+            if r.status_code in FAILOVER_STATUSES or (r.status_code >= 500 and not self._is_chain_error(r)):
+                self.pool.report(stats.url, error=True)
+                errors.append(f"{stats.url}: HTTP {r.status_code}")
+                continue
+
+            self.pool.report(stats.url, latency=time.monotonic() - start)
+            return r
+
+        raise NodeUnavailable(f"All nodes failed: {'; '.join(errors)}")
+
+    @staticmethod
+    def _is_chain_error(r: "requests.Response") -> bool:
+        """Node answered with a nodeos error (bad request, not a bad node)"""
+        try:
+            return 'error' in r.json()
+        except ValueError:
+            return False
+
+
+def node_source(node) -> Union[str, tuple, NodePool]:
+    """
+    Url, tuple of urls or `NodePool` behind `node` argument. Node api objects
+    (`PooledCleos`, `PoolCleos`, `AsyncCleos`) are unwrapped
+    """
+    if isinstance(node, list):
+        return tuple(node)
+    if isinstance(node, (str, tuple, NodePool)):
+        return node
+    return node.pool or node.url
+
+def node_key(node) -> Union[str, tuple]:
+    """
+    Stable identity of `node` argument: url or tuple of pool urls
+    (best node of a pool changes, its urls don't)
+    """
+    source = node_source(node)
+    if isinstance(source, NodePool):
+        return tuple(source.urls)
+    if isinstance(source, tuple):
+        return tuple(x.rstrip('/') for x in source)
+    return source
+
+def node_dir(node) -> str:
+    """
+    Cache directory of node: host of single node, hash of pool urls
+    """
+    key = node_key(node)
+    if isinstance(key, tuple):
+        if len(key) > 1:
+            return 'pool-' + hashlib.sha256('\n'.join(sorted(key)).encode()).hexdigest()[:16]
+        key = key[0]
+    return urlparse(key).netloc.replace(':', '_') or 'default'
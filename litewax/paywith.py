@@ -1,8 +1,7 @@
-import cloudscraper
 from .contract import Contract
 from .exceptions import PayWithPushError
-from eospy.utils import sig_digest
-from .types import Payers
+from .push import check_push_result
+from .instrument import span
 class AtomicHub:
     """
     Allowed actions:
@@ -14,16 +13,15 @@ class AtomicHub:
         self.trx = trx
         self.wax = trx.client.wax
 
-        if self.trx.actions[0].result["account"] != "res.pink" or\
-           self.trx.actions[0].result["name"] != "noop" or\
-           self.trx.actions[0].result["authorization"][0]["actor"] != "res.pink" or\
-           self.trx.actions[0].result["authorization"][0]["permission"] != "paybw":
-            
+        if not self.trx.actions[0].matches("res.pink", "noop", "res.pink", "paybw"):
             self.trx.actions = [
                 Contract("res.pink", actor="res.pink", permission="paybw").noop()
             ] + self.trx.actions
 
-        self.scraper = cloudscraper.create_scraper(browser={'custom': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/106.0.0.0 Safari/537.36'})
+        transport = trx.client.transport
+        self.scraper = transport.scraper(
+            browser={'custom': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/106.0.0.0 Safari/537.36'},
+            key="atomichub")
 
         self.sign_link = "https://wax-mainnet-signer.api.atomichub.io/v1/sign"
         self.push_link = "chain.push_transaction"
@@ -33,19 +31,20 @@ class AtomicHub:
         signatures = signed['signatures']
 
         # sign with atomichub
-        self.scraper.options(self.sign_link, headers={
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9",
-            "Accept-Encoding": "gzip, deflate",
-            "Accept-Language": "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Cache-Control": "max-age=0",
-            "Connection": "keep-alive",
-            "DNT": "1",
-            "Host": "wax.api.atomicassets.io",
-            "Upgrade-Insecure-Requests": "1",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.85 Safari/537.36"
-        })
-
-        sign_packed = self.scraper.post(self.sign_link, json={"transaction": signed['packed']}).json()
+        with span("cosign", payer="atomichub"):
+            self.scraper.options(self.sign_link, headers={
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9",
+                "Accept-Encoding": "gzip, deflate",
+                "Accept-Language": "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
+                "Cache-Control": "max-age=0",
+                "Connection": "keep-alive",
+                "DNT": "1",
+                "Host": "wax.api.atomicassets.io",
+                "Upgrade-Insecure-Requests": "1",
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.85 Safari/537.36"
+            })
+
+            sign_packed = self.scraper.post(self.sign_link, json={"transaction": signed['packed']}).json()
 
         if sign_packed.get('success') is False:
             raise PayWithPushError(sign_packed.get('message'))
@@ -53,13 +52,7 @@ class AtomicHub:
         signatures += sign_packed['data']
 
         # push transaction
-        push = self.wax.post(self.push_link, json={
-            "signatures": signatures,
-            "compression": 0,
-            "packed_context_free_data": "",
-            "packed_trx": signed['packed']
-        })
-        return push
+        return check_push_result(self.wax.push_packed(signatures, signed['packed'], func=self.push_link), signed['packed'])
 
 
 class Nefty:
@@ -67,17 +60,13 @@ class Nefty:
         self.trx = trx
         self.wax = self.trx.wax
 
-        if self.trx.actions[0].result["account"] != "neftyblocksd" or\
-           self.trx.actions[0].result["name"] != "paycpu" or\
-           self.trx.actions[0].result["authorization"][0]["actor"] != "neftybrespay" or\
-           self.trx.actions[0].result["authorization"][0]["permission"] != "active":
-            
+        if not self.trx.actions[0].matches("neftyblocksd", "paycpu", "neftybrespay", "active"):
             self.trx.actions = [
                 Contract("neftybrespay", actor="neftybrespay").paycpu()
             ] + self.trx.actions
 
-        self.scraper = cloudscraper.create_scraper()
-        self.scraper.headers.update({
+        transport = trx.client.transport
+        self.scraper = transport.scraper(key="nefty", headers={
             'accept': '*/*',
             'accept-encoding': 'gzip, deflate, br',
             'accept-language': 'ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7',
@@ -106,22 +95,17 @@ class Nefty:
         signatures = signed['signatures']
 
         # sign with neftyblocks
-        self.scraper.options(self.sign_link)
-        sign_packed = self.scraper.post(self.sign_link, json={"transaction": signed['packed']}).json()
+        with span("cosign", payer="nefty"):
+            self.scraper.options(self.sign_link)
+            sign_packed = self.scraper.post(self.sign_link, json={"transaction": signed['packed']}).json()
 
         if sign_packed.get('error'):
             raise PayWithPushError(sign_packed['error'])
 
-        signatures += sign_packed.json()['signatures']
+        signatures += sign_packed['signatures']
 
         # push transaction
-        push = self.wax.post(self.push_link, json={
-            "signatures": signatures,
-            "compression": 0,
-            "packed_context_free_data": "",
-            "packed_trx": signed['packed']
-        })
-        return push
+        return check_push_result(self.wax.push_packed(signatures, signed['packed'], func=self.push_link), signed['packed'])
 
 class CustomPayer:
     def __init__(self, trx, payer_client, permission="active"):
@@ -130,11 +114,7 @@ class CustomPayer:
         self.payer_client = payer_client
 
 
-        if self.trx.actions[0].result["account"] != "abuztradewax" or\
-           self.trx.actions[0].result["name"] != "noop" or\
-           self.trx.actions[0].result["authorization"][0]["actor"] != payer_client.name or\
-           self.trx.actions[0].result["authorization"][0]["permission"] != permission:
-            
+        if not self.trx.actions[0].matches("abuztradewax", "noop", payer_client.name, permission):
             self.trx.actions = [
                 Contract("abuztradewax", actor=payer_client.name, permission=permission).noop()
             ] + self.trx.actions
@@ -143,23 +123,14 @@ class CustomPayer:
         signed = self.trx.get_trx_extend_info()
         signatures = signed['signatures']
 
-        if self.payer_client.type == 'private_key':
-            chain_info = self.trx.wax.get('chain.get_info')
-            
-            digest = sig_digest(bytearray(signed['serealized']), chain_info['chain_id'])
-
-            signatures.append(self.payer_client.sign(digest))
-        else:
-            signatures += self.payer_client.sign(bytearray(signed['serealized']))
+        with span("cosign", payer="custom"):
+            if self.payer_client.type == 'private_key':
+                signatures.append(self.payer_client.sign(signed.digest))
+            else:
+                signatures += self.payer_client.sign(signed.transaction.raw)
 
         # push transaction
-        push = self.wax.post('chain.push_transaction', json={
-            "signatures": signatures,
-            "compression": 0,
-            "packed_context_free_data": "",
-            "packed_trx": signed['packed']
-        })
-        return push
+        return check_push_result(self.wax.push_packed(signatures, signed['packed']), signed['packed'])
 
 class PayWith:
     def __init__(self, trx, pay_with="nefty", custom_payer_client=None, network="mainnet"):
@@ -180,7 +151,7 @@ class PayWith:
             raise ValueError("Unknown payer. Must be 'Nefty', 'AtomicHub' or 'Custom'")
 
     def __str__(self):
-        actions = ",\n\n        ".join([f"Action(account={x['account']}, name={x['name']}, authorization={x['authorization']}, data={x['data']})" for x in self.pay_with.trx.actions])
+        actions = ",\n\n        ".join([f"Action(account={x.account}, name={x.name}, authorization={[dict(a) for a in x.authorization]}, data={dict(x.args)})" for x in self.pay_with.trx.actions])
         return f"""litewax.Transaction(
     node={self.pay_with.trx.client.node},
     sender={self.pay_with.trx.client.name},
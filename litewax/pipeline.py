@@ -0,0 +1,249 @@
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Iterator, List
+
+from .push import before_push
+from .nodepool import node_key
+
+_STOP = object()
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter: `rate` tokens per second, bursts up to `capacity`
+    ### Methods:
+    - acquire
+    """
+    def __init__(self, rate: float, capacity: float=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return f"TokenBucket(rate={self.rate}, capacity={self.capacity})"
+
+    def acquire(self, tokens: float=1):
+        """
+        Block until `tokens` are available
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class PipelineResult:
+    """
+    Outcome of one submitted transaction
+    """
+    __slots__ = ('tx', 'result', 'error')
+
+    def __init__(self, tx, result: dict=None, error: Exception=None):
+        self.tx = tx
+        self.result = result
+        self.error = error
+
+    def __str__(self):
+        return f"PipelineResult(ok={self.ok}, result={self.result}, error={self.error!r})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class TransactionPipeline:
+    """
+    Push many transactions (`TX` or `PayWith` objects) with worker threads.
+    Transactions are built and signed concurrently, the HTTP push of each one
+    waits for the token bucket of its node (all nodes of a `NodePool` share one)
+    and of each acting account, and `submit` blocks while `max_queue`
+    transactions are waiting (backpressure).
+    With `pay_with` a `TX` is paid by that account only when the client
+    resource monitor predicts its first authorizer can't afford it.
+    Results are kept for `results` until read: unbounded by default, with
+    `max_results` workers block while that many results are unread (read
+    them while submitting, `close` lifts the bound so it never hangs), with `on_result` every result is passed to the
+    callback from the worker thread and nothing is kept.
+    ### Methods:
+    - submit
+    - map
+    - results
+    - close
+    """
+    def __init__(self,
+            workers: int=8,
+            max_queue: int=100,
+            node_rate: float=10,
+            account_rate: float=None,
+            burst: float=None,
+            pay_with: str=None,
+            max_results: int=None,
+            on_result=None):
+        self.node_rate = node_rate
+        self.account_rate = account_rate
+        self.burst = burst
+        self.pay_with = pay_with
+        self.on_result = on_result
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._results = queue.Queue(maxsize=max_results or 0)
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._alive = workers
+        self._workers = [
+            threading.Thread(target=self._work, name=f"litewax-pipeline-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _bucket(self, key: tuple, rate: float) -> TokenBucket:
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(rate, self.burst)
+            return self._buckets[key]
+
+    @staticmethod
+    def _accounts(tx) -> List[str]:
+        """
+        Acting accounts of `TX` or `PayWith`
+        """
+        trx = getattr(tx, 'trx', tx)
+        return sorted({action.actor for action in trx.actions})
+
+    def _limit(self, tx, node):
+        """
+        Wait for tokens of push of `tx` to `node` (push url or node api)
+        """
+        if self.account_rate:
+            for account in self._accounts(tx):
+                self._bucket(('account', account), self.account_rate).acquire()
+        if self.node_rate:
+            # pool node api: best node changes between pushes, urls of the pool don't
+            key = node if isinstance(node, str) else node_key(node)
+            self._bucket(('node', key), self.node_rate).acquire()
+
+    @staticmethod
+    def _monitor(tx):
+        return getattr(getattr(getattr(tx, 'trx', tx), 'client', None), 'resources', None)
+
+    def _push(self, tx) -> tuple:
+        """
+        Push `tx` (routed to payer if needed)
+        ### Returns:
+        - (pushed transaction, push result)
+        """
+        monitor = self._monitor(tx)
+        if monitor is not None and self.pay_with:
+            tx = monitor.route(tx, self.pay_with)
+
+        # signing is not rate limited, tokens are taken right before the HTTP push
+        with before_push(lambda node: self._limit(tx, node)):
+            resp = tx.push()
+        if monitor is not None:
+            monitor.record(tx, resp)
+        return tx, resp
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            future, tx = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                tx, resp = self._push(tx)
+            except Exception as e:
+                future.set_exception(e)
+                self._result(PipelineResult(tx, error=e))
+            else:
+                future.set_result(resp)
+                self._result(PipelineResult(tx, result=resp))
+
+        with self._lock:
+            self._alive -= 1
+            last = self._alive == 0
+        if last and self.on_result is None:
+            self._results.put(_STOP)
+
+    def _result(self, result: PipelineResult):
+        if self.on_result is None:
+            self._results.put(result)
+            return
+        try:
+            self.on_result(result)
+        except Exception:
+            # callback errors must not stop the worker
+            pass
+
+    def submit(self, tx, timeout: float=None) -> Future:
+        """
+        Queue transaction, blocks while queue is full
+        ### Returns:
+        - `concurrent.futures.Future` with push result
+        """
+        if self._closed:
+            raise RuntimeError("Pipeline is closed")
+        future = Future()
+        self._queue.put((future, tx), timeout=timeout)
+        return future
+
+    def map(self, txs) -> List[Future]:
+        """
+        Submit all transactions
+        """
+        return [self.submit(tx) for tx in txs]
+
+    def results(self) -> Iterator[PipelineResult]:
+        """
+        Stream of results in completion order, ends after `close` when all transactions are done
+        """
+        if self.on_result is not None:
+            raise RuntimeError("Results are passed to `on_result`")
+        while True:
+            item = self._results.get()
+            if item is _STOP:
+                self._results.put(_STOP)
+                return
+            yield item
+
+    def close(self, wait: bool=True):
+        """
+        Stop accepting transactions, queued ones are still pushed.
+        Unread results no longer block workers, they stay readable in `results`
+        """
+        if not self._closed:
+            self._closed = True
+            for _ in self._workers:
+                self._queue.put(_STOP)
+        if wait:
+            # nothing is submitted anymore, remaining results are bounded by the queue
+            with self._results.mutex:
+                self._results.maxsize = 0
+                self._results.not_full.notify_all()
+            for worker in self._workers:
+                worker.join()
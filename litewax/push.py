@@ -0,0 +1,203 @@
+import hashlib
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, TYPE_CHECKING
+
+from .exceptions import CPUlimit, ExpiredTransaction, UnknownError, AuthorizationError, NodeUnavailable
+from .instrument import span
+
+if TYPE_CHECKING:
+    import asyncio
+    import requests
+
+DUPLICATE_TRANSACTION = 3040008
+# tx_cpu_usage_exceeded, leeway_deadline_exception
+CPU_ERRORS = {3080004, 3081001}
+# expired_tx_exception
+EXPIRED_ERRORS = {3040005}
+# unsatisfied_authorization, missing_auth_exception, irrelevant_auth_exception
+AUTH_ERRORS = {3090003, 3090004, 3090005}
+
+_executor = None
+_background = set()
+_hooks = threading.local()
+
+
+@contextmanager
+def before_push(callback):
+    """
+    Call `callback(node)` right before every HTTP push this thread makes in
+    the block (`node` is push url or node api object), after the transaction
+    is built and signed
+    """
+    previous = getattr(_hooks, 'callback', None)
+    _hooks.callback = callback
+    try:
+        yield
+    finally:
+        _hooks.callback = previous
+
+def wait_push(node):
+    """
+    Run `before_push` callback of this thread, if any
+    """
+    callback = getattr(_hooks, 'callback', None)
+    if callback is not None:
+        callback(node)
+
+def push_payload(signatures: list, packed: str) -> dict:
+    return {
+        "signatures": signatures,
+        "compression": 0,
+        "packed_context_free_data": "",
+        "packed_trx": packed
+    }
+
+def transaction_id(packed: str) -> str:
+    return hashlib.sha256(bytes.fromhex(packed)).hexdigest()
+
+def is_duplicate(resp: dict) -> bool:
+    error = resp.get('error') or {}
+    return error.get('code') == DUPLICATE_TRANSACTION or error.get('name') == 'tx_duplicate'
+
+def push_outcome(resp: dict) -> str:
+    """
+    Outcome label of push response: `ok` or nodeos error name
+    """
+    if resp.get('transaction_id'):
+        return 'ok'
+    error = resp.get('error') or {}
+    return error.get('name') or str(error.get('code') or 'error')
+
+def duplicate_receipt(packed: str) -> dict:
+    """
+    Receipt of transaction some node already has (it was accepted)
+    """
+    return {"transaction_id": transaction_id(packed), "processed": None, "duplicate": True}
+
+def check_push_result(resp: dict, packed: str=None) -> dict:
+    """
+    Raise litewax exception if push_transaction failed.
+    With `packed` "duplicate transaction" error is a success: push retried
+    on another node after a timeout may hit the transaction sent by the first try
+    """
+    if resp.get('transaction_id'):
+        return resp
+    if packed is not None and is_duplicate(resp):
+        return duplicate_receipt(packed)
+
+    error = resp.get('error') or {}
+    if error.get("what") == 'Transaction exceeded the current CPU usage limit imposed on the transaction' or \
+       error.get("code") in CPU_ERRORS:
+        raise CPUlimit('Error: CPU usage limit!!')
+
+    elif error.get("what") == 'Expired Transaction' or error.get("code") in EXPIRED_ERRORS:
+        raise ExpiredTransaction('Error: Expired Transaction!!')
+
+    details = error.get("details") or [{"message": error.get("what", resp)}]
+    if error.get("code") in AUTH_ERRORS:
+        raise AuthorizationError(f'Error: {details[0]["message"]}')
+    raise UnknownError(f'Error: {details[0]["message"]}')
+
+def broadcast_nodes(wax, broadcast) -> List[str]:
+    """
+    Resolve `broadcast` argument of `TX.push` to node urls:
+    - list of urls
+    - True: every node of client's NodePool
+    - int: N best nodes of client's NodePool
+    """
+    if isinstance(broadcast, (list, tuple)):
+        return list(broadcast)
+
+    pool = getattr(wax, 'pool', None)
+    urls = [x.url for x in pool.ranked()] if pool is not None else [wax.url]
+    if broadcast is True:
+        return urls
+    return urls[:max(int(broadcast), 1)]
+
+def _resolve(results: list, errors: list, packed: str) -> dict:
+    # some node already has the transaction, so it was accepted
+    if any(is_duplicate(x) for x in results):
+        return duplicate_receipt(packed)
+
+    if results:
+        return check_push_result(results[0])
+
+    raise NodeUnavailable(f"Broadcast failed on all nodes: {'; '.join(errors)}")
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="litewax-broadcast")
+    return _executor
+
+def _post(session: "requests.Session", url: str, payload: dict, timeout: float) -> dict:
+    return session.post(f"{url}/v1/chain/push_transaction", json=payload, timeout=timeout).json()
+
+def broadcast_transaction(nodes: List[str], signatures: list, packed: str, session: "requests.Session", timeout: float=30) -> dict:
+    """
+    Send the same signed transaction to all nodes concurrently and return
+    the first successful receipt, "duplicate transaction" errors are ignored
+    """
+    from requests.exceptions import RequestException
+    payload = push_payload(signatures, packed)
+    for url in nodes:
+        wait_push(url)
+    with span("push", node="broadcast") as s:
+        futures = {_get_executor().submit(_post, session, url, payload, timeout): url for url in nodes}
+
+        results, errors = [], []
+        for future in as_completed(futures):
+            try:
+                resp = future.result()
+            except (RequestException, ValueError) as e:
+                errors.append(f"{futures[future]}: {e}")
+                continue
+
+            if resp.get('transaction_id'):
+                s.set(winner=futures[future])
+                return resp
+            results.append(resp)
+
+        return _resolve(results, errors, packed)
+
+def _forget(task: "asyncio.Task"):
+    _background.discard(task)
+    if not task.cancelled():
+        task.exception()
+
+async def async_broadcast_transaction(nodes: List[str], signatures: list, packed: str, session, timeout: float=30) -> dict:
+    """
+    Asyncio version of `broadcast_transaction`.
+    Requests still in flight after the first receipt are left to finish in background
+    """
+    import asyncio
+    payload = push_payload(signatures, packed)
+
+    async def post(url):
+        r = await session.post(f"{url}/v1/chain/push_transaction", json=payload, timeout=timeout)
+        return r.json()
+
+    with span("push", node="broadcast") as s:
+        pending = {asyncio.ensure_future(post(url)): url for url in nodes}
+        results, errors = [], []
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                url = pending.pop(task)
+                try:
+                    resp = task.result()
+                except Exception as e:
+                    errors.append(f"{url}: {e!r}")
+                    continue
+
+                if resp.get('transaction_id'):
+                    for rest in pending:
+                        _background.add(rest)
+                        rest.add_done_callback(_forget)
+                    s.set(winner=url)
+                    return resp
+                results.append(resp)
+
+        return _resolve(results, errors, packed)
@@ -0,0 +1,186 @@
+import time
+import threading
+
+from .batcher import CostModel, action_size, TRANSACTION_OVERHEAD
+from .retry import DAY, cpu_recovery_time
+
+# signature and packed_trx envelope billed as net usage
+SIGNATURE_SIZE = 66
+
+
+class AccountResources:
+    """
+    `get_account` CPU/NET snapshot. Usage is an average over the 24h window,
+    without new transactions it decays linearly, so availability can be
+    forecast for any moment after the snapshot
+    ### Methods:
+    - cpu_available
+    - net_available
+    - cpu_recovery_time
+    - spend
+    """
+    __slots__ = ('account', 'cpu_used', 'cpu_max', 'net_used', 'net_max', 'fetched_at')
+
+    def __init__(self, account: str, cpu_limit: dict, net_limit: dict, fetched_at: float=None):
+        self.account = account
+        self.cpu_used = cpu_limit['used']
+        self.cpu_max = cpu_limit['max']
+        self.net_used = net_limit['used']
+        self.net_max = net_limit['max']
+        self.fetched_at = time.monotonic() if fetched_at is None else fetched_at
+
+    @classmethod
+    def from_account(cls, account: dict) -> "AccountResources":
+        return cls(account['account_name'], account['cpu_limit'], account['net_limit'])
+
+    def __str__(self):
+        return f"AccountResources(account={self.account}, cpu={self.cpu_available():.0f}/{self.cpu_max}us, net={self.net_available():.0f}/{self.net_max}b)"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def _decayed(self, used: float, at: float=None) -> float:
+        elapsed = (time.monotonic() if at is None else at) - self.fetched_at
+        return used * max(0.0, 1 - elapsed / DAY)
+
+    def cpu_available(self, at: float=None) -> float:
+        return max(self.cpu_max - self._decayed(self.cpu_used, at), 0)
+
+    def net_available(self, at: float=None) -> float:
+        return max(self.net_max - self._decayed(self.net_used, at), 0)
+
+    def cpu_recovery_time(self, needed: float) -> float:
+        """
+        Seconds from now until `needed` us of CPU is available
+        """
+        return cpu_recovery_time(self._decayed(self.cpu_used), self.cpu_max, needed)
+
+    def spend(self, cpu_us: float=0, net_bytes: float=0):
+        """
+        Account usage of a pushed transaction until next `get_account`
+        """
+        now = time.monotonic()
+        self.cpu_used = self._decayed(self.cpu_used, now) + cpu_us
+        self.net_used = self._decayed(self.net_used, now) + net_bytes
+        self.fetched_at = now
+
+
+class ResourceMonitor:
+    """
+    Cached `get_account` resources of accounts with forecast whether a
+    transaction fits. CPU and NET of WAX transactions are billed to the
+    first authorizer, CPU cost of actions comes from `CostModel`
+    ### Methods:
+    - get
+    - invalidate
+    - estimate
+    - fits
+    - record
+    - route
+    """
+    def __init__(self, wax, ttl: float=10, cost_model: CostModel=None, margin: float=1.2):
+        self.wax = wax
+        self.ttl = ttl
+        self.cost_model = cost_model or CostModel()
+        self.margin = margin
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return f"ResourceMonitor(accounts={list(self._cache.values())})"
+
+    def _cached(self, account: str) -> AccountResources:
+        entry = self._cache.get(account)
+        if entry is not None and time.monotonic() - entry.fetched_at < self.ttl:
+            return entry
+        return None
+
+    def _store(self, account: dict) -> AccountResources:
+        entry = AccountResources.from_account(account)
+        with self._lock:
+            self._cache[entry.account] = entry
+        return entry
+
+    def get(self, account: str) -> AccountResources:
+        """
+        Resources of account, `get_account` is called at most once per `ttl`
+        """
+        return self._cached(account) or self._store(self.wax.get_account(account))
+
+    def invalidate(self, account: str=None):
+        with self._lock:
+            if account is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(account, None)
+
+    @staticmethod
+    def _trx(tx):
+        return getattr(tx, 'trx', tx)
+
+    def estimate(self, tx) -> tuple:
+        """
+        Estimated (cpu us, net bytes) of transaction with `margin`
+        """
+        actions = self._trx(tx).actions
+        cpu = sum(self.cost_model.estimate(x) for x in actions)
+        net = TRANSACTION_OVERHEAD + SIGNATURE_SIZE + sum(action_size(x) for x in actions)
+        return cpu * self.margin, net * self.margin
+
+    def _fits(self, resources: AccountResources, tx) -> bool:
+        cpu, net = self.estimate(tx)
+        return resources.cpu_available() >= cpu and resources.net_available() >= net
+
+    def fits(self, tx) -> bool:
+        """
+        Predict if the first authorizer can pay CPU and NET of transaction itself
+        """
+        return self._fits(self.get(self._trx(tx).actions[0].actor), tx)
+
+    def record(self, tx, receipt: dict):
+        """
+        Learn action costs from receipt and subtract usage from cached resources
+        """
+        trx = self._trx(tx)
+        self.cost_model.learn(trx.actions, receipt)
+
+        payer = trx.actions[0].actor
+        entry = self._cache.get(payer)
+        processed_receipt = (receipt.get('processed') or {}).get('receipt') or {}
+        if entry is not None and processed_receipt:
+            entry.spend(processed_receipt.get('cpu_usage_us', 0), processed_receipt.get('net_usage_words', 0) * 8)
+
+    def route(self, tx, pay_with: str):
+        """
+        `tx` itself when it fits account resources, otherwise `tx.pay_with(pay_with)`
+        """
+        if getattr(tx, 'trx', None) is not None or self.fits(tx):
+            return tx
+        return tx.pay_with(pay_with)
+
+
+class AsyncResourceMonitor(ResourceMonitor):
+    """
+    `ResourceMonitor` over `AsyncCleos`
+    """
+    def __init__(self, wax, ttl: float=10, cost_model: CostModel=None, margin: float=1.2):
+        super().__init__(wax, ttl=ttl, cost_model=cost_model, margin=margin)
+        self._locks = {}
+
+    async def get(self, account: str) -> AccountResources:
+        cached = self._cached(account)
+        if cached:
+            return cached
+        # one get_account in flight per account
+        import asyncio
+        lock = self._locks.setdefault(account, asyncio.Lock())
+        async with lock:
+            return self._cached(account) or self._store(await self.wax.get_account(account))
+
+    async def fits(self, tx) -> bool:
+        return self._fits(await self.get(self._trx(tx).actions[0].actor), tx)
+
+    async def route(self, tx, pay_with: str):
+        if getattr(tx, 'trx', None) is not None or await self.fits(tx):
+            return tx
+        return tx.pay_with(pay_with)
@@ -0,0 +1,129 @@
+import time
+
+from .exceptions import CPUlimit, ExpiredTransaction
+
+# window of EOSIO resource usage averaging
+DAY = 24 * 60 * 60
+
+
+def cpu_recovery_time(used: float, max_cpu: float, needed: float, window: float=DAY) -> float:
+    """
+    Seconds until `needed` us of CPU is available. Without new usage
+    the averaged usage decays linearly to zero over the 24h window
+    """
+    if max_cpu - used >= needed:
+        return 0.0
+    if needed > max_cpu or used <= 0:
+        return float('inf')
+    return window * (1 - (max_cpu - needed) / used)
+
+
+class RetryPolicy:
+    """
+    Retry push of `TX` / `PayWith` on `CPUlimit` and `ExpiredTransaction`.
+    Every attempt re-signs the transaction with fresh TAPOS and expiration;
+    on `CPUlimit` it switches to `pay_with` payer (if set) or waits until
+    the acting accounts recover enough CPU.
+    ### Methods:
+    - run
+    - run_async
+    - cpu_delay
+    """
+    def __init__(self,
+            max_attempts: int=5,
+            pay_with: str=None,
+            cpu_needed_us: float=1000,
+            base_delay: float=0.5,
+            max_delay: float=60,
+            expiration: float=None):
+        self.max_attempts = max_attempts
+        self.pay_with = pay_with
+        self.cpu_needed_us = cpu_needed_us
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.expiration = expiration
+
+    def __str__(self):
+        return f"RetryPolicy(max_attempts={self.max_attempts}, pay_with={self.pay_with}, max_delay={self.max_delay})"
+
+    @staticmethod
+    def _actors(trx) -> list:
+        return sorted({action.actor for action in trx.actions})
+
+    def cpu_delay(self, accounts: list, attempt: int) -> float:
+        """
+        Wait before next attempt from `get_account` results of acting accounts,
+        exponential backoff when CPU limits are unknown
+        """
+        backoff = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+        waits = []
+        for account in accounts:
+            cpu = (account or {}).get('cpu_limit')
+            if not cpu:
+                return backoff
+            waits.append(cpu_recovery_time(cpu['used'], cpu['max'], self.cpu_needed_us))
+
+        wait = max(waits, default=0.0)
+        if wait == float('inf'):
+            raise CPUlimit(f"Error: CPU limit of account is lower than {self.cpu_needed_us}us")
+        return min(max(wait, self.base_delay), self.max_delay)
+
+    def _prepare(self, tx, target, error: Exception):
+        """
+        Reset state for the next attempt
+        ### Returns:
+        - (next push target, whether to wait for CPU)
+        """
+        trx = getattr(target, 'trx', target)
+        if self.expiration:
+            trx.expiration = self.expiration
+
+        if isinstance(error, ExpiredTransaction):
+            # stale TAPOS (or clock skew), refetch before re-signing
+            trx.client.chain.invalidate()
+            return target, False
+
+        if self.pay_with and target is tx:
+            return tx.pay_with(self.pay_with), False
+        return target, True
+
+    def run(self, tx) -> dict:
+        """
+        Push `tx` with retries
+        """
+        target = tx
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return target.push()
+            except (CPUlimit, ExpiredTransaction) as e:
+                if attempt == self.max_attempts:
+                    raise
+                target, wait = self._prepare(tx, target, e)
+                if wait:
+                    trx = getattr(target, 'trx', target)
+                    try:
+                        accounts = [trx.wax.get_account(x) for x in self._actors(trx)]
+                    except Exception:
+                        accounts = [None]
+                    time.sleep(self.cpu_delay(accounts, attempt))
+
+    async def run_async(self, tx) -> dict:
+        """
+        Push `tx` of asyncio client with retries
+        """
+        import asyncio
+        target = tx
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return await target.push()
+            except (CPUlimit, ExpiredTransaction) as e:
+                if attempt == self.max_attempts:
+                    raise
+                target, wait = self._prepare(tx, target, e)
+                if wait:
+                    trx = getattr(target, 'trx', target)
+                    try:
+                        accounts = await asyncio.gather(*[trx.wax.get_account(x) for x in self._actors(trx)])
+                    except Exception:
+                        accounts = [None]
+                    await asyncio.sleep(self.cpu_delay(accounts, attempt))
@@ -0,0 +1,962 @@
+import array
+import struct
+import keyword
+import datetime as dt
+from functools import lru_cache
+from binascii import unhexlify
+
+import base58
+from eospy.utils import ripemd160
+
+from .exceptions import SerializationError
+
+
+NAME_CHARMAP = ".12345abcdefghijklmnopqrstuvwxyz"
+
+EPOCH = dt.datetime(1970, 1, 1)
+BLOCK_TIMESTAMP_EPOCH = dt.datetime(2000, 1, 1)
+
+KEY_TYPES = {"K1": 0, "R1": 1, "WA": 2}
+KEY_NAMES = {v: k for k, v in KEY_TYPES.items()}
+
+
+def char_to_symbol(c: str) -> int:
+    if "a" <= c <= "z":
+        return ord(c) - ord("a") + 6
+    if "1" <= c <= "5":
+        return ord(c) - ord("1") + 1
+    if c == ".":
+        return 0
+    raise SerializationError(f"Invalid character in name: {c!r}")
+
+def string_to_name(s: str) -> int:
+    """
+    Convert eosio name to uint64
+    """
+    if len(s) > 13:
+        raise SerializationError(f"Name is longer than 13 characters: {s!r}")
+
+    value = 0
+    for i, c in enumerate(s[:12]):
+        value |= (char_to_symbol(c) & 0x1f) << (64 - 5 * (i + 1))
+
+    if len(s) == 13:
+        last = char_to_symbol(s[12])
+        if last > 0x0f:
+            raise SerializationError(f"Invalid 13th character in name: {s!r}")
+        value |= last
+
+    return value
+
+# table rows repeat few account names and symbols
+@lru_cache(maxsize=65536)
+def name_to_string(value: int) -> str:
+    """
+    Convert uint64 to eosio name
+    """
+    chars = ["."] * 13
+    for i in range(13):
+        if i == 0:
+            chars[12] = NAME_CHARMAP[value & 0x0f]
+            value >>= 4
+        else:
+            chars[12 - i] = NAME_CHARMAP[value & 0x1f]
+            value >>= 5
+    return "".join(chars).rstrip(".")
+
+def parse_time(value) -> dt.datetime:
+    if isinstance(value, dt.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(dt.timezone.utc).replace(tzinfo=None)
+        return value
+    value = value.rstrip("Z")
+    if "." in value:
+        return dt.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+    return dt.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
+
+
+class Symbol:
+    """
+    Symbol helpers (`4,WAX` <-> uint64)
+    """
+    @staticmethod
+    def code_to_int(code: str) -> int:
+        if len(code) > 7:
+            raise SerializationError(f"Symbol code is longer than 7 characters: {code!r}")
+        value = 0
+        for i, c in enumerate(code):
+            if not "A" <= c <= "Z":
+                raise SerializationError(f"Invalid symbol code: {code!r}")
+            value |= ord(c) << (8 * i)
+        return value
+
+    @staticmethod
+    def parse(value: str) -> tuple:
+        precision, code = value.split(",")
+        return int(precision), code.strip()
+
+    @staticmethod
+    def int_to_code(value: int) -> str:
+        return value.to_bytes(8, "little").rstrip(b"\x00").decode("ascii")
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _symbol(symbol: int) -> tuple:
+        return symbol & 0xff, Symbol.int_to_code(symbol >> 8)
+
+    @staticmethod
+    def format_asset(units: int, symbol: int) -> str:
+        precision, code = Symbol._symbol(symbol)
+        sign = "-" if units < 0 else ""
+        whole, fraction = divmod(abs(units), 10 ** precision)
+        if precision:
+            return f"{sign}{whole}.{str(fraction).zfill(precision)} {code}"
+        return f"{sign}{whole} {code}"
+
+
+class Writer:
+    """
+    Growable little-endian byte buffer
+    """
+    __slots__ = ("buf",)
+
+    def __init__(self):
+        self.buf = bytearray()
+
+    def varuint32(self, value: int):
+        value = int(value)
+        while True:
+            byte = value & 0x7f
+            value >>= 7
+            if value:
+                self.buf.append(byte | 0x80)
+            else:
+                self.buf.append(byte)
+                break
+
+    def varint32(self, value: int):
+        value = int(value)
+        self.varuint32(((value << 1) ^ (value >> 31)) & 0xffffffff)
+
+    def raw(self, data: bytes):
+        self.buf += data
+
+    def bytes(self, data: bytes):
+        self.varuint32(len(data))
+        self.buf += data
+
+    def name(self, value: str):
+        self.buf += struct.pack("<Q", string_to_name(value))
+
+    def symbol_code(self, code: str):
+        self.buf += struct.pack("<Q", Symbol.code_to_int(code))
+
+    def symbol(self, value: str):
+        precision, code = Symbol.parse(value)
+        self.buf += struct.pack("<Q", (Symbol.code_to_int(code) << 8) | precision)
+
+    def asset(self, value: str):
+        try:
+            amount, code = value.strip().split(" ")
+        except ValueError:
+            raise SerializationError(f"Invalid asset: {value!r}")
+
+        negative = amount.startswith("-")
+        amount = amount.lstrip("-")
+        whole, _, fraction = amount.partition(".")
+        precision = len(fraction)
+        units = int(whole + fraction) if whole + fraction else 0
+        if negative:
+            units = -units
+
+        self.buf += struct.pack("<q", units)
+        self.buf += struct.pack("<Q", (Symbol.code_to_int(code) << 8) | precision)
+
+    def key(self, value: str, prefix: str, size: int):
+        """
+        Write public key or signature (`EOS...`, `PUB_K1_...`, `SIG_K1_...`)
+        """
+        if prefix == "PUB" and value.startswith("EOS"):
+            key_type, data = "K1", value[3:]
+        elif value.startswith(prefix + "_"):
+            key_type, data = value[len(prefix) + 1:len(prefix) + 3], value[len(prefix) + 4:]
+        else:
+            raise SerializationError(f"Invalid key format: {value!r}")
+
+        if key_type not in KEY_TYPES:
+            raise SerializationError(f"Unknown key type: {key_type}")
+
+        raw = base58.b58decode(data)[:-4]
+        if len(raw) != size:
+            raise SerializationError(f"Invalid key length: {value!r}")
+
+        self.buf.append(KEY_TYPES[key_type])
+        self.buf += raw
+
+
+class Reader:
+    """
+    Little-endian byte reader, counterpart of `Writer`
+    """
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes, pos: int=0):
+        self.data = data
+        self.pos = pos
+
+    @property
+    def remaining(self) -> int:
+        return len(self.data) - self.pos
+
+    def read(self, size: int) -> bytes:
+        end = self.pos + size
+        if end > len(self.data):
+            raise SerializationError(f"Unexpected end of data: need {size} bytes at {self.pos}")
+        data = self.data[self.pos:end]
+        self.pos = end
+        return data
+
+    def unpack(self, packer: struct.Struct):
+        end = self.pos + packer.size
+        if end > len(self.data):
+            raise SerializationError(f"Unexpected end of data: need {packer.size} bytes at {self.pos}")
+        value = packer.unpack_from(self.data, self.pos)[0]
+        self.pos = end
+        return value
+
+    def byte(self) -> int:
+        return self.read(1)[0]
+
+    def varuint32(self) -> int:
+        value, shift = 0, 0
+        while True:
+            byte = self.byte()
+            value |= (byte & 0x7f) << shift
+            if not byte & 0x80:
+                return value
+            shift += 7
+
+    def varint32(self) -> int:
+        value = self.varuint32()
+        return (value >> 1) ^ -(value & 1)
+
+    def bytes(self) -> bytes:
+        return self.read(self.varuint32())
+
+    def uint64(self) -> int:
+        return self.unpack(UINT64)
+
+    def name(self) -> str:
+        return name_to_string(self.uint64())
+
+    def symbol_code(self) -> str:
+        return Symbol.int_to_code(self.uint64())
+
+    def symbol(self) -> str:
+        value = self.uint64()
+        return f"{value & 0xff},{Symbol.int_to_code(value >> 8)}"
+
+    def asset(self) -> str:
+        units = self.unpack(INT64)
+        return Symbol.format_asset(units, self.uint64())
+
+    def key(self, prefix: str, size: int) -> str:
+        """
+        Read public key or signature as `PUB_K1_...` / `SIG_K1_...`
+        """
+        key_type = KEY_NAMES.get(self.byte())
+        if key_type is None:
+            raise SerializationError("Unknown key type")
+        raw = self.read(size)
+        checksum = unhexlify(ripemd160(raw + key_type.encode())[:8])
+        return f"{prefix}_{key_type}_{base58.b58encode(raw + checksum).decode()}"
+
+
+INT64 = struct.Struct("<q")
+UINT64 = struct.Struct("<Q")
+
+
+def _fixed(fmt: str):
+    packer = struct.Struct(fmt).pack
+
+    def encode(w: Writer, value):
+        w.buf += packer(int(value))
+    return encode
+
+def _checksum(size: int):
+    def encode(w: Writer, value):
+        data = unhexlify(value) if isinstance(value, str) else bytes(value)
+        if len(data) != size:
+            raise SerializationError(f"Checksum must be {size} bytes")
+        w.buf += data
+    return encode
+
+def _int128(signed: bool):
+    def encode(w: Writer, value):
+        w.buf += int(value).to_bytes(16, "little", signed=signed)
+    return encode
+
+def _float(fmt: str):
+    packer = struct.Struct(fmt).pack
+
+    def encode(w: Writer, value):
+        w.buf += packer(float(value))
+    return encode
+
+def _bool(w: Writer, value):
+    w.buf.append(1 if value else 0)
+
+def _bytes(w: Writer, value):
+    w.bytes(unhexlify(value) if isinstance(value, str) else bytes(value))
+
+def _string(w: Writer, value):
+    w.bytes(str(value).encode("utf-8"))
+
+def _time_point(w: Writer, value):
+    if isinstance(value, int):
+        w.buf += struct.pack("<q", value)
+        return
+    delta = parse_time(value) - EPOCH
+    w.buf += struct.pack("<q", (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+
+def _time_point_sec(w: Writer, value):
+    if isinstance(value, int):
+        w.buf += struct.pack("<I", value)
+        return
+    w.buf += struct.pack("<I", int((parse_time(value) - EPOCH).total_seconds()))
+
+def _block_timestamp(w: Writer, value):
+    if isinstance(value, int):
+        w.buf += struct.pack("<I", value)
+        return
+    ms = (parse_time(value) - BLOCK_TIMESTAMP_EPOCH) // dt.timedelta(milliseconds=500)
+    w.buf += struct.pack("<I", ms)
+
+def _extended_asset(w: Writer, value):
+    w.asset(value["quantity"])
+    w.name(value["contract"])
+
+
+BUILTIN_ENCODERS = {
+    "bool": _bool,
+    "int8": _fixed("<b"),
+    "uint8": _fixed("<B"),
+    "int16": _fixed("<h"),
+    "uint16": _fixed("<H"),
+    "int32": _fixed("<i"),
+    "uint32": _fixed("<I"),
+    "int64": _fixed("<q"),
+    "uint64": _fixed("<Q"),
+    "int128": _int128(True),
+    "uint128": _int128(False),
+    "varint32": lambda w, v: w.varint32(v),
+    "varuint32": lambda w, v: w.varuint32(v),
+    "float32": _float("<f"),
+    "float64": _float("<d"),
+    "float128": _checksum(16),
+    "time_point": _time_point,
+    "time_point_sec": _time_point_sec,
+    "block_timestamp_type": _block_timestamp,
+    "name": lambda w, v: w.name(v),
+    "bytes": _bytes,
+    "string": _string,
+    "checksum160": _checksum(20),
+    "checksum256": _checksum(32),
+    "checksum512": _checksum(64),
+    "public_key": lambda w, v: w.key(v, "PUB", 33),
+    "signature": lambda w, v: w.key(v, "SIG", 65),
+    "symbol": lambda w, v: w.symbol(v),
+    "symbol_code": lambda w, v: w.symbol_code(v),
+    "asset": lambda w, v: w.asset(v),
+    "extended_asset": _extended_asset,
+}
+
+
+def _read_fixed(fmt: str):
+    packer = struct.Struct(fmt)
+    return lambda r: r.unpack(packer)
+
+def _read_int128(signed: bool):
+    return lambda r: int.from_bytes(r.read(16), "little", signed=signed)
+
+def _read_bool(r: Reader) -> bool:
+    return r.byte() != 0
+
+def _read_string(r: Reader) -> str:
+    return r.bytes().decode("utf-8", errors="replace")
+
+def _read_time_point(r: Reader):
+    value = r.unpack(INT64)
+    try:
+        return (EPOCH + dt.timedelta(microseconds=value)).isoformat(timespec="milliseconds")
+    except OverflowError:
+        return value
+
+def _read_time_point_sec(r: Reader) -> str:
+    return (EPOCH + dt.timedelta(seconds=r.unpack(UINT32))).isoformat(timespec="seconds")
+
+def _read_block_timestamp(r: Reader) -> str:
+    return (BLOCK_TIMESTAMP_EPOCH + dt.timedelta(milliseconds=500 * r.unpack(UINT32))).isoformat(timespec="milliseconds")
+
+def _read_extended_asset(r: Reader) -> dict:
+    return {"quantity": r.asset(), "contract": r.name()}
+
+
+UINT32 = struct.Struct("<I")
+
+BUILTIN_DECODERS = {
+    "bool": _read_bool,
+    "int8": _read_fixed("<b"),
+    "uint8": _read_fixed("<B"),
+    "int16": _read_fixed("<h"),
+    "uint16": _read_fixed("<H"),
+    "int32": _read_fixed("<i"),
+    "uint32": _read_fixed("<I"),
+    "int64": _read_fixed("<q"),
+    "uint64": _read_fixed("<Q"),
+    "int128": _read_int128(True),
+    "uint128": _read_int128(False),
+    "varint32": lambda r: r.varint32(),
+    "varuint32": lambda r: r.varuint32(),
+    "float32": _read_fixed("<f"),
+    "float64": _read_fixed("<d"),
+    "float128": lambda r: r.read(16).hex(),
+    "time_point": _read_time_point,
+    "time_point_sec": _read_time_point_sec,
+    "block_timestamp_type": _read_block_timestamp,
+    "name": lambda r: r.name(),
+    "bytes": lambda r: r.bytes().hex(),
+    "string": _read_string,
+    "checksum160": lambda r: r.read(20).hex(),
+    "checksum256": lambda r: r.read(32).hex(),
+    "checksum512": lambda r: r.read(64).hex(),
+    "public_key": lambda r: r.key("PUB", 33),
+    "signature": lambda r: r.key("SIG", 65),
+    "symbol": lambda r: r.symbol(),
+    "symbol_code": lambda r: r.symbol_code(),
+    "asset": lambda r: r.asset(),
+    "extended_asset": _read_extended_asset,
+}
+
+# `array.array` typecodes of fixed size types for columnar decoding
+ARRAY_TYPECODES = {
+    "bool": "B",
+    "int8": "b",
+    "uint8": "B",
+    "int16": "h",
+    "uint16": "H",
+    "int32": "i",
+    "uint32": "I",
+    "int64": "q",
+    "uint64": "Q",
+    "float32": "f",
+    "float64": "d",
+}
+
+
+# byte size of fixed size types, such record columns are decoded alone at a static offset
+FIXED_SIZES = {
+    "bool": 1, "int8": 1, "uint8": 1, "int16": 2, "uint16": 2, "int32": 4, "uint32": 4,
+    "int64": 8, "uint64": 8, "int128": 16, "uint128": 16,
+    "float32": 4, "float64": 8, "float128": 16,
+    "time_point": 8, "time_point_sec": 4, "block_timestamp_type": 4,
+    "name": 8, "symbol": 8, "symbol_code": 8, "asset": 16, "extended_asset": 24,
+    "checksum160": 20, "checksum256": 32, "checksum512": 64,
+    "public_key": 34, "signature": 66,
+}
+
+# `struct` format and converter of types a record reads with one `unpack_from` (leading fields)
+LAYOUT = {
+    "bool": ("B", bool),
+    "int8": ("b", None),
+    "uint8": ("B", None),
+    "int16": ("h", None),
+    "uint16": ("H", None),
+    "int32": ("i", None),
+    "uint32": ("I", None),
+    "int64": ("q", None),
+    "uint64": ("Q", None),
+    "float32": ("f", None),
+    "float64": ("d", None),
+    "name": ("Q", name_to_string),
+}
+
+
+def attribute_name(field: str) -> str:
+    """
+    Python attribute of ABI field (`from` -> `_from`)
+    """
+    return f"_{field}" if keyword.iskeyword(field) else field
+
+
+class Record:
+    """
+    Base of generated `__slots__` row classes. A record keeps raw bytes and
+    decodes fields into slots on first access: a field at a static offset
+    (after fixed size fields only) alone, any other one with all fields.
+    Records save memory and work on rows that are mostly skipped or read
+    partly; decoding every field of every row costs more CPU than json rows
+    ### Methods:
+    - from_hex
+    - to_dict
+    - columns
+    """
+    __slots__ = ("_raw",)
+
+    FIELDS = ()
+    ATTRIBUTES = ()
+    TYPES = ()
+    # attribute -> index, static byte offset (or None) and decoder of every field
+    INDEX = {}
+    OFFSETS = ()
+    DECODERS = ()
+
+    def __init__(self, raw: bytes):
+        self._raw = raw
+
+    @classmethod
+    def from_hex(cls, data: str) -> "Record":
+        return cls(unhexlify(data))
+
+    @classmethod
+    def _decode(cls, r: Reader) -> list:
+        raise NotImplementedError
+
+    def __getattr__(self, name: str):
+        # only called for unset slots
+        raw = self._raw
+        index = self.INDEX.get(name) if raw is not None else None
+        if index is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        offset = self.OFFSETS[index]
+        if offset is not None:
+            value = self.DECODERS[index](Reader(raw, offset))
+            setattr(self, name, value)
+            return value
+
+        self._load()
+        return getattr(self, name)
+
+    def _load(self):
+        """
+        Decode all fields into slots
+        """
+        for attr, value in zip(self.ATTRIBUTES, self._decode(Reader(self._raw))):
+            setattr(self, attr, value)
+        self._raw = None
+
+    def __getitem__(self, field: str):
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        return getattr(self, attribute_name(field))
+
+    def __str__(self):
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.to_dict().items())})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def to_dict(self) -> dict:
+        if self._raw is not None:
+            self._load()
+        return {field: getattr(self, attr) for field, attr in zip(self.FIELDS, self.ATTRIBUTES)}
+
+    @classmethod
+    def columns(cls, records) -> dict:
+        """
+        Columnar view of records: `array.array` for fixed size numeric fields, lists for others
+        """
+        columns = {
+            field: array.array(ARRAY_TYPECODES[t]) if t in ARRAY_TYPECODES else []
+            for field, t in zip(cls.FIELDS, cls.TYPES)
+        }
+        values = [columns[field] for field in cls.FIELDS]
+        for record in records:
+            row = cls._decode(Reader(record._raw)) if record._raw is not None else \
+                [getattr(record, attr) for attr in cls.ATTRIBUTES]
+            for column, value in zip(values, row):
+                column.append(value)
+        return columns
+
+
+class AbiSerializer:
+    """
+    Serialize action data locally from contract ABI (no `abi_json_to_bin` calls)
+    ### Methods:
+    - serialize
+    - serialize_action
+    - json_to_bin
+    - action_type
+    - deserialize
+    - bin_to_json
+    - record_class
+    - table_record
+    """
+    def __init__(self, abi: dict):
+        self.abi = abi
+        self.types = {t["new_type_name"]: t["type"] for t in abi.get("types", [])}
+        self.structs = {s["name"]: s for s in abi.get("structs", [])}
+        self.variants = {v["name"]: v["types"] for v in abi.get("variants", [])}
+        self.actions = {a["name"]: a["type"] for a in abi.get("actions", [])}
+        self.tables = {t["name"]: t["type"] for t in abi.get("tables", [])}
+
+        self._encoders = {}
+        self._decoders = {}
+        self._records = {}
+
+    def action_type(self, action: str) -> str:
+        """
+        Get struct name of action
+        """
+        if action in self.actions:
+            return self.actions[action]
+        if action in self.structs:
+            return action
+        raise SerializationError(f"Unknown action: {action}")
+
+    def serialize(self, type_name: str, value) -> bytes:
+        """
+        Serialize value of any ABI type
+        """
+        w = Writer()
+        try:
+            self._encoder(type_name)(w, value)
+        except SerializationError:
+            raise
+        except (ValueError, TypeError, KeyError, struct.error, OverflowError) as e:
+            raise SerializationError(f"Can't serialize {value!r} as {type_name}: {e}")
+        return bytes(w.buf)
+
+    def serialize_action(self, action: str, data: dict) -> bytes:
+        """
+        Serialize action data
+        """
+        return self.serialize(self.action_type(action), data)
+
+    def json_to_bin(self, action: str, data: dict) -> str:
+        """
+        Local replacement of `abi_json_to_bin`
+        ### Returns:
+        - hex str
+        """
+        return self.serialize_action(action, data).hex()
+
+    def deserialize(self, type_name: str, data: bytes):
+        """
+        Deserialize value of any ABI type (json types as returned by nodeos)
+        """
+        return self._decoder(type_name)(Reader(data))
+
+    def bin_to_json(self, action: str, data: str) -> dict:
+        """
+        Local replacement of `abi_bin_to_json`
+        """
+        return self.deserialize(self.action_type(action), unhexlify(data))
+
+    def table_type(self, table: str) -> str:
+        if table not in self.tables:
+            raise SerializationError(f"Unknown table: {table}")
+        return self.tables[table]
+
+    def record_class(self, type_name: str) -> type:
+        """
+        `Record` subclass with a slot per field of struct
+        """
+        record = self._records.get(type_name)
+        if record is None:
+            resolved = self._resolve(type_name)
+            if resolved not in self.structs:
+                raise SerializationError(f"Not a struct: {type_name}")
+
+            fields = self._struct_fields(resolved)
+            decoders = [self._decoder(x["type"]) for x in fields]
+            optional = [x["type"].endswith("$") for x in fields]
+            types = [x["type"] if ext else self._resolve(x["type"]) for x, ext in zip(fields, optional)]
+
+            offsets, offset = [], 0
+            for field_type, ext in zip(types, optional):
+                offsets.append(offset if offset is not None and not ext else None)
+                size = FIXED_SIZES.get(field_type)
+                offset = offset + size if offset is not None and size is not None else None
+
+            # leading fixed size fields are read with one precompiled struct
+            prefix = 0
+            while prefix < len(types) and not optional[prefix] and types[prefix] in LAYOUT:
+                prefix += 1
+            layout = struct.Struct("<" + "".join(LAYOUT[t][0] for t in types[:prefix]))
+            converters = [(i, LAYOUT[t][1]) for i, t in enumerate(types[:prefix]) if LAYOUT[t][1] is not None]
+            rest = list(zip(decoders, optional))[prefix:]
+
+            def decode(cls, r: Reader) -> list:
+                if r.remaining < layout.size:
+                    raise SerializationError(f"Unexpected end of data: need {layout.size} bytes at {r.pos}")
+                values = list(layout.unpack_from(r.data, r.pos))
+                r.pos += layout.size
+                for i, convert in converters:
+                    values[i] = convert(values[i])
+                values.extend(None if ext and not r.remaining else decoder(r) for decoder, ext in rest)
+                return values
+
+            attributes = tuple(attribute_name(x["name"]) for x in fields)
+            record = type(resolved, (Record,), {
+                "__slots__": attributes,
+                "FIELDS": tuple(x["name"] for x in fields),
+                "ATTRIBUTES": attributes,
+                "TYPES": tuple(types),
+                "INDEX": {attr: i for i, attr in enumerate(attributes)},
+                "OFFSETS": tuple(offsets),
+                "DECODERS": tuple(decoders),
+                "_decode": classmethod(decode),
+            })
+            self._records[type_name] = record
+        return record
+
+    def table_record(self, table: str) -> type:
+        """
+        `Record` class of table rows
+        """
+        return self.record_class(self.table_type(table))
+
+    def _resolve(self, type_name: str) -> str:
+        seen = set()
+        while type_name in self.types:
+            if type_name in seen:
+                raise SerializationError(f"Circular type alias: {type_name}")
+            seen.add(type_name)
+            type_name = self.types[type_name]
+        return type_name
+
+    def _encoder(self, type_name: str):
+        encoder = self._encoders.get(type_name)
+        if encoder is None:
+            encoder = self._build_encoder(type_name)
+            self._encoders[type_name] = encoder
+        return encoder
+
+    def _build_encoder(self, type_name: str):
+        if type_name.endswith("$"):
+            return self._encoder(type_name[:-1])
+
+        if type_name.endswith("?"):
+            inner = self._encoder(type_name[:-1])
+
+            def encode_optional(w: Writer, value):
+                if value is None:
+                    w.buf.append(0)
+                else:
+                    w.buf.append(1)
+                    inner(w, value)
+            return encode_optional
+
+        if type_name.endswith("[]"):
+            inner = self._encoder(type_name[:-2])
+
+            def encode_array(w: Writer, value):
+                w.varuint32(len(value))
+                for item in value:
+                    inner(w, item)
+            return encode_array
+
+        resolved = self._resolve(type_name)
+        if resolved != type_name:
+            return self._encoder(resolved)
+
+        if type_name in BUILTIN_ENCODERS:
+            return BUILTIN_ENCODERS[type_name]
+
+        if type_name in self.variants:
+            return self._variant_encoder(type_name)
+
+        if type_name in self.structs:
+            return self._struct_encoder(type_name)
+
+        raise SerializationError(f"Unknown type: {type_name}")
+
+    def _variant_encoder(self, type_name: str):
+        types = self.variants[type_name]
+
+        def encode_variant(w: Writer, value):
+            if isinstance(value, dict):
+                name, value = value["type"], value["value"]
+            else:
+                name, value = value
+            if name not in types:
+                raise SerializationError(f"Type {name} is not part of variant {type_name}")
+            w.varuint32(types.index(name))
+            self._encoder(name)(w, value)
+        return encode_variant
+
+    def _struct_fields(self, type_name: str) -> list:
+        """
+        Fields of struct including fields of base structs
+        """
+        struct_def = self.structs[type_name]
+        fields = []
+        base = struct_def.get("base")
+        while base:
+            base_def = self.structs[self._resolve(base)]
+            fields = base_def["fields"] + fields
+            base = base_def.get("base")
+        return fields + struct_def["fields"]
+
+    def _struct_encoder(self, type_name: str):
+        fields = self._struct_fields(type_name)
+
+        def encode_struct(w: Writer, value):
+            for field in fields:
+                name, field_type = field["name"], field["type"]
+                if name not in value:
+                    if field_type.endswith("$"):
+                        break
+                    raise SerializationError(f"Missing field {type_name}.{name}")
+                try:
+                    self._encoder(field_type)(w, value[name])
+                except SerializationError:
+                    raise
+                except (ValueError, TypeError, KeyError, struct.error, OverflowError) as e:
+                    raise SerializationError(f"Can't serialize {type_name}.{name} as {field_type}: {e}")
+        return encode_struct
+
+    def _decoder(self, type_name: str):
+        decoder = self._decoders.get(type_name)
+        if decoder is None:
+            decoder = self._build_decoder(type_name)
+            self._decoders[type_name] = decoder
+        return decoder
+
+    def _build_decoder(self, type_name: str):
+        if type_name.endswith("$"):
+            return self._decoder(type_name[:-1])
+
+        if type_name.endswith("?"):
+            inner = self._decoder(type_name[:-1])
+            return lambda r: inner(r) if r.byte() else None
+
+        if type_name.endswith("[]"):
+            inner = self._decoder(type_name[:-2])
+            return lambda r: [inner(r) for _ in range(r.varuint32())]
+
+        resolved = self._resolve(type_name)
+        if resolved != type_name:
+            return self._decoder(resolved)
+
+        if type_name in BUILTIN_DECODERS:
+            return BUILTIN_DECODERS[type_name]
+
+        if type_name in self.variants:
+            types = self.variants[type_name]
+
+            def decode_variant(r: Reader) -> list:
+                index = r.varuint32()
+                if index >= len(types):
+                    raise SerializationError(f"Variant index {index} out of range of {type_name}")
+                return [types[index], self._decoder(types[index])(r)]
+            return decode_variant
+
+        if type_name in self.structs:
+            fields = [
+                (x["name"], x["type"].endswith("$"), x["type"])
+                for x in self._struct_fields(type_name)
+            ]
+
+            def decode_struct(r: Reader) -> dict:
+                value = {}
+                for name, ext, field_type in fields:
+                    if ext and not r.remaining:
+                        break
+                    value[name] = self._decoder(field_type)(r)
+                return value
+            return decode_struct
+
+        raise SerializationError(f"Unknown type: {type_name}")
+
+
+# ABI of binary `abi_def` (`abi` field of `get_raw_abi`)
+ABI_DEF = {
+    "version": "eosio::abi/1.1",
+    "structs": [
+        {"name": "type_def", "base": "", "fields": [
+            {"name": "new_type_name", "type": "string"},
+            {"name": "type", "type": "string"}]},
+        {"name": "field_def", "base": "", "fields": [
+            {"name": "name", "type": "string"},
+            {"name": "type", "type": "string"}]},
+        {"name": "struct_def", "base": "", "fields": [
+            {"name": "name", "type": "string"},
+            {"name": "base", "type": "string"},
+            {"name": "fields", "type": "field_def[]"}]},
+        {"name": "action_def", "base": "", "fields": [
+            {"name": "name", "type": "name"},
+            {"name": "type", "type": "string"},
+            {"name": "ricardian_contract", "type": "string"}]},
+        {"name": "table_def", "base": "", "fields": [
+            {"name": "name", "type": "name"},
+            {"name": "index_type", "type": "string"},
+            {"name": "key_names", "type": "string[]"},
+            {"name": "key_types", "type": "string[]"},
+            {"name": "type", "type": "string"}]},
+        {"name": "clause_pair", "base": "", "fields": [
+            {"name": "id", "type": "string"},
+            {"name": "body", "type": "string"}]},
+        {"name": "error_message", "base": "", "fields": [
+            {"name": "error_code", "type": "uint64"},
+            {"name": "error_msg", "type": "string"}]},
+        {"name": "extensions_entry", "base": "", "fields": [
+            {"name": "tag", "type": "uint16"},
+            {"name": "value", "type": "bytes"}]},
+        {"name": "variant_def", "base": "", "fields": [
+            {"name": "name", "type": "string"},
+            {"name": "types", "type": "string[]"}]},
+        {"name": "action_result_def", "base": "", "fields": [
+            {"name": "name", "type": "name"},
+            {"name": "result_type", "type": "string"}]},
+        {"name": "abi_def", "base": "", "fields": [
+            {"name": "version", "type": "string"},
+            {"name": "types", "type": "type_def[]"},
+            {"name": "structs", "type": "struct_def[]"},
+            {"name": "actions", "type": "action_def[]"},
+            {"name": "tables", "type": "table_def[]"},
+            {"name": "ricardian_clauses", "type": "clause_pair[]"},
+            {"name": "error_messages", "type": "error_message[]"},
+            {"name": "abi_extensions", "type": "extensions_entry[]"},
+            {"name": "variants", "type": "variant_def[]$"},
+            {"name": "action_results", "type": "action_result_def[]$"}]},
+    ],
+}
+
+_abi_def = None
+
+def _abi_serializer() -> AbiSerializer:
+    global _abi_def
+    if _abi_def is None:
+        _abi_def = AbiSerializer(ABI_DEF)
+    return _abi_def
+
+def abi_from_bin(data: bytes) -> dict:
+    """
+    Decode binary ABI (as stored on chain) into json ABI
+    """
+    try:
+        return _abi_serializer().deserialize("abi_def", data)
+    except SerializationError:
+        raise
+    except (ValueError, UnicodeDecodeError, struct.error, IndexError) as e:
+        raise SerializationError(f"Can't decode binary ABI: {e}")
+
+def abi_to_bin(abi: dict) -> bytes:
+    """
+    Encode json ABI into binary `abi_def`
+    """
+    value = {k: abi.get(k, []) for k in (
+        "types", "ricardian_clauses", "error_messages", "abi_extensions", "variants", "action_results")}
+    value["version"] = abi.get("version", "eosio::abi/1.1")
+    value["structs"] = [{"base": "", **x} for x in abi.get("structs", [])]
+    value["actions"] = [{"ricardian_contract": "", **x} for x in abi.get("actions", [])]
+    value["tables"] = [{"index_type": "i64", "key_names": [], "key_types": [], **x} for x in abi.get("tables", [])]
+    return _abi_serializer().serialize("abi_def", value)
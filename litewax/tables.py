@@ -0,0 +1,246 @@
+import queue
+import threading
+from typing import Iterator, List
+
+from .serializer import string_to_name, name_to_string
+
+# largest key of index types with splittable range
+MAX_KEYS = {'i64': 2 ** 64 - 1, 'name': 2 ** 64 - 1, 'i128': 2 ** 128 - 1}
+
+_DONE = object()
+
+
+def _key_int(value, key_type: str) -> int:
+    """
+    Integer value of table bound (number, numeric string or account name)
+    """
+    if isinstance(value, int):
+        return value
+    value = str(value)
+    # account names may be all digits ("12345")
+    if key_type == 'name':
+        return string_to_name(value)
+    if value.isdigit():
+        return int(value)
+    if value.startswith('0x'):
+        return int(value, 16)
+    if key_type == 'i64':
+        return string_to_name(value)
+    raise ValueError(f"Can't split range of {key_type} key {value!r}")
+
+def _key_bound(value: int, key_type: str):
+    """
+    Table bound of integer key, nodeos parses `name` bounds as account names
+    """
+    return name_to_string(value) if key_type == 'name' else value
+
+
+class TableReader:
+    """
+    Lazy `get_table_rows` scan: rows are yielded page by page following `next_key`,
+    only one page is kept in memory. With `record` (`litewax.serializer.Record` class)
+    rows are requested in binary and decoded locally into compact records: less
+    memory per row and only read columns are decoded, not a faster full decode
+    ### Methods:
+    - pages
+    - split
+    - parallel
+    - columns
+    """
+    def __init__(self,
+            wax,
+            code: str,
+            table: str,
+            scope: str=None,
+            lower_bound=None,
+            upper_bound=None,
+            index_position: int=1,
+            key_type: str="i64",
+            limit: int=100,
+            reverse: bool=False,
+            timeout: float=30,
+            record: type=None):
+        self.wax = wax
+        self.code = code
+        self.table = table
+        self.scope = code if scope is None else str(scope)
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        self.index_position = index_position
+        self.key_type = key_type
+        self.limit = limit
+        self.reverse = reverse
+        self.timeout = timeout
+        self.record = record
+
+    def __str__(self):
+        return f"TableReader(code={self.code}, table={self.table}, scope={self.scope}, index_position={self.index_position}, lower_bound={self.lower_bound}, upper_bound={self.upper_bound})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __iter__(self) -> Iterator[dict]:
+        for page in self.pages():
+            yield from page
+
+    def _payload(self, lower_bound, upper_bound) -> dict:
+        payload = {
+            "json": self.record is None,
+            "code": self.code,
+            "scope": self.scope,
+            "table": self.table,
+            "index_position": self.index_position,
+            "key_type": self.key_type,
+            "limit": self.limit,
+            "reverse": self.reverse,
+            "show_payer": False,
+        }
+        if lower_bound is not None:
+            payload["lower_bound"] = str(lower_bound)
+        if upper_bound is not None:
+            payload["upper_bound"] = str(upper_bound)
+        return payload
+
+    def _next(self, resp: dict, lower_bound, upper_bound) -> tuple:
+        """
+        Bounds of the next page, None when the scan is done
+        """
+        next_key = resp.get("next_key")
+        if not resp.get("more") or not next_key:
+            return None
+        # reverse scan walks down from upper_bound
+        if self.reverse:
+            return lower_bound, next_key
+        return next_key, upper_bound
+
+    def _rows(self, resp: dict) -> list:
+        rows = resp.get("rows", [])
+        if self.record is None:
+            return rows
+        return [self.record.from_hex(x) for x in rows]
+
+    def pages(self) -> Iterator[List[dict]]:
+        """
+        Stream of `get_table_rows` pages
+        """
+        bounds = (self.lower_bound, self.upper_bound)
+        while bounds is not None:
+            resp = self.wax.post('chain.get_table_rows', json=self._payload(*bounds), timeout=self.timeout)
+            yield self._rows(resp)
+            bounds = self._next(resp, *bounds)
+
+    def columns(self) -> dict:
+        """
+        Read all rows into columns (`array.array` for numeric fields), requires `record`
+        """
+        if self.record is None:
+            raise ValueError("Columnar read requires binary rows (`record`)")
+        return self.record.columns(self)
+
+    def split(self, parts: int) -> List["TableReader"]:
+        """
+        Split key range into `parts` readers over disjoint subranges
+        """
+        if self.key_type not in MAX_KEYS and (self.lower_bound is None or self.upper_bound is None):
+            raise ValueError(f"Set lower_bound and upper_bound to split {self.key_type} index")
+        lower = _key_int(self.lower_bound, self.key_type) if self.lower_bound is not None else 0
+        upper = _key_int(self.upper_bound, self.key_type) if self.upper_bound is not None else MAX_KEYS[self.key_type]
+        step = max((upper - lower) // parts, 1)
+
+        readers = []
+        start = lower
+        while start <= upper and len(readers) < parts:
+            # bounds are inclusive, last part takes the rest
+            end = upper if len(readers) == parts - 1 else min(start + step - 1, upper)
+            reader = type(self)(self.wax, self.code, self.table, self.scope,
+                _key_bound(start, self.key_type), _key_bound(end, self.key_type),
+                self.index_position, self.key_type, self.limit, self.reverse, self.timeout, self.record)
+            readers.append(reader)
+            start = end + 1
+        return readers
+
+    def parallel(self, parts: int=4, workers: int=None, max_pages: int=None) -> Iterator[dict]:
+        """
+        Scan subranges of `split(parts)` concurrently. Rows come in page
+        completion order, at most `max_pages` pages are buffered
+        """
+        readers = self.split(parts)
+        workers = workers or len(readers)
+        pages = queue.Queue(maxsize=max_pages or workers * 2)
+        stop = threading.Event()
+        todo = queue.Queue()
+        for reader in readers:
+            todo.put(reader)
+
+        def work():
+            try:
+                while not stop.is_set():
+                    try:
+                        reader = todo.get_nowait()
+                    except queue.Empty:
+                        return
+                    for page in reader.pages():
+                        if stop.is_set():
+                            return
+                        pages.put(page)
+            except Exception as e:
+                pages.put(e)
+            finally:
+                pages.put(_DONE)
+
+        threads = [threading.Thread(target=work, daemon=True) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+
+        alive = len(threads)
+        try:
+            while alive:
+                page = pages.get()
+                if page is _DONE:
+                    alive -= 1
+                    continue
+                if isinstance(page, Exception):
+                    raise page
+                yield from page
+        finally:
+            stop.set()
+            # unblock workers waiting on a full queue
+            while alive:
+                if pages.get() is _DONE:
+                    alive -= 1
+
+
+class AsyncTableReader(TableReader):
+    """
+    `TableReader` over `AsyncCleos`, iterate with `async for`
+    """
+    def __iter__(self):
+        raise TypeError("Use `async for` with AsyncTableReader")
+
+    async def __aiter__(self):
+        async for page in self.pages():
+            for row in page:
+                yield row
+
+    async def pages(self):
+        bounds = (self.lower_bound, self.upper_bound)
+        while bounds is not None:
+            resp = await self.wax.post('chain.get_table_rows', json=self._payload(*bounds), timeout=self.timeout)
+            yield self._rows(resp)
+            bounds = self._next(resp, *bounds)
+
+    def parallel(self, *args, **kwargs):
+        raise TypeError("Use `split` and asyncio tasks with AsyncTableReader")
+
+    async def columns(self) -> dict:
+        if self.record is None:
+            raise ValueError("Columnar read requires binary rows (`record`)")
+        return self.record.columns([x async for x in self])
+
+
+def table_reader(wax, *args, **kwargs) -> TableReader:
+    """
+    `AsyncTableReader` over async node api (`AsyncCleos`), `TableReader` otherwise
+    """
+    reader = AsyncTableReader if getattr(type(wax), 'asynchronous', False) else TableReader
+    return reader(wax, *args, **kwargs)
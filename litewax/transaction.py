@@ -0,0 +1,117 @@
+import datetime as dt
+from collections.abc import Mapping
+from typing import List
+
+from eospy.utils import sig_digest
+
+from .instrument import span
+
+
+class PackedTransaction:
+    """
+    Transaction serialized once. Packed bytes are immutable,
+    hex, list and digest views are computed on first access
+    ### Methods:
+    - build
+    """
+    __slots__ = ('raw', 'chain_id', '_hex', '_serealized', '_digest')
+
+    def __init__(self, raw: bytes, chain_id: str):
+        self.raw = bytes(raw)
+        self.chain_id = chain_id
+        self._hex = None
+        self._serealized = None
+        self._digest = None
+
+    @classmethod
+    def build(cls, actions: List[dict], chain_info: dict, lib_info: dict, expiration: float=60) -> "PackedTransaction":
+        """
+        Serialize actions with TAPOS from `ChainContext`
+        """
+        # eospy.types pulls colander schemas, loaded with the first transaction
+        from eospy.types import Transaction
+        with span("encode"):
+            transaction = {
+                "actions": actions,
+                "expiration": str(dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=expiration))
+            }
+            return cls(Transaction(transaction, chain_info, lib_info).encode(), chain_info['chain_id'])
+
+    def __str__(self):
+        return f"PackedTransaction(size={len(self.raw)}, digest={self.digest})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __bytes__(self):
+        return self.raw
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __iter__(self):
+        return iter(self.raw)
+
+    @property
+    def hex(self) -> str:
+        if self._hex is None:
+            self._hex = self.raw.hex()
+        return self._hex
+
+    @property
+    def serealized(self) -> List[int]:
+        if self._serealized is None:
+            self._serealized = list(self.raw)
+        return self._serealized
+
+    @property
+    def digest(self) -> str:
+        """
+        Signing digest (sha256 of chain_id + packed + context free data hash)
+        """
+        if self._digest is None:
+            self._digest = sig_digest(self.raw, self.chain_id)
+        return self._digest
+
+
+class SignedTransaction(Mapping):
+    """
+    Result of `TX.get_trx_extend_info`, read-only dict with
+    `signatures`, `packed` and `serealized` keys built lazily from `PackedTransaction`
+    """
+    _views = {
+        "packed": lambda trx: trx.hex,
+        "serealized": lambda trx: trx.serealized,
+    }
+
+    def __init__(self, transaction: PackedTransaction, signatures: List[str]):
+        self.transaction = transaction
+        self.signatures = signatures
+
+    def __str__(self):
+        return f"SignedTransaction(signatures={self.signatures}, transaction={self.transaction})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __getitem__(self, key: str):
+        if key == "signatures":
+            return self.signatures
+        try:
+            return self._views[key](self.transaction)
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return iter(("signatures", "packed", "serealized"))
+
+    def __len__(self):
+        return 3
+
+    @property
+    def packed(self) -> str:
+        return self.transaction.hex
+
+    @property
+    def digest(self) -> str:
+        return self.transaction.digest
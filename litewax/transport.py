@@ -0,0 +1,218 @@
+import threading
+import importlib.util
+from typing import TYPE_CHECKING
+
+from .push import push_payload, push_outcome, wait_push
+from .instrument import span
+
+# requests, cloudscraper, eospy.cleos and httpx are imported on first use,
+# `import litewax` stays cheap for code that only builds actions
+if TYPE_CHECKING:
+    import requests
+    import cloudscraper
+    import httpx
+    from requests.adapters import HTTPAdapter
+
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+class PooledCleos:
+    """
+    `eospy.cleos.Cleos` api working over a shared keep-alive session
+    instead of a new connection per request. Methods not defined here
+    (`get_info`, `get_account`, `push_transaction`...) are eospy ones
+    """
+    # NodePool of PoolCleos
+    pool = None
+
+    def __init__(self, url: str='http://localhost:8888', version: str='v1', session: "requests.Session"=None):
+        self._prod_url = url
+        self._version = version
+        if session is None:
+            import requests
+            session = requests.Session()
+        self.session = session
+
+    def __str__(self):
+        return f"PooledCleos(url={self.url})"
+
+    def __getattr__(self, name: str):
+        # eospy.cleos (and colander schemas behind it) is loaded on first use
+        import eospy.cleos
+        func = getattr(eospy.cleos.Cleos, name, None)
+        if name.startswith('__') or not callable(func):
+            raise AttributeError(f"{type(self).__name__} has no attribute {name}")
+        return func.__get__(self, type(self))
+
+    @property
+    def url(self) -> str:
+        return self._prod_url
+
+    def _path(self, func: str) -> str:
+        return f"/{self._version}/{func.replace('.', '/')}"
+
+    def _request(self, method: str, func: str, **kwargs) -> "requests.Response":
+        url = func if func.startswith('http') else self._prod_url + self._path(func)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, func='', params=None, json=None, timeout=30):
+        r = self._request('GET', func, params=params, json=json, timeout=timeout)
+        r.raise_for_status()
+        return r.json()
+
+    def post(self, func='', params=None, json=None, data=None, timeout=30, raise_for_status=True):
+        r = self._request('POST', func, params=params, json=json, data=data, timeout=timeout)
+        if not raise_for_status:
+            try:
+                return r.json()
+            except ValueError:
+                r.raise_for_status()
+                raise
+        if not r.ok:
+            from requests.exceptions import HTTPError
+            raise HTTPError('Error: {}'.format(r.json()), response=r)
+        return r.json()
+
+    def push_packed(self, signatures: list, packed: str, func: str="chain.push_transaction", timeout=30) -> dict:
+        """
+        Push signed packed transaction, nodeos errors are returned as json
+        (see `litewax.push.check_push_result`)
+        """
+        wait_push(func if func.startswith('http') else self)
+        with span("push", node=func if func.startswith('http') else self.url) as s:
+            resp = self.post(func, json=push_payload(signatures, packed), timeout=timeout, raise_for_status=False)
+            s.set(outcome=push_outcome(resp))
+            return resp
+
+
+class Transport:
+    """
+    Keep-alive connection pools shared by clients, contracts, abigen and payers.
+    Every session gets its own cookie jar but connections (and TLS handshakes)
+    are reused through shared adapters, one urllib3 pool per host.
+    ### Methods:
+    - cleos
+    - scraper
+    - async_session
+    """
+    def __init__(self, pool_size: int=20, pool_connections: int=10, pool_block: bool=False, http2: bool=True):
+        self.pool_size = pool_size
+        self.pool_connections = pool_connections
+        self.pool_block = pool_block
+        self.http2 = http2 and HTTP2
+
+        self._lock = threading.Lock()
+        self._cipher_adapters = {}
+        self._scrapers = {}
+        self._cleos = {}
+
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_size, pool_block=pool_block)
+
+        self.session = requests.Session()
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+    def __str__(self):
+        return f"Transport(pool_size={self.pool_size}, nodes={[str(x) for x in self._cleos]})"
+
+    def cleos(self, node) -> PooledCleos:
+        """
+        Get node api bound to the shared session
+        (`node` is an url, list of urls or `litewax.nodepool.NodePool`)
+        """
+        if isinstance(node, list):
+            node = tuple(node)
+
+        with self._lock:
+            if node not in self._cleos:
+                if isinstance(node, str):
+                    self._cleos[node] = PooledCleos(url=node, session=self.session)
+                elif isinstance(node, tuple):
+                    from .nodepool import NodePool
+                    self._cleos[node] = NodePool(list(node), transport=self).cleos(session=self.session)
+                else:
+                    self._cleos[node] = node.cleos(session=self.session)
+            return self._cleos[node]
+
+    def _cipher_adapter(self, cipher_suite: str) -> "HTTPAdapter":
+        import cloudscraper
+        if cipher_suite not in self._cipher_adapters:
+            self._cipher_adapters[cipher_suite] = cloudscraper.CipherSuiteAdapter(
+                cipherSuite=cipher_suite,
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_size,
+                pool_block=self.pool_block
+            )
+        return self._cipher_adapters[cipher_suite]
+
+    def scraper(self, browser: dict=None, headers: dict=None, key: str=None) -> "cloudscraper.CloudScraper":
+        """
+        Create cloudscraper session on shared connection pool.
+        Scrapers with `key` are created once and reused (payer endpoints)
+        """
+        import cloudscraper
+        with self._lock:
+            if key is not None and key in self._scrapers:
+                return self._scrapers[key]
+
+            scraper = cloudscraper.create_scraper(browser=browser)
+            scraper.mount('https://', self._cipher_adapter(scraper.cipherSuite))
+            scraper.mount('http://', self.adapter)
+            if headers:
+                scraper.headers.update(headers)
+
+            if key is not None:
+                self._scrapers[key] = scraper
+            return scraper
+
+    def async_session(self, headers: dict=None, timeout: float=30) -> "httpx.AsyncClient":
+        """
+        Create pooled async session (HTTP/2 when `h2` is installed).
+        Share one session between many async clients of the same event loop
+        """
+        try:
+            import httpx
+        except ImportError: # optional dependency: pip install litewax[async]
+            raise ImportError("Async clients require httpx. Install it with `pip install litewax[async]`")
+
+        return httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.pool_size * self.pool_connections, max_keepalive_connections=self.pool_size),
+            timeout=timeout,
+            headers=headers,
+            http2=self.http2
+        )
+
+    def close(self):
+        """
+        Close all pooled connections
+        """
+        self.session.close()
+        for scraper in self._scrapers.values():
+            scraper.close()
+        for adapter in self._cipher_adapters.values():
+            adapter.close()
+
+
+_default_transport = None
+_default_lock = threading.Lock()
+
+def get_transport() -> Transport:
+    """
+    Get process-wide default transport
+    """
+    global _default_transport
+    if _default_transport is None:
+        with _default_lock:
+            if _default_transport is None:
+                _default_transport = Transport()
+    return _default_transport
+
+def set_transport(transport: Transport):
+    """
+    Replace process-wide default transport
+    """
+    global _default_transport
+    _default_transport = transport
@@ -0,0 +1,160 @@
+import json
+import threading
+
+from .transport import Transport, get_transport
+from .exceptions import CookiesExpired, SignError
+
+LOGIN_URL = "https://api-idm.wax.io/v1/accounts/auto-accept/login"
+SIGN_URL = "https://public-wax-on.wax.io/wam/sign"
+BROWSER = {'custom': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.77 Safari/537.36 Edg/91.0.864.37"}
+
+SIGN_HEADERS = {
+    'origin': 'https://all-access.wax.io',
+    'referer': 'https://all-access.wax.io/',
+    'content-type': 'application/json;charset=UTF-8',
+}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def sign_body(trx: bytes) -> bytes:
+    """
+    `wam/sign` request body. WCW expects the transaction as an array of ints
+    """
+    return json.dumps({
+        "serializedTransaction": list(trx),
+        "website": "wallet.wax.io",
+        "description": "jwt is insecure",
+        "freeBandwidth": True
+    }, separators=(',', ':')).encode()
+
+def _signatures(status: int, data) -> list:
+    if isinstance(data, dict) and data.get("signatures"):
+        return data["signatures"]
+    if status in (401, 403):
+        raise CookiesExpired("Session token is expired")
+    raise SignError(f"WCW sign failed: {data}")
+
+def _json(resp):
+    try:
+        return resp.json()
+    except ValueError:
+        return resp.text
+
+
+class WCWSession:
+    """
+    Authenticated WAX Cloud Wallet session of one cookie. Connections are reused,
+    CORS preflight is sent once per session (it is only needed by browsers),
+    at most `concurrency` sign requests are in flight
+    ### Methods:
+    - login
+    - sign
+    """
+    def __init__(self, cookie: str, transport: Transport=None, concurrency: int=4, preflight: bool=True, timeout: float=120):
+        self.cookie = cookie
+        self.transport = transport or get_transport()
+        self.session = self.transport.scraper(browser=BROWSER, key=f"wcw:{cookie}")
+        self.session.cookies.set('session_token', cookie)
+        self.headers = dict(SIGN_HEADERS, **{'x-access-token': cookie})
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._preflight = preflight
+        self._preflight_lock = threading.Lock()
+
+    def __str__(self):
+        return f"WCWSession(concurrency={self.concurrency})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def login(self) -> str:
+        """
+        Get wallet name by session_token
+        """
+        try:
+            return self.session.get(LOGIN_URL, headers={"origin": "https://wallet.wax.io"}).json()["userAccount"]
+        except KeyError:
+            raise CookiesExpired("Session token is expired")
+
+    def _preflight_once(self):
+        with self._preflight_lock:
+            if self._preflight:
+                self.session.options(SIGN_URL, headers={"origin": "https://all-access.wax.io"})
+                self._preflight = False
+
+    def sign(self, trx: bytes) -> list:
+        """
+        Sign serialized transaction
+        ### Returns:
+        - list of signatures
+        """
+        if self._preflight:
+            self._preflight_once()
+
+        body = sign_body(trx)
+        with self._slots:
+            resp = self.session.post(SIGN_URL, headers=self.headers, data=body, timeout=self.timeout)
+        return _signatures(resp.status_code, _json(resp))
+
+
+class AsyncWCWSession(WCWSession):
+    """
+    `WCWSession` over pooled `httpx.AsyncClient`
+    """
+    def __init__(self, cookie: str, session, concurrency: int=4, preflight: bool=True, timeout: float=120):
+        self.cookie = cookie
+        self.session = session
+        self.headers = dict(SIGN_HEADERS, **{'x-access-token': cookie})
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self._preflight = preflight
+        # created on first use, inside the running loop
+        self._slots = None
+        self._preflight_lock = None
+
+    async def login(self) -> str:
+        # session may be shared by clients of other cookies, so no client-level cookie jar
+        r = await self.session.get(LOGIN_URL, headers={"origin": "https://wallet.wax.io", "cookie": f"session_token={self.cookie}"})
+        try:
+            return r.json()["userAccount"]
+        except KeyError:
+            raise CookiesExpired("Session token is expired")
+
+    async def _preflight_once(self):
+        import asyncio
+        if self._preflight_lock is None:
+            self._preflight_lock = asyncio.Lock()
+        async with self._preflight_lock:
+            if self._preflight:
+                await self.session.request("OPTIONS", SIGN_URL, headers={"origin": "https://all-access.wax.io"})
+                self._preflight = False
+
+    async def sign(self, trx: bytes) -> list:
+        if self._preflight:
+            await self._preflight_once()
+        if self._slots is None:
+            import asyncio
+            self._slots = asyncio.Semaphore(self.concurrency)
+
+        body = sign_body(trx)
+        async with self._slots:
+            resp = await self.session.post(SIGN_URL, headers=self.headers, content=body, timeout=self.timeout)
+        return _signatures(resp.status_code, _json(resp))
+
+
+def get_wcw_session(cookie: str, transport: Transport=None, concurrency: int=None) -> WCWSession:
+    """
+    Shared `WCWSession` of cookie, clients with the same cookie (and `concurrency`,
+    4 by default) reuse one session. Other `concurrency` gets its own session,
+    sign requests in flight on the shared one keep their limit
+    """
+    transport = transport or get_transport()
+    concurrency = concurrency or 4
+    with _sessions_lock:
+        session = _sessions.get((transport, cookie, concurrency))
+        if session is None:
+            session = _sessions[(transport, cookie, concurrency)] = WCWSession(cookie, transport, concurrency=concurrency)
+        return session
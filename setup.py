@@ -25,7 +25,11 @@ setup(
     description="Simply python library for interact with (EOSIO) WAX blockchain",
 
     packages=['litewax'],
-    install_requires=['requests', 'libeospy', 'cloudscraper'],
+    install_requires=['requests', 'libeospy', 'cloudscraper', 'base58'],
+    extras_require={
+        'async': ['httpx'],
+        'fast': ['coincurve'],
+    },
 
     license='MIT License',
     long_description=long_description,
@@ -48,7 +52,7 @@ setup(
         "Intended Audience :: Financial and Insurance Industry",
     ],
     include_package_data=True, # for MANIFEST.in
-    python_requires='>=3.6.0',
+    python_requires='>=3.7.0',
 
     package_data={package: ["py.typed", "*.pyi", "**/*.pyi"] for package in find_packages()},
     zip_safe=False,
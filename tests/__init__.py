@@ -3,3 +3,23 @@ from .tests_client import *
 from .tests_contract import *
 from .tests_multisigclient import *
 from .tests_wcw import *
+from .tests_serializer import *
+from .tests_abicache import *
+from .tests_chaincontext import *
+from .tests_asyncclient import *
+from .tests_transport import *
+from .tests_nodepool import *
+from .tests_push import *
+from .tests_signer import *
+from .tests_transaction import *
+from .tests_action import *
+from .tests_registry import *
+from .tests_pipeline import *
+from .tests_batcher import *
+from .tests_retry import *
+from .tests_resources import *
+from .tests_tables import *
+from .tests_benchmarks import *
+from .tests_instrument import *
+from .tests_accounts import *
+from .tests_imports import *
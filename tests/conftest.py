@@ -0,0 +1,39 @@
+import sys
+
+import pytest
+
+from .fakes import ChainNode, HttpNodes
+
+
+@pytest.fixture()
+def http_nodes():
+    nodes = HttpNodes()
+    yield nodes
+    nodes.close()
+
+@pytest.fixture()
+def chain(http_nodes, tmp_path, monkeypatch):
+    """
+    Local `ChainNode` with WCW endpoints, own transport (WCW sessions are not
+    shared with other tests) and working directory for generated contracts
+    ### Yields:
+    - (node, url, transport)
+    """
+    from litewax import wcw
+    from litewax import contract
+    from litewax.transport import Transport
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in [x for x in sys.modules if x == "contracts" or x.startswith("contracts.")]:
+        monkeypatch.delitem(sys.modules, name)
+    monkeypatch.setattr(contract, "registry", contract.ContractRegistry())
+
+    node = ChainNode()
+    url, _ = http_nodes.start(node.reply)
+    monkeypatch.setattr(wcw, "LOGIN_URL", f"{url}/v1/accounts/auto-accept/login")
+    monkeypatch.setattr(wcw, "SIGN_URL", f"{url}/wam/sign")
+
+    transport = Transport()
+    yield node, url, transport
+    transport.close()
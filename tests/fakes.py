@@ -0,0 +1,309 @@
+"""
+Test doubles shared by offline test modules: local json http nodes and
+action / transaction / node api fakes
+"""
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TX_ID = "ab" * 32
+CHAIN_ID = "1064487b3cd1a897ce03ae5b6a865651747e2e152090f99c1d19d44e01aea5a4"
+# valid K1 signature (signatures are not verified by fake nodes)
+SIGNATURE = "SIG_K1_KfQ57wLFFiPR85zjuQyZsn7hK3jRicHXg4qETxLvxH6fbgMacWHtXV3i3nAYKr7yrEchk8v5JmbQ3KLgLVG1NHNwDbLHgA"
+
+ABIS = {
+    "eosio.token": {
+        "version": "eosio::abi/1.1",
+        "structs": [
+            {"name": "transfer", "base": "", "fields": [
+                {"name": "from", "type": "name"},
+                {"name": "to", "type": "name"},
+                {"name": "quantity", "type": "asset"},
+                {"name": "memo", "type": "string"}
+            ]}
+        ],
+        "actions": [{"name": "transfer", "type": "transfer"}]
+    },
+    # payer action `Nefty` expects first
+    "neftyblocksd": {
+        "version": "eosio::abi/1.1",
+        "structs": [{"name": "paycpu", "base": "", "fields": []}],
+        "actions": [{"name": "paycpu", "type": "paycpu"}]
+    },
+}
+
+
+def account(name, cpu_used, cpu_max=10000, net_used=0, net_max=100000):
+    """
+    `get_account` response with CPU / NET limits
+    """
+    return {
+        "account_name": name,
+        "cpu_limit": {"used": cpu_used, "available": cpu_max - cpu_used, "max": cpu_max},
+        "net_limit": {"used": net_used, "available": net_max - net_used, "max": net_max},
+    }
+
+
+def make_handler(reply, hits, delay=0.0, connections=None):
+    """
+    Json http handler: `reply(method, path, body)` returns (status, body)
+    """
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _handle(self, method):
+            length = int(self.headers.get("Content-Length", 0))
+            raw = self.rfile.read(length) if length else b""
+            hits.append(self.path)
+            if connections is not None:
+                connections.add(self.client_address)
+            time.sleep(delay)
+            status, body = reply(method, self.path, json.loads(raw) if raw else None)
+            data = json.dumps(body).encode()
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            except ConnectionError:
+                # losing request of a race, client is already gone
+                pass
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def do_OPTIONS(self):
+            self._handle("OPTIONS")
+    return Handler
+
+
+class HttpNodes:
+    """
+    Local json http nodes of one test
+    ### Methods:
+    - start
+    - close
+    """
+    def __init__(self):
+        self.servers = []
+
+    def start(self, reply, delay: float=0.0, connections: set=None) -> tuple:
+        """
+        Start node answering with `reply(method, path, body)`
+        ### Returns:
+        - (url, list of requested paths)
+        """
+        hits = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(reply, hits, delay, connections))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}", hits
+
+    def close(self):
+        for server in self.servers:
+            server.shutdown()
+        self.servers = []
+
+
+class ChainNode:
+    """
+    `reply` of a node with chain, ABI, push, payer cosign (`/cosign`) and
+    WCW (login / sign) endpoints. Unknown keys get new accounts, every
+    session cookie logs in as `wallet`.
+    `calls` counts requests by path (`OPTIONS <path>` for preflights)
+    """
+    def __init__(self, abis=None, wallet="zknmi.wam", sign_delay: float=0.0):
+        self.abis = abis or ABIS
+        self.wallet = wallet
+        self.sign_delay = sign_delay
+        # public key -> account
+        self.accounts = {}
+        self.calls = {}
+        self.pushed = []
+        self.signing = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def account(self, key: str) -> str:
+        """
+        Account of public key
+        """
+        with self._lock:
+            if key not in self.accounts:
+                index, suffix = len(self.accounts), ""
+                while True:
+                    index, rest = divmod(index, 26)
+                    suffix = "abcdefghijklmnopqrstuvwxyz"[rest] + suffix
+                    if not index:
+                        break
+                self.accounts[key] = "account" + suffix
+            return self.accounts[key]
+
+    def reply(self, method, path, body):
+        import base64
+        import hashlib
+        from litewax.serializer import abi_to_bin
+
+        key = path if method != "OPTIONS" else f"OPTIONS {path}"
+        with self._lock:
+            self.calls[key] = self.calls.get(key, 0) + 1
+
+        if method == "OPTIONS":
+            return 200, {}
+        if path == "/v1/chain/get_info":
+            return 200, {"chain_id": CHAIN_ID, "last_irreversible_block_num": 100, "head_block_num": 120}
+        if path == "/v1/chain/get_block":
+            return 200, {"ref_block_prefix": 12345}
+        if path == "/v1/chain/get_raw_abi":
+            raw = abi_to_bin(self.abis[body["account_name"]])
+            return 200, {"account_name": body["account_name"], "abi_hash": hashlib.sha256(raw).hexdigest(), "abi": base64.b64encode(raw).decode()}
+        if path == "/v1/chain/get_accounts_by_authorizers":
+            return 200, {"accounts": [
+                {"account_name": self.account(key), "permission_name": "active", "authorizing_key": key, "weight": 1, "threshold": 1}
+                for key in body["keys"]
+            ]}
+        if path in ("/v1/chain/push_transaction", "/v1/chain/send_transaction"):
+            with self._lock:
+                self.pushed.append(body)
+            return 202, {"transaction_id": TX_ID, "processed": {}}
+        if path == "/cosign":
+            # replies of both Nefty and AtomicHub signers
+            return 200, {"success": True, "data": [SIGNATURE], "signatures": [SIGNATURE]}
+        if path == "/v1/accounts/auto-accept/login":
+            return 200, {"userAccount": self.wallet}
+        if path == "/wam/sign":
+            with self._lock:
+                self.signing += 1
+                self.peak = max(self.peak, self.signing)
+            time.sleep(self.sign_delay)
+            with self._lock:
+                self.signing -= 1
+            return 200, {"signatures": [SIGNATURE]}
+        return 404, {}
+
+
+def dead_node() -> str:
+    """
+    Url of a closed local port
+    """
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f"http://127.0.0.1:{port}"
+
+
+class FakeAction:
+    """
+    Serialized action of `actor` with `data_size` bytes of data
+    """
+    def __init__(self, actor="abuztradewax", name="transfer", account="eosio.token", data_size=32):
+        self.account = account
+        self.name = name
+        self.actor = actor
+        self.permission = "active"
+        self.authorization = ({"actor": actor, "permission": "active"},)
+        self.result = {
+            "account": account,
+            "name": name,
+            "authorization": [{"actor": actor, "permission": "active"}],
+            "data": "00" * data_size
+        }
+
+
+class FakeWax:
+    """
+    Node api with `get_account` of known accounts
+    """
+    pool = None
+
+    def __init__(self, accounts=None, url="http://a"):
+        self.accounts = accounts or {}
+        self.url = url
+        self.calls = 0
+
+    def get_account(self, name):
+        self.calls += 1
+        return self.accounts[name]
+
+
+class AsyncFakeWax(FakeWax):
+    async def get_account(self, name):
+        import asyncio
+        await asyncio.sleep(0.01)
+        return FakeWax.get_account(self, name)
+
+
+class FakeChain:
+    """
+    TAPOS provider with fixed chain / LIB info
+    """
+    def __init__(self):
+        self.invalidated = 0
+
+    def get(self) -> tuple:
+        return {"chain_id": CHAIN_ID, "last_irreversible_block_num": 100}, {"ref_block_prefix": 12345}
+
+    def invalidate(self):
+        self.invalidated += 1
+
+
+class FakeClient:
+    def __init__(self, wax=None):
+        from litewax.resources import ResourceMonitor
+        self.chain = FakeChain()
+        # resources are tracked only for client with node api
+        self.resources = ResourceMonitor(wax) if wax is not None else None
+
+
+class FakePayWith:
+    def __init__(self, trx, payer, receipt=None):
+        self.trx = trx
+        self.payer = payer
+        self.receipt = receipt or {"transaction_id": "cd" * 32}
+
+    def push(self):
+        return self.receipt
+
+
+class FakeTX:
+    """
+    Transaction: `push` waits for `gate` (signing), raises queued `errors`,
+    then pushes to `wax` and returns `receipt`
+    """
+    def __init__(self, *actions, client=None, wax=None, errors=(), receipt=None, payer_receipt=None, gate=None):
+        self.client = client or FakeClient()
+        self.wax = wax if wax is not None else self.client.resources.wax
+        self.actions = list(actions)
+        self.expiration = 60
+        self.errors = list(errors)
+        self.receipt = receipt or {"transaction_id": TX_ID}
+        self.payer_receipt = payer_receipt
+        self.gate = gate
+        self.pushes = 0
+        self.pushed_at = None
+        self.payer = None
+
+    def push(self):
+        from litewax.push import wait_push
+        if self.gate:
+            self.gate.wait()
+        self.pushes += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        wait_push(self.wax)
+        self.pushed_at = time.monotonic()
+        return self.receipt
+
+    def pay_with(self, payer):
+        self.payer = FakePayWith(self, payer, self.payer_receipt)
+        return self.payer
@@ -0,0 +1,122 @@
+import base64
+import hashlib
+
+import pytest
+
+from litewax.abicache import AbiCache
+from litewax.exceptions import AbiNotFound
+from litewax.serializer import abi_to_bin
+from litewax.transport import Transport
+
+
+class FakeNode:
+    def __init__(self):
+        self.abi_hash = "aa" * 32
+        self.abi = {"version": "eosio::abi/1.1", "structs": []}
+        self.hash_calls = 0
+        self.abi_calls = 0
+
+    def fetch(self, account_name, known_hash=None):
+        self.hash_calls += 1
+        if known_hash == self.abi_hash:
+            return self.abi_hash, None
+        self.abi_calls += 1
+        return self.abi_hash, dict(self.abi)
+
+
+def make_cache(tmp_path, node, ttl=300):
+    cache = AbiCache(path=str(tmp_path), ttl=ttl)
+    cache.fetch = node.fetch
+    return cache
+
+def raw_abi(abi: dict) -> dict:
+    raw = abi_to_bin(abi)
+    return {"abi_hash": hashlib.sha256(raw).hexdigest(), "abi": base64.b64encode(raw).decode()}
+
+def test_cache_hit(tmp_path):
+    node = FakeNode()
+    cache = make_cache(tmp_path, node)
+
+    assert cache.get("res.pink") == node.abi
+    assert cache.get("res.pink") == node.abi
+    assert node.hash_calls == 1
+    assert node.abi_calls == 1
+
+    # another process with the same cache dir
+    other = make_cache(tmp_path, node)
+    assert other.get("res.pink") == node.abi
+    assert node.hash_calls == 1
+
+def test_revalidate_on_redeploy(tmp_path):
+    node = FakeNode()
+    cache = make_cache(tmp_path, node, ttl=0)
+
+    cache.get("res.pink")
+    cache.get("res.pink")
+    assert node.hash_calls == 2
+    assert node.abi_calls == 1
+
+    node.abi_hash = "bb" * 32
+    node.abi = {"version": "eosio::abi/1.2", "structs": []}
+
+    assert cache.get("res.pink")["version"] == "eosio::abi/1.2"
+    assert cache.get_hash("res.pink") == "bb" * 32
+    assert node.abi_calls == 2
+
+def test_invalidate(tmp_path):
+    node = FakeNode()
+    cache = make_cache(tmp_path, node)
+
+    cache.get("res.pink")
+    cache.invalidate("res.pink")
+    cache.get("res.pink")
+    assert node.hash_calls == 2
+    assert node.abi_calls == 1
+
+def test_redeploy_between_requests(tmp_path, http_nodes):
+    versions = [
+        {"version": "eosio::abi/1.1", "structs": [{"name": "noop", "base": "", "fields": []}],
+         "actions": [{"name": "noop", "type": "noop"}]},
+        {"version": "eosio::abi/1.2", "structs": [{"name": "paycpu", "base": "", "fields": []}],
+         "actions": [{"name": "paycpu", "type": "paycpu"}]},
+    ]
+
+    def reply(method, path, body):
+        # contract is redeployed after every request
+        abi = versions[len(hits) % 2]
+        if path == "/v1/chain/get_raw_abi":
+            return 200, {"account_name": body["account_name"], **raw_abi(abi)}
+        return 200, {"account_name": body["account_name"], "abi": abi}
+
+    url, hits = http_nodes.start(reply)
+    cache = AbiCache(url, path=str(tmp_path), transport=Transport())
+    for _ in range(2):
+        abi_hash = cache.revalidate("res.pink")["abi_hash"]
+        abi = cache._read(cache._abi_file(abi_hash))
+        assert abi_hash == raw_abi(abi)["abi_hash"]
+    assert hits == ["/v1/chain/get_raw_abi"] * 2
+
+def test_unknown_account(tmp_path, http_nodes):
+    def reply(method, path, body):
+        if body["account_name"] == "nocontract":
+            return 200, {"account_name": "nocontract", "code_hash": "00" * 32, "abi_hash": "00" * 32, "abi": ""}
+        return 500, {"code": 500, "error": {"code": 3060002, "name": "account_query_exception", "what": "Account Query Exception"}}
+
+    url, _ = http_nodes.start(reply)
+    cache = AbiCache(url, path=str(tmp_path), transport=Transport())
+    with pytest.raises(AbiNotFound):
+        cache.get("unknown")
+    with pytest.raises(AbiNotFound):
+        cache.get("nocontract")
+
+def test_follows_process_transport(tmp_path):
+    from litewax.transport import get_transport, set_transport
+    cache = AbiCache(path=str(tmp_path))
+    previous = get_transport()
+    transport = Transport()
+    set_transport(transport)
+    try:
+        assert cache.transport is transport
+    finally:
+        set_transport(previous)
+    assert AbiCache(path=str(tmp_path), transport=transport).transport is transport
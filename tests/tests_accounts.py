@@ -0,0 +1,149 @@
+import asyncio
+
+import eospy.keys
+import pytest
+
+import litewax
+from litewax.accounts import AccountCache, accounts_by_keys, legacy_key
+from litewax.asyncmultisigclient import AsyncMultiSigClient
+
+EOS_KEY = "EOS6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV"
+PUB_KEY = "PUB_K1_6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5BoDq63"
+
+
+class FakeWax:
+    def __init__(self):
+        self.requests = []
+
+    def post(self, func, json=None, **kwargs):
+        self.requests.append(json["keys"])
+        accounts = []
+        for i, key in enumerate(json["keys"]):
+            if key.endswith("missing"):
+                continue
+            accounts.append({"account_name": f"owner{i}", "permission_name": "owner", "authorizing_key": key})
+            if key.endswith("owner"):
+                continue
+            accounts.append({"account_name": f"active{i}", "permission_name": "active", "authorizing_key": key})
+        return {"accounts": accounts}
+
+
+def test_legacy_key():
+    assert legacy_key(PUB_KEY) == EOS_KEY
+    assert legacy_key(EOS_KEY) == EOS_KEY
+
+def test_accounts_by_keys_chunks():
+    wax = FakeWax()
+    keys = [f"key{i}" for i in range(250)] + ["key0", "keymissing"]
+    names = accounts_by_keys(wax, keys, chunk=100)
+
+    assert [len(x) for x in sorted(wax.requests, key=len)] == [51, 100, 100]
+    assert len(names) == 250
+    assert names["key0"] == "active0"
+    assert "keymissing" not in names
+
+def new_keys(count: int) -> list:
+    return [eospy.keys.EOSKey().to_wif() for _ in range(count)]
+
+def transfer(url: str, actor: str):
+    token = litewax.Contract("eosio.token", actor=actor, node=url)
+    return token.transfer(_from=actor, to="eosio", quantity="1.00000000 WAX", memo="")
+
+def test_multisig_bulk_and_lazy(chain):
+    node, url, transport = chain
+    lookups = lambda: node.calls.get("/v1/chain/get_accounts_by_authorizers", 0)
+    keys = new_keys(5)
+
+    client = litewax.MultiSigClient(private_keys=keys, node=url, transport=transport)
+    assert lookups() == 1
+    assert len(set(cl.name for cl in client)) == 5
+
+    known = {key: cl.name for key, cl in zip(keys, client)}
+    client = litewax.MultiSigClient(private_keys=keys, node=url, transport=transport, names=known)
+    assert lookups() == 1
+
+    client = litewax.MultiSigClient(private_keys=keys, cookies=["cookie1"], node=url, transport=transport, lazy=True)
+    assert lookups() == 1
+    client.Transaction(transfer(url, known[keys[0]])).push()
+    assert lookups() == 2
+    assert client[-1].name == node.wallet
+
+    single = litewax.Client(private_key=keys[1], node=url, transport=transport, lazy=True)
+    assert lookups() == 2
+    assert single.name == known[keys[1]]
+    assert lookups() == 3
+
+def test_async_multisig_bulk(chain):
+    node, url, _ = chain
+    keys = new_keys(4)
+
+    async def main():
+        async with AsyncMultiSigClient(private_keys=keys, node=url, names={keys[0]: "known"}) as client:
+            return [cl.name for cl in client]
+
+    names = asyncio.run(main())
+    assert names[0] == "known"
+    assert len(set(names)) == 4
+    assert node.calls["/v1/chain/get_accounts_by_authorizers"] == 1
+
+def test_account_cache(tmp_path):
+    cache = AccountCache("http://node:8888", path=str(tmp_path), ttl=60)
+    cache.set("cookie-secret", "wcwaccount")
+    cache.set(EOS_KEY, "keyaccount", "owner")
+
+    assert cache.get("cookie-secret") == "wcwaccount"
+    assert cache.get(EOS_KEY) is None
+    assert cache.get(EOS_KEY, "owner") == "keyaccount"
+    stored = "".join(p.read_text() + p.name for p in tmp_path.rglob("*.json"))
+    assert "cookie-secret" not in stored and EOS_KEY not in stored
+
+    cache.invalidate("cookie-secret")
+    assert cache.get("cookie-secret") is None
+    assert AccountCache("http://node:8888", path=str(tmp_path), ttl=0).get(EOS_KEY, "owner") is None
+    assert AccountCache("http://other", path=str(tmp_path)).get(EOS_KEY, "owner") is None
+
+def test_accounts_by_keys_cache(tmp_path):
+    cache = AccountCache(path=str(tmp_path))
+    wax = FakeWax()
+    keys = [f"key{i}" for i in range(5)]
+    first = accounts_by_keys(wax, keys, cache=cache)
+    assert accounts_by_keys(wax, keys + ["key5"], cache=cache) == dict(first, key5="active0")
+    assert wax.requests == [keys, ["key5"]]
+
+def test_account_cache_fallback_permission(tmp_path):
+    # key authorizes only `owner`, `active` lookup falls back to it and is cached as well
+    cache = AccountCache(path=str(tmp_path))
+    wax = FakeWax()
+    assert accounts_by_keys(wax, ["key-owner"], cache=cache) == {"key-owner": "owner0"}
+    assert accounts_by_keys(wax, ["key-owner"], cache=cache) == {"key-owner": "owner0"}
+    assert wax.requests == [["key-owner"]]
+    assert cache.get("key-owner") == "owner0"
+
+def test_client_account_cache(chain, tmp_path):
+    node, url, transport = chain
+    cache = AccountCache(url, path=str(tmp_path / "accounts"))
+    key, other = new_keys(2)
+    client = litewax.Client(private_key=key, node=url, transport=transport, account_cache=cache)
+    wcw = litewax.Client(cookie="cached", node=url, transport=transport, account_cache=cache)
+    calls = dict(node.calls)
+
+    # restarted worker
+    assert litewax.Client(private_key=key, node=url, transport=transport, account_cache=cache).name == client.name
+    assert litewax.Client(cookie="cached", node=url, transport=transport, account_cache=cache).name == wcw.name
+    multisig = litewax.MultiSigClient(private_keys=[key, other], node=url, transport=transport, account_cache=cache)
+    assert multisig[0].name == client.name
+    assert node.calls["/v1/chain/get_accounts_by_authorizers"] == calls["/v1/chain/get_accounts_by_authorizers"] + 1
+    assert node.calls["/v1/accounts/auto-accept/login"] == calls["/v1/accounts/auto-accept/login"]
+
+    client.forget_name()
+    assert cache.get(client.public_key) is None
+    assert client.name == multisig[0].name
+
+def test_authorization_error():
+    from litewax.push import check_push_result
+    from litewax.exceptions import AuthorizationError, UnknownError
+    resp = {"code": 401, "error": {"code": 3090003, "what": "Provided keys, permissions, and delays do not satisfy declared authorizations",
+                                    "details": [{"message": "transaction declares authority '{\"actor\":\"a\",\"permission\":\"active\"}', but does not have signatures for it."}]}}
+    with pytest.raises(AuthorizationError) as e:
+        check_push_result(resp)
+    assert isinstance(e.value, UnknownError)
@@ -0,0 +1,148 @@
+import importlib.util
+
+import pytest
+
+from litewax.abicache import AbiCache
+from litewax.abigen import abigen
+from litewax.action import serialize_actions
+
+ABI = {
+    "version": "eosio::abi/1.1",
+    "structs": [
+        {"name": "transfer", "base": "", "fields": [
+            {"name": "from", "type": "name"},
+            {"name": "to", "type": "name"},
+            {"name": "quantity", "type": "asset"},
+            {"name": "memo", "type": "string"}
+        ]},
+        {"name": "noop", "base": "", "fields": []},
+        # helper structs: base of an action, not actions themselves
+        {"name": "owner_base", "base": "", "fields": [{"name": "owner", "type": "name"}]},
+        {"name": "open", "base": "owner_base", "fields": [{"name": "symbol", "type": "symbol"}]}
+    ],
+    "actions": [
+        {"name": "transfer", "type": "transfer"},
+        {"name": "noop", "type": "noop"},
+        {"name": "open", "type": "open"}
+    ]
+}
+
+
+@pytest.fixture()
+def token(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = AbiCache(path=str(tmp_path / ".abi_cache"))
+    cache.fetch = lambda account_name, known_hash=None: ("aa" * 32, ABI)
+    abigen(cache=cache).gen("eosio.token")
+
+    spec = importlib.util.spec_from_file_location("eosio_token", tmp_path / "contracts" / "eosio_token.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+
+    calls = []
+    serializer = mod.eosio_token.serializer
+    json_to_bin = serializer.json_to_bin
+    monkeypatch.setattr(serializer, "json_to_bin", lambda *args: calls.append(args) or json_to_bin(*args))
+    return mod.eosio_token(actor="abuztradewax", permission="owner"), calls
+
+def test_lazy_action(token):
+    contract, calls = token
+    actions = [contract.transfer(_from="abuztradewax", to="atomicmarket", quantity=f"{i}.00000000 WAX", memo="")
+               for i in range(100)]
+
+    assert calls == []
+    action = actions[5]
+    assert action.account == "eosio.token"
+    assert action.name == "transfer"
+    assert action.actor == "abuztradewax"
+    assert action.matches("eosio.token", "transfer", "abuztradewax", "owner")
+    assert not action.matches("eosio.token", "transfer", "abuztradewax", "active")
+    assert "5.00000000 WAX" in str(action)
+    assert calls == []
+
+    result = serialize_actions([action])[0]
+    assert result["authorization"] == [{"actor": "abuztradewax", "permission": "owner"}]
+    assert result["data"] == contract.serializer.json_to_bin("transfer", dict(action.args))
+    assert action.result == result
+    assert len(calls) == 2
+
+    # payload is a copy, memoized data can't be changed through it
+    result["data"] = ""
+    result["authorization"][0]["actor"] = "other"
+    assert action.result["data"] == contract.serializer.json_to_bin("transfer", dict(action.args))
+    assert action.result["authorization"] == [{"actor": "abuztradewax", "permission": "owner"}]
+    assert len(calls) == 3
+
+    assert contract.noop().result["data"] == ""
+
+def test_immutable(token):
+    contract, _ = token
+    action = contract.noop()
+
+    with pytest.raises(AttributeError):
+        action.name = "transfer"
+    with pytest.raises(TypeError):
+        contract.transfer(_from="a", to="b", quantity="1.00000000 WAX", memo="").args["memo"] = "x"
+
+    # actor is captured when action is created
+    contract.set_actor("other")
+    assert action.actor == "abuztradewax"
+
+    # authorization can't be changed once data may be memoized
+    with pytest.raises(TypeError):
+        action.authorization[0]["actor"] = "other"
+    assert action.result["authorization"] == [{"actor": "abuztradewax", "permission": "owner"}]
+
+def test_fields_checked(token):
+    from litewax.action import Action
+    contract, calls = token
+
+    with pytest.raises(ValueError, match="unknown amount, missing quantity"):
+        Action(contract, "transfer", {"from": "a", "to": "b", "amount": "1.00000000 WAX", "memo": ""})
+    with pytest.raises(ValueError, match="Unknown action"):
+        Action(contract, "unknown", {})
+    # checked without serialization
+    assert calls == []
+
+def test_actor_not_set(token):
+    contract, _ = token
+    contract.set_actor("")
+    with pytest.raises(ValueError):
+        contract.noop()
+
+def test_compact_contract(token):
+    contract, _ = token
+    klass = type(contract)
+
+    assert not hasattr(contract, "__dict__")
+    assert klass.ACTIONS == {"transfer": ("from", "to", "quantity", "memo"), "noop": (), "open": ("owner", "symbol")}
+    # methods only for actions
+    assert not hasattr(klass, "owner_base")
+    assert contract.open(owner="abuztradewax", symbol="8,WAX").result["data"] == \
+        contract.serializer.json_to_bin("open", {"owner": "abuztradewax", "symbol": "8,WAX"})
+
+    contracts = [klass(actor=f"account{i}") for i in range(1000)]
+    assert contracts[0].wax is contracts[999].wax
+
+    with pytest.raises(ValueError):
+        contract.call("unknown", {})
+
+def test_get_abi(tmp_path):
+    cache = AbiCache(path=str(tmp_path / ".abi_cache"))
+    cache.fetch = lambda account_name, known_hash=None: ("aa" * 32, ABI)
+    gen = abigen(cache=cache)
+
+    assert gen.get_abi("eosio.token") == ABI["structs"]
+    assert gen.get_full_abi("eosio.token")["actions"] == ABI["actions"]
+
+def test_serialization_error_invalidates(token, monkeypatch):
+    from litewax import contract as contract_module
+    from litewax.exceptions import SerializationError
+    contract, _ = token
+
+    invalidated = []
+    monkeypatch.setattr(contract_module.registry, "invalidate", lambda *args: invalidated.append(args))
+    action = contract.transfer(_from="abuztradewax", to="atomicmarket", quantity="bad", memo="")
+    with pytest.raises(SerializationError):
+        action.result
+    assert invalidated == [("eosio.token",)]
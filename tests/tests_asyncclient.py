@@ -0,0 +1,150 @@
+import asyncio
+import json
+
+import pytest
+import eospy.keys
+from eospy.utils import sig_digest
+
+httpx = pytest.importorskip("httpx")
+
+from litewax import AsyncClient, AsyncMultiSigClient
+from litewax.exceptions import AuthNotFound, CPUlimit
+from .fakes import FakeAction
+
+CHAIN_ID = "1064487b3cd1a897ce03ae5b6a865651747e2e152090f99c1d19d44e01aea5a4"
+
+
+class FakeNode:
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.pushed = []
+        self.calls = {}
+        self.push_error = None
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.calls[path] = self.calls.get(path, 0) + 1
+
+        if path == "/v1/chain/get_info":
+            return httpx.Response(200, json={"chain_id": CHAIN_ID, "last_irreversible_block_num": 100})
+
+        if path == "/v1/chain/get_block":
+            return httpx.Response(200, json={"ref_block_prefix": 12345})
+
+        if path == "/v1/chain/get_accounts_by_authorizers":
+            key = json.loads(request.content)["keys"][0]
+            return httpx.Response(200, json={"accounts": [
+                {"account_name": self.accounts[key], "permission_name": "active"}
+            ]})
+
+        if path == "/v1/chain/push_transaction":
+            if self.push_error:
+                return httpx.Response(500, json={"code": 500, "error": {"what": self.push_error, "details": []}})
+            self.pushed.append(json.loads(request.content))
+            return httpx.Response(202, json={"transaction_id": "ab" * 32, "processed": {}})
+
+        return httpx.Response(404, json={})
+
+
+def make_session(node):
+    return httpx.AsyncClient(transport=httpx.MockTransport(node.handler))
+
+def test_async_client_push():
+    key = eospy.keys.EOSKey()
+    node = FakeNode({key.to_public(): "atonicmaiket"})
+
+    async def run():
+        async with AsyncClient(private_key=key.to_wif(), session=make_session(node)) as client:
+            assert client.name == "atonicmaiket"
+
+            for _ in range(3):
+                resp = await client.Transaction(FakeAction(client.name, name="noop", account="res.pink", data_size=0)).push()
+                assert resp["transaction_id"] == "ab" * 32
+
+            node.push_error = "Transaction exceeded the current CPU usage limit imposed on the transaction"
+            with pytest.raises(CPUlimit):
+                await client.Transaction(FakeAction(client.name, name="noop", account="res.pink", data_size=0)).push()
+
+    asyncio.run(run())
+
+    assert len(node.pushed) == 3
+    # TAPOS is fetched once for all transactions
+    assert node.calls["/v1/chain/get_info"] == 1
+
+    pushed = node.pushed[0]
+    digest = sig_digest(bytearray.fromhex(pushed["packed_trx"]), CHAIN_ID)
+    assert key.verify(pushed["signatures"][0], digest)
+
+def test_async_multisig_push():
+    keys = [eospy.keys.EOSKey() for _ in range(3)]
+    node = FakeNode({k.to_public(): f"account{i + 1}" for i, k in enumerate(keys)})
+
+    async def run():
+        client = await AsyncMultiSigClient.create(
+            private_keys=[k.to_wif() for k in keys],
+            session=make_session(node))
+        assert [cl.name for cl in client] == ["account1", "account2", "account3"]
+
+        await client.Transaction(*[FakeAction(cl.name, name="noop", account="res.pink", data_size=0) for cl in client]).push()
+        await client.close()
+
+    asyncio.run(run())
+
+    pushed = node.pushed[0]
+    digest = sig_digest(bytearray.fromhex(pushed["packed_trx"]), CHAIN_ID)
+    assert len(pushed["signatures"]) == 3
+    for key, signature in zip(keys, pushed["signatures"]):
+        assert key.verify(signature, digest)
+
+def test_async_client_no_auth():
+    with pytest.raises(AuthNotFound):
+        AsyncClient(session=httpx.AsyncClient())
+
+    client = AsyncClient(private_key=eospy.keys.EOSKey().to_wif(), session=httpx.AsyncClient())
+    with pytest.raises(AuthNotFound):
+        client.Contract("res.pink")
+
+def test_async_contract_keeps_loop_free(tmp_path, monkeypatch, http_nodes):
+    import sys, time, base64, hashlib
+    from litewax import contract as contract_module
+    from litewax.serializer import abi_to_bin
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in [x for x in sys.modules if x == "contracts" or x.startswith("contracts.")]:
+        monkeypatch.delitem(sys.modules, name)
+    monkeypatch.setattr(contract_module, "registry", contract_module.ContractRegistry())
+
+    raw = abi_to_bin({
+        "version": "eosio::abi/1.1",
+        "structs": [{"name": "noop", "base": "", "fields": []}],
+        "actions": [{"name": "noop", "type": "noop"}]
+    })
+    def reply(method, path, body):
+        return 200, {"account_name": body["account_name"], "abi_hash": hashlib.sha256(raw).hexdigest(), "abi": base64.b64encode(raw).decode()}
+    # slow node, a blocking abi request would stall the loop for 0.3s
+    url, hits = http_nodes.start(reply, delay=0.3)
+
+    async def run():
+        gaps = []
+        async def ticker():
+            last = time.monotonic()
+            while True:
+                await asyncio.sleep(0.01)
+                gaps.append(time.monotonic() - last)
+                last = time.monotonic()
+
+        async with AsyncClient(private_key=eospy.keys.EOSKey().to_wif(), name="abuztradewax", node=url) as client:
+            task = asyncio.create_task(ticker())
+            contract = await client.contract("res.pink")
+            again = await client.contract("res.pink")
+            task.cancel()
+            assert contract.wax is client.wax
+            assert type(again) is type(contract)
+            assert contract.noop().actor == "abuztradewax"
+        return gaps
+
+    gaps = asyncio.run(run())
+    assert hits == ["/v1/chain/get_raw_abi"]
+    assert len(gaps) > 10
+    assert max(gaps) < 0.2
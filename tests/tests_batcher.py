@@ -0,0 +1,78 @@
+import pytest
+
+from litewax.batcher import ActionBatcher, CostModel, action_size, TRANSACTION_OVERHEAD
+from . import fakes
+from .fakes import FakeAction, FakeTX, FakeWax, account
+
+
+class FakeClient(fakes.FakeClient):
+    def Transaction(self, *actions):
+        receipt = {
+            "transaction_id": "ab" * 32,
+            "processed": {
+                "receipt": {"cpu_usage_us": 100 * len(actions)},
+                "action_traces": [{"elapsed": 10} for _ in actions]
+            }
+        }
+        return FakeTX(*reversed(actions), wax=FakeWax(), receipt=receipt)
+
+
+def test_action_size():
+    assert action_size(FakeAction(data_size=32)) == 16 + 1 + 16 + 1 + 32
+    assert action_size(FakeAction(data_size=200)) == 16 + 1 + 16 + 2 + 200
+
+def test_size_budget():
+    actions = [FakeAction() for _ in range(100)]
+    batcher = ActionBatcher(FakeClient(), max_size=TRANSACTION_OVERHEAD + 66 * 30, cpu_budget_us=10 ** 9)
+
+    batches = list(batcher.batches(actions))
+    assert [len(x) for x in batches] == [30, 30, 30, 10]
+    assert [a for batch in batches for a in batch] == actions
+
+def test_cpu_budget_and_learning():
+    actions = [FakeAction() for _ in range(100)]
+    batcher = ActionBatcher(FakeClient(), cpu_budget_us=2000, cost_model=CostModel(default_cpu_us=500))
+    assert len(list(batcher.batches(actions))) == 25
+
+    results = batcher.push(actions[:4])
+    assert len(results) == 1
+    assert batcher.cost_model.estimate(actions[0]) == pytest.approx(100)
+    assert len(list(batcher.batches(actions))) == 5
+
+def test_account_budget():
+    wax = FakeWax({"abuztradewax": account("abuztradewax", cpu_used=8200, cpu_max=10000)})
+    client = FakeClient(wax)
+    batcher = ActionBatcher(client, cpu_budget_us=50000)
+    assert batcher.cost_model is client.resources.cost_model
+
+    # 1800us available / 1.2 margin, 500us per action
+    actions = [FakeAction() for _ in range(9)]
+    assert batcher.budget("abuztradewax") == pytest.approx(1500)
+    assert [len(x) for x in batcher.batches(actions)] == [3, 3, 3]
+    # sponsored transactions are not limited by the account
+    assert [len(x) for x in batcher.batches(actions, sponsored=True)] == [9]
+
+    # receipts are subtracted from the forecast
+    batcher.push(actions[:3])
+    assert client.resources.get("abuztradewax").cpu_available() == pytest.approx(1500, abs=1)
+    assert wax.calls == 1
+
+    # constant budget without resource monitor
+    assert ActionBatcher(FakeClient(), cpu_budget_us=2000).budget("abuztradewax") == 2000
+
+def test_transactions_keep_order():
+    actions = [FakeAction(name=f"a{i}") for i in range(5)]
+    batcher = ActionBatcher(FakeClient(), max_actions=2)
+
+    txs = list(batcher.transactions(actions))
+    assert [[a.name for a in tx.actions] for tx in txs] == [["a0", "a1"], ["a2", "a3"], ["a4"]]
+
+def test_learn_by_elapsed():
+    model = CostModel()
+    cheap, heavy = FakeAction(name="cheap"), FakeAction(name="heavy")
+    model.learn([cheap, heavy], {"processed": {
+        "receipt": {"cpu_usage_us": 1000},
+        "action_traces": [{"elapsed": 100}, {"elapsed": 300}]
+    }})
+    assert model.estimate(cheap) == 250
+    assert model.estimate(heavy) == 750
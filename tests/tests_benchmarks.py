@@ -0,0 +1,20 @@
+import json
+
+from benchmarks import BENCHMARKS, run, compare
+from benchmarks.__main__ import main
+
+
+def test_suite_runs_offline():
+    results = run(rounds=1, echo=None)
+    assert [x.name for x in results] == list(BENCHMARKS)
+    assert all(x.median > 0 for x in results)
+
+def test_compare(tmp_path):
+    results = run(["contract.cached"], rounds=3, echo=None)
+    assert compare(results, {"contract.cached": {"median": results[0].median * 10}}) == []
+    assert compare(results, {"contract.cached": {"median": results[0].median / 10}})
+
+    baseline = tmp_path / "baseline.json"
+    assert main(["-k", "actions.serialize", "--rounds", "2", "--save", str(baseline)]) == 0
+    assert "actions.serialize" in json.loads(baseline.read_text())
+    assert main(["-k", "actions.serialize", "--rounds", "2", "--compare", str(baseline), "--threshold", "100"]) == 0
@@ -0,0 +1,54 @@
+import time
+
+from litewax.chaincontext import ChainContext
+
+
+class FakeWax:
+    url = "http://fake"
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_chain_lib_info(self):
+        self.calls += 1
+        chain_info = {
+            "chain_id": "1064487b3cd1a897ce03ae5b6a865651747e2e152090f99c1d19d44e01aea5a4",
+            "last_irreversible_block_num": 1000 + self.calls
+        }
+        return chain_info, {"ref_block_prefix": self.calls}
+
+
+def test_ttl():
+    wax = FakeWax()
+    chain = ChainContext(wax, ttl=60)
+
+    for _ in range(10):
+        chain_info, lib_info = chain.get()
+
+    assert wax.calls == 1
+    assert chain.chain_id == chain_info["chain_id"]
+
+    chain.invalidate()
+    assert chain.get()[1]["ref_block_prefix"] == 2
+    assert wax.calls == 2
+
+def test_zero_ttl():
+    wax = FakeWax()
+    chain = ChainContext(wax, ttl=0)
+
+    chain.get()
+    chain.get()
+    assert wax.calls == 2
+
+def test_background():
+    wax = FakeWax()
+    chain = ChainContext(wax, ttl=0.2, background=True)
+    try:
+        time.sleep(0.5)
+        calls = wax.calls
+        assert calls >= 2
+
+        chain.get()
+        assert wax.calls - calls <= 1
+    finally:
+        chain.stop()
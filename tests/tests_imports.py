@@ -0,0 +1,31 @@
+import os
+import sys
+import json
+import subprocess
+
+HEAVY = ['requests', 'cloudscraper', 'eospy', 'eospy.cleos', 'eospy.types', 'eospy.keys', 'colander', 'pytz', 'httpx', 'ecdsa', 'coincurve', 'asyncio']
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded(code: str) -> dict:
+    script = (
+        "import sys, json\n"
+        f"{code}\n"
+        f"print(json.dumps({{'modules': [x for x in {HEAVY!r} if x in sys.modules]}}))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    out = subprocess.run([sys.executable, "-c", script], env=env, cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def test_import_is_light():
+    result = loaded("import litewax")
+    assert result["modules"] == []
+
+def test_clients_dont_load_http_stack():
+    result = loaded("import litewax; litewax.Contract; litewax.abigen; litewax.Client; litewax.MultiSigClient")
+    # only eospy.utils (key hashing of account lookups)
+    assert result["modules"] == ["eospy"]
+
+def test_lazy_exports():
+    result = loaded("import litewax; assert 'Client' in dir(litewax); from litewax import *; assert AsyncClient.__name__ == 'AsyncClient'")
+    assert 'asyncio' in result["modules"]
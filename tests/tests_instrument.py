@@ -0,0 +1,117 @@
+import contextlib
+
+import eospy.keys
+import pytest
+
+import litewax
+from litewax import instrument
+from litewax.instrument import Histogram, HistogramCollector, span, add_hook, remove_hook, set_tracer
+
+
+class FakeTracer:
+    def __init__(self):
+        self.spans = []
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        record = {"name": name, "attributes": dict(attributes or {})}
+        self.spans.append(record)
+
+        class Span:
+            def set_attribute(self, key, value):
+                record["attributes"][key] = value
+        yield Span()
+
+
+def test_noop_without_hooks():
+    assert span("push", node="x") is instrument._NOOP
+
+def test_hooks_and_outcome():
+    events = []
+    add_hook(events.append)
+    try:
+        with span("push", node="http://a") as s:
+            s.set(winner="http://a")
+        with pytest.raises(ValueError):
+            with span("sign", signer="private_key"):
+                raise ValueError("bad key")
+        with span("push", node="http://a") as s:
+            s.set(outcome="tx_cpu_usage_exceeded")
+    finally:
+        remove_hook(events.append)
+
+    assert [(x.stage, x.labels["outcome"]) for x in events] == [
+        ("push", "ok"), ("sign", "ValueError"), ("push", "tx_cpu_usage_exceeded")]
+    assert events[0].labels["winner"] == "http://a"
+    assert events[0].duration >= 0
+
+def test_broken_hook_is_ignored():
+    def hook(event):
+        raise RuntimeError
+    add_hook(hook)
+    try:
+        with span("encode"):
+            pass
+    finally:
+        remove_hook(hook)
+
+def test_tracer():
+    tracer = FakeTracer()
+    set_tracer(tracer)
+    try:
+        with span("tapos", node="http://a"):
+            pass
+    finally:
+        set_tracer(None)
+    assert tracer.spans == [{"name": "litewax.tapos", "attributes": {
+        "node": "http://a", "litewax.node": "http://a", "litewax.outcome": "ok"}}]
+
+def test_histogram():
+    h = Histogram()
+    for ms in range(1, 101):
+        h.observe(ms / 1000)
+    assert h.count == 100
+    assert 0.045 <= h.percentile(50) <= 0.055
+    assert 0.09 <= h.percentile(99) <= 0.1
+    assert h.percentile(100) == 0.1
+    assert Histogram().merge(h).merge(h).count == 200
+
+def test_collector_mixed_labels():
+    metrics = HistogramCollector()
+    metrics(instrument.Event("push", 0.01, {"node": None}))
+    metrics(instrument.Event("push", 0.02, {"node": "http://a"}))
+    metrics(instrument.Event("cosign", 0.03, {"payer": 1}))
+    metrics(instrument.Event("cosign", 0.03, {"payer": "nefty"}))
+    lines = str(metrics).splitlines()
+    assert len(lines) == 5
+    assert lines[1].startswith("cosign")
+
+def test_collector_end_to_end(chain):
+    _, url, transport = chain
+    with HistogramCollector() as metrics:
+        client = litewax.Client(private_key=eospy.keys.EOSKey().to_wif(), node=url, transport=transport)
+        token = client.Contract("eosio.token")
+        client.Transaction(token.transfer(_from=client.name, to="eosio", quantity="1.00000000 WAX", memo="")).push()
+
+        # payer action is already first (`Transaction` reverses arguments),
+        # signer and push endpoints are the local node
+        payer = litewax.Contract("neftyblocksd", actor="neftybrespay", node=client.wax).paycpu()
+        paid = client.Transaction(token.transfer(_from=client.name, to="eosio", quantity="1.00000000 WAX", memo=""), payer).pay_with("nefty")
+        paid.pay_with.sign_link = f"{url}/cosign"
+        paid.pay_with.push_link = f"{url}/v1/chain/send_transaction"
+        paid.push()
+
+    stages = {x["stage"] for x in metrics.snapshot()}
+    assert {"get_name", "serialize", "tapos", "encode", "sign", "cosign", "push"} <= stages
+    assert metrics.histogram("push", node=url, outcome="ok").count == 1
+    assert metrics.histogram("push", node=f"{url}/v1/chain/send_transaction").count == 1
+    assert metrics.histogram("sign", signer="private_key").count == 2
+    assert "cosign" in str(metrics)
+    assert metrics not in instrument._hooks
+
+def test_push_outcome():
+    from litewax.push import push_outcome
+    assert push_outcome({"transaction_id": "ab"}) == "ok"
+    assert push_outcome({"error": {"code": 3080004, "name": "tx_cpu_usage_exceeded"}}) == "tx_cpu_usage_exceeded"
+    assert push_outcome({"error": {"code": 3080004}}) == "3080004"
+    assert push_outcome({}) == "error"
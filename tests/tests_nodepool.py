@@ -0,0 +1,83 @@
+import pytest
+import requests
+
+from litewax.nodepool import NodePool
+from litewax.transport import Transport
+from litewax.exceptions import NodeUnavailable
+from .fakes import dead_node
+
+
+def node_reply(status, head_block_num=1000):
+    def reply(method, path, body):
+        if status != 200:
+            return status, {}
+        if method == "GET":
+            return 200, {"head_block_num": head_block_num, "chain_id": "00" * 32}
+        if path == "/v1/chain/push_transaction":
+            return 500, {"code": 500, "error": {"what": "Expired Transaction", "details": []}}
+        return 200, {"ok": True}
+    return reply
+
+
+@pytest.fixture()
+def servers(http_nodes):
+    def start(status, head_block_num=1000):
+        return http_nodes.start(node_reply(status, head_block_num))
+    return start
+
+def test_failover(servers):
+    good, good_hits = servers(200)
+    busy, busy_hits = servers(503)
+    dead = dead_node()
+
+    pool = NodePool([dead, busy, good], max_failures=1, transport=Transport())
+    wax = Transport().cleos(pool)
+
+    assert wax.get_info()["head_block_num"] == 1000
+    assert len(busy_hits) == 1
+
+    # broken nodes are in cooldown, next requests go straight to the good one
+    assert pool.best() == good
+    wax.get_info()
+    wax.post("chain.get_block", json={"block_num_or_id": 1})
+    assert len(busy_hits) == 1
+    assert len(good_hits) == 3
+
+def test_chain_error_is_not_failover(servers):
+    first, first_hits = servers(200)
+    second, second_hits = servers(200)
+
+    pool = NodePool([first, second], transport=Transport())
+    wax = pool.cleos()
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        wax.post("chain.push_transaction", json={})
+
+    assert len(first_hits) + len(second_hits) == 1
+
+def test_all_nodes_down():
+    pool = NodePool([dead_node(), dead_node()], transport=Transport())
+
+    with pytest.raises(NodeUnavailable):
+        pool.cleos().get_info(timeout=2)
+
+def test_health_check(servers):
+    fresh, _ = servers(200, head_block_num=1000)
+    lagging, _ = servers(200, head_block_num=900)
+    dead = dead_node()
+
+    pool = NodePool([lagging, dead, fresh], max_failures=1, transport=Transport())
+    pool.check()
+
+    ranked = pool.ranked()
+    assert ranked[0].url == fresh
+    assert not pool.is_healthy(pool.nodes[lagging])
+    assert not pool.is_healthy(pool.nodes[dead])
+
+def test_client_node_list(servers):
+    good, _ = servers(200)
+    transport = Transport()
+
+    wax = transport.cleos([dead_node(), good])
+    assert transport.cleos([wax.pool.urls[0], good]) is wax
+    assert wax.get_info()["head_block_num"] == 1000
@@ -0,0 +1,127 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from litewax.nodepool import NodePool
+from litewax.pipeline import TransactionPipeline, TokenBucket
+from .fakes import FakeAction, FakeTX, FakeWax
+
+
+def make_tx(node, actor, fail=False, gate=None):
+    return FakeTX(FakeAction(actor), wax=FakeWax(url=node), errors=[ValueError("rejected")] if fail else [], gate=gate)
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.19
+
+def test_results_stream():
+    txs = [make_tx("http://a", f"account{i}", fail=i == 3) for i in range(10)]
+    with TransactionPipeline(workers=4, node_rate=None) as pipeline:
+        futures = pipeline.map(txs)
+
+    results = list(pipeline.results())
+    assert len(results) == 10
+    assert sum(not x.ok for x in results) == 1
+    assert futures[0].result()["transaction_id"] == "ab" * 32
+    with pytest.raises(ValueError):
+        futures[3].result()
+    with pytest.raises(RuntimeError):
+        pipeline.submit(txs[0])
+
+def test_rate_limits():
+    node_a = [make_tx("http://a", f"account{i}") for i in range(6)]
+    node_b = [make_tx("http://b", f"other{i}") for i in range(6)]
+    one_account = [make_tx("http://c", "airdrop") for i in range(4)]
+
+    start = time.monotonic()
+    with TransactionPipeline(workers=8, node_rate=20, account_rate=10, burst=1) as pipeline:
+        pipeline.map(node_a + node_b + one_account)
+
+    # 20/s per node: 6 pushes need 250ms, nodes are limited independently
+    spread = lambda txs: max(x.pushed_at for x in txs) - min(x.pushed_at for x in txs)
+    assert spread(node_a) >= 0.2
+    assert spread(node_b) >= 0.2
+    # 10/s per account
+    assert spread(one_account) >= 0.25
+    assert time.monotonic() - start < 1.5
+
+def test_tokens_taken_at_push():
+    # transactions failing before the HTTP push (signing) spend no tokens
+    txs = [make_tx("http://a", f"account{i}", fail=i < 3) for i in range(4)]
+    start = time.monotonic()
+    with TransactionPipeline(workers=1, node_rate=2, burst=1) as pipeline:
+        futures = pipeline.map(txs)
+
+    assert futures[3].result()["transaction_id"] == "ab" * 32
+    assert time.monotonic() - start < 0.3
+
+def test_pool_shares_bucket():
+    pool = NodePool(["http://a", "http://b"])
+    txs = [make_tx("http://a" if i % 2 else "http://b", f"account{i}") for i in range(6)]
+    for tx in txs:
+        # best node of the pool changes between pushes
+        tx.wax.pool = pool
+
+    with TransactionPipeline(workers=6, node_rate=20, burst=1) as pipeline:
+        pipeline.map(txs)
+
+    assert max(x.pushed_at for x in txs) - min(x.pushed_at for x in txs) >= 0.2
+    assert list(pipeline._buckets) == [("node", ("http://a", "http://b"))]
+
+def test_backpressure():
+    gate = threading.Event()
+    pipeline = TransactionPipeline(workers=1, max_queue=1, node_rate=None)
+    pipeline.submit(make_tx("http://a", "a", gate=gate))
+    time.sleep(0.05) # worker picks the first one and blocks
+    pipeline.submit(make_tx("http://a", "a", gate=gate))
+
+    with pytest.raises(queue.Full):
+        pipeline.submit(make_tx("http://a", "a", gate=gate), timeout=0.1)
+
+    gate.set()
+    pipeline.close()
+    assert len(list(pipeline.results())) == 2
+
+def test_bounded_results():
+    txs = [make_tx("http://a", f"account{i}") for i in range(10)]
+    pipeline = TransactionPipeline(workers=2, node_rate=None, max_results=3)
+    pipeline.map(txs)
+    time.sleep(0.2)
+    # 3 unread results, each worker holds one more
+    assert sum(tx.pushes for tx in txs) == 5
+
+    pipeline.close(wait=False)
+    assert len(list(pipeline.results())) == 10
+
+def test_close_with_unread_results():
+    txs = [make_tx("http://a", f"account{i}") for i in range(10)]
+    pipeline = TransactionPipeline(workers=2, node_rate=None, max_results=3)
+    pipeline.map(txs)
+
+    closer = threading.Thread(target=pipeline.close)
+    closer.start()
+    closer.join(2)
+    assert not closer.is_alive()
+    assert len(list(pipeline.results())) == 10
+
+def test_result_callback():
+    seen = []
+    def on_result(result):
+        seen.append(result)
+        if len(seen) == 1:
+            raise ValueError("callback failed")
+
+    txs = [make_tx("http://a", f"account{i}", fail=i == 0) for i in range(10)]
+    with TransactionPipeline(workers=4, node_rate=None, on_result=on_result) as pipeline:
+        pipeline.map(txs)
+
+    assert len(seen) == 10
+    assert sum(not x.ok for x in seen) == 1
+    with pytest.raises(RuntimeError):
+        next(pipeline.results())
@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+import requests
+
+from litewax.push import (
+    broadcast_transaction, async_broadcast_transaction, broadcast_nodes, transaction_id
+)
+from litewax.nodepool import NodePool
+from litewax.transport import Transport
+from litewax.push import check_push_result
+from litewax.exceptions import UnknownError, NodeUnavailable, CPUlimit, ExpiredTransaction
+
+PACKED = "00" * 16
+TX_ID = transaction_id(PACKED)
+DUPLICATE = {"code": 409, "error": {"code": 3040008, "name": "tx_duplicate", "what": "Duplicate transaction", "details": []}}
+INVALID = {"code": 500, "error": {"code": 3050003, "what": "eosio_assert_message assertion failure",
+                                   "details": [{"message": "assertion failure with message: bad"}]}}
+
+
+@pytest.fixture()
+def servers(http_nodes):
+    def start(body, code=200, delay=0.0):
+        return http_nodes.start(lambda *_: (code, body), delay)
+    return start
+
+def test_first_receipt_wins(servers):
+    slow, slow_hits = servers({"transaction_id": TX_ID, "node": "slow"}, delay=1.0)
+    fast, _ = servers({"transaction_id": TX_ID, "node": "fast"})
+    dup, _ = servers(DUPLICATE, code=409)
+
+    start = time.monotonic()
+    resp = broadcast_transaction([slow, dup, fast], [], PACKED, requests.Session())
+    assert resp["node"] == "fast"
+    assert time.monotonic() - start < 1.0
+    # slow node may not have read the request yet when fast one answered
+    deadline = time.monotonic() + 1.0
+    while not slow_hits and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert slow_hits == ["/v1/chain/push_transaction"]
+
+def test_duplicate_only(servers):
+    first, _ = servers(DUPLICATE, code=409)
+    second, _ = servers(INVALID, code=500)
+
+    resp = broadcast_transaction([first, second], [], PACKED, requests.Session())
+    assert resp["transaction_id"] == TX_ID
+    assert resp["duplicate"]
+
+def test_rejected_everywhere(servers):
+    first, _ = servers(INVALID, code=500)
+    second, _ = servers(INVALID, code=500)
+
+    with pytest.raises(UnknownError):
+        broadcast_transaction([first, second], [], PACKED, requests.Session())
+
+def test_no_node_answered():
+    with pytest.raises(NodeUnavailable):
+        broadcast_transaction(["http://127.0.0.1:1"], [], PACKED, requests.Session(), timeout=2)
+
+def test_async_first_receipt_wins(servers):
+    slow, _ = servers({"transaction_id": TX_ID, "node": "slow"}, delay=1.0)
+    fast, _ = servers({"transaction_id": TX_ID, "node": "fast"})
+    dup, _ = servers(DUPLICATE, code=409)
+
+    async def main():
+        async with httpx.AsyncClient() as session:
+            start = time.monotonic()
+            resp = await async_broadcast_transaction([slow, dup, fast], [], PACKED, session)
+            assert time.monotonic() - start < 1.0
+            return resp
+
+    assert asyncio.run(main())["node"] == "fast"
+
+def test_broadcast_nodes():
+    pool = NodePool(["http://a", "http://b", "http://c"], transport=Transport())
+    wax = pool.cleos()
+    pool.report("http://b", latency=0.01)
+    pool.report("http://a", latency=0.2)
+    pool.report("http://c", latency=0.1)
+
+    assert broadcast_nodes(wax, True) == ["http://b", "http://c", "http://a"]
+    assert broadcast_nodes(wax, 2) == ["http://b", "http://c"]
+    assert broadcast_nodes(wax, ["http://x"]) == ["http://x"]
+    assert broadcast_nodes(Transport().cleos("http://single"), True) == ["http://single"]
+
+def test_push_errors_are_mapped(servers):
+    cpu, _ = servers({"code": 500, "error": {"code": 3080004, "what": "Transaction exceeded the current CPU usage limit imposed on the transaction"}}, code=500)
+    expired, _ = servers({"code": 500, "error": {"code": 3040005, "what": "Expired Transaction"}}, code=500)
+
+    transport = Transport()
+    with pytest.raises(CPUlimit):
+        check_push_result(transport.cleos(cpu).push_packed([], PACKED))
+    with pytest.raises(ExpiredTransaction):
+        check_push_result(transport.cleos(expired).push_packed([], PACKED))
+
+def test_duplicate_after_failover(servers):
+    # first node took the transaction but timed out / answered 503
+    busy, busy_hits = servers({}, code=503)
+    dup, _ = servers(DUPLICATE, code=409)
+
+    wax = Transport().cleos(NodePool([busy, dup], transport=Transport()))
+    resp = check_push_result(wax.push_packed([], PACKED), PACKED)
+    assert busy_hits == ["/v1/chain/push_transaction"]
+    assert resp["transaction_id"] == TX_ID
+    assert resp["duplicate"]
+
+    with pytest.raises(UnknownError):
+        check_push_result(DUPLICATE)
@@ -0,0 +1,111 @@
+import sys
+
+import eospy.keys
+import pytest
+
+import litewax
+from litewax import contract as contract_module
+from litewax.abicache import AbiCache
+from litewax.abigen import abigen
+from litewax.contract import ContractRegistry
+from .fakes import dead_node
+
+NODE = "https://wax.greymass.com"
+ABI = {
+    "version": "eosio::abi/1.1",
+    "structs": [{"name": "noop", "base": "", "fields": []}],
+    "actions": [{"name": "noop", "type": "noop"}]
+}
+
+
+class FakeNode:
+    def __init__(self):
+        self.abi_hash = "aa" * 32
+        self.hash_calls = 0
+
+    def fetch(self, account_name, known_hash=None):
+        self.hash_calls += 1
+        return self.abi_hash, None if known_hash == self.abi_hash else ABI
+
+
+@pytest.fixture()
+def registry(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in [x for x in sys.modules if x == "contracts" or x.startswith("contracts.")]:
+        monkeypatch.delitem(sys.modules, name)
+
+    node = FakeNode()
+    cache = AbiCache(NODE, path=str(tmp_path / "contracts" / ".abi_cache"))
+    cache.fetch = node.fetch
+
+    registry = ContractRegistry()
+    registry._generators[NODE] = abigen(NODE, cache=cache)
+
+    loads = []
+    load = registry._load
+    monkeypatch.setattr(registry, "_load", lambda *args: loads.append(args) or load(*args))
+    yield registry, node, loads
+
+def test_cached_class(registry):
+    registry, node, loads = registry
+
+    klass = registry.get("res.pink", NODE)
+    for _ in range(100):
+        assert registry.get("res.pink", NODE) is klass
+    assert len(loads) == 1
+    assert node.hash_calls == 1
+    assert klass(actor="res.pink").noop().account == "res.pink"
+
+def test_invalidate(registry):
+    registry, node, loads = registry
+
+    klass = registry.get("res.pink", NODE)
+    registry.invalidate("res.pink")
+    assert registry.get("res.pink", NODE) is klass
+    assert node.hash_calls == 2
+
+    # redeployed contract is regenerated
+    node.abi_hash = "bb" * 32
+    registry.invalidate()
+    registry.get("res.pink", NODE)
+    assert node.hash_calls == 2
+    registry.invalidate("res.pink", NODE)
+    assert sys.modules["contracts.res_pink"].ABI_HASH == "aa" * 32
+    registry.get("res.pink", NODE)
+    assert sys.modules["contracts.res_pink"].ABI_HASH == "bb" * 32
+    assert len(loads) == 4
+
+def test_no_ttl_by_default(registry):
+    registry, node, loads = registry
+
+    klass = registry.get("res.pink", NODE)
+    # hours later the class is still returned without node requests
+    key = next(iter(registry._current))
+    registry._current[key] = (registry._current[key][0], registry._current[key][1] - 86400)
+    assert registry.get("res.pink", NODE) is klass
+    assert len(loads) == 1
+    assert node.hash_calls == 1
+
+def test_ttl(registry):
+    registry, node, loads = registry
+    registry.ttl = 0
+
+    klass = registry.get("res.pink", NODE)
+    assert registry.get("res.pink", NODE) is klass
+    assert len(loads) == 2
+
+def test_pool_client_contracts(chain, tmp_path):
+    _, url, transport = chain
+    # closed port: contract requests must fail over to the working node
+    dead = dead_node()
+    client = litewax.Client(private_key=eospy.keys.EOSKey().to_wif(), node=[dead, url], transport=transport)
+    token = client.Contract("eosio.token")
+    assert token.wax is client.wax
+    assert token.node is client.wax.pool
+    assert token.transfer(_from=client.name, to="eosio", quantity="1.00000000 WAX", memo="").account == "eosio.token"
+    assert ((dead, url), "eosio.token") in contract_module.registry._current
+
+    cache = AbiCache([dead, NODE], path=str(tmp_path))
+    assert cache._account_file("res.pink").startswith(str(tmp_path / "accounts" / "pool-"))
+    assert AbiCache([NODE], path=str(tmp_path))._account_file("res.pink") == str(tmp_path / "accounts" / "wax.greymass.com" / "res.pink.json")
@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+from litewax.resources import AccountResources, ResourceMonitor, AsyncResourceMonitor
+from litewax.pipeline import TransactionPipeline
+from litewax.retry import DAY
+from .fakes import FakeAction, FakeClient, FakePayWith, FakeTX, FakeWax, AsyncFakeWax, account
+
+
+def make_tx(client, actor):
+    return FakeTX(FakeAction(actor), client=client,
+        receipt={"processed": {"receipt": {"cpu_usage_us": 400, "net_usage_words": 20}}},
+        payer_receipt={"processed": {"receipt": {"cpu_usage_us": 300, "net_usage_words": 20}}})
+
+
+def test_forecast():
+    now = time.monotonic()
+    res = AccountResources("abuztradewax", {"used": 8000, "max": 10000}, {"used": 0, "max": 100}, fetched_at=now)
+    assert res.cpu_available(now) == 2000
+    assert res.cpu_available(now + DAY / 2) == 6000
+    assert res.cpu_available(now + DAY * 2) == 10000
+
+    res.spend(cpu_us=1500)
+    assert 499 <= res.cpu_available() <= 501
+
+def test_cache_and_fits():
+    wax = FakeWax({"rich": account("rich", 0), "poor": account("poor", 9900)})
+    monitor = ResourceMonitor(wax, ttl=60)
+    client = FakeClient(wax)
+
+    assert monitor.fits(make_tx(client, "rich"))
+    assert not monitor.fits(make_tx(client, "poor"))
+    assert monitor.fits(make_tx(client, "rich"))
+    assert wax.calls == 2
+
+    monitor.invalidate("rich")
+    monitor.get("rich")
+    assert wax.calls == 3
+
+def test_record():
+    wax = FakeWax({"rich": account("rich", 9000)})
+    monitor = ResourceMonitor(wax, ttl=60)
+    tx = make_tx(FakeClient(wax), "rich")
+
+    assert monitor.fits(tx)
+    monitor.record(tx, {"processed": {"receipt": {"cpu_usage_us": 500, "net_usage_words": 10}}})
+    assert monitor.cost_model.estimate(tx.actions[0]) == 500
+    assert monitor.get("rich").cpu_available() < 501
+    assert not monitor.fits(tx)
+
+def test_pipeline_routes_to_payer():
+    wax = FakeWax({"rich": account("rich", 0), "poor": account("poor", 9900)})
+    client = FakeClient(wax)
+    txs = [make_tx(client, "rich"), make_tx(client, "poor")]
+
+    with TransactionPipeline(workers=2, node_rate=None, pay_with="payer") as pipeline:
+        pipeline.map(txs)
+
+    pushed = [x.tx for x in pipeline.results()]
+    assert txs[0] in pushed
+    assert any(isinstance(x, FakePayWith) and x.trx is txs[1] for x in pushed)
+
+def test_async_monitor():
+    wax = AsyncFakeWax({"rich": account("rich", 0)})
+    monitor = AsyncResourceMonitor(wax, ttl=60)
+
+    async def main():
+        return await asyncio.gather(*[monitor.get("rich") for _ in range(5)])
+
+    entries = asyncio.run(main())
+    assert len({id(x) for x in entries}) == 1
+    assert wax.calls == 1
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+import litewax.retry
+from litewax.retry import RetryPolicy, cpu_recovery_time, DAY
+from litewax.exceptions import CPUlimit, ExpiredTransaction
+from .fakes import FakeAction, FakeTX, FakeWax
+
+
+def make_tx(errors, cpu=None):
+    cpu_limit = cpu or {"used": 0, "available": 0, "max": 0}
+    wax = FakeWax({"abuztradewax": {"account_name": "abuztradewax", "cpu_limit": cpu_limit}})
+    return FakeTX(FakeAction(), wax=wax, errors=errors)
+
+
+@pytest.fixture()
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(litewax.retry.time, "sleep", calls.append)
+    return calls
+
+def test_recovery_time():
+    assert cpu_recovery_time(used=100, max_cpu=1000, needed=500) == 0
+    # usage has to decay from 1000 to 500
+    assert cpu_recovery_time(used=1000, max_cpu=1000, needed=500) == pytest.approx(DAY / 2)
+    assert cpu_recovery_time(used=1000, max_cpu=1000, needed=2000) == float('inf')
+
+def test_expired_is_resigned(sleeps):
+    tx = make_tx([ExpiredTransaction(), ExpiredTransaction()])
+    resp = RetryPolicy(expiration=120).run(tx)
+
+    assert resp["transaction_id"] == "ab" * 32
+    assert tx.pushes == 3
+    assert tx.client.chain.invalidated == 2
+    assert tx.expiration == 120
+    assert sleeps == []
+
+def test_cpu_wait(sleeps):
+    # 1000us of 1000us used, 1ms needed: recovers after ~86s, capped by max_delay
+    tx = make_tx([CPUlimit()], cpu={"used": 1000, "available": 0, "max": 1000})
+    RetryPolicy(cpu_needed_us=1, max_delay=60).run(tx)
+    assert sleeps == [60]
+
+    tx = make_tx([CPUlimit()], cpu={"used": 100000, "available": 0, "max": 100000})
+    RetryPolicy(cpu_needed_us=100, max_delay=600).run(tx)
+    assert sleeps[1] == pytest.approx(DAY * 0.001)
+
+def test_switch_to_payer(sleeps):
+    tx = make_tx([CPUlimit()])
+    resp = RetryPolicy(pay_with="atomichub").run(tx)
+
+    assert resp["transaction_id"] == "cd" * 32
+    assert tx.payer.payer == "atomichub"
+    assert sleeps == []
+
+def test_give_up(sleeps):
+    tx = make_tx([ExpiredTransaction()] * 3)
+    with pytest.raises(ExpiredTransaction):
+        RetryPolicy(max_attempts=3).run(tx)
+    assert tx.pushes == 3
+
+    # account can never afford the transaction
+    tx = make_tx([CPUlimit()], cpu={"used": 10, "available": 0, "max": 10})
+    with pytest.raises(CPUlimit):
+        RetryPolicy(cpu_needed_us=100).run(tx)
+
+def test_async_retry(monkeypatch):
+    class AsyncTX(FakeTX):
+        async def push(self):
+            return FakeTX.push(self)
+
+    class AsyncWax(FakeWax):
+        async def get_account(self, name):
+            return FakeWax.get_account(self, name)
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    sleeps = []
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+
+    wax = AsyncWax({"abuztradewax": {"account_name": "abuztradewax", "cpu_limit": {"used": 0, "available": 1000, "max": 1000}}})
+    tx = AsyncTX(FakeAction(), wax=wax, errors=[ExpiredTransaction(), CPUlimit()])
+    resp = asyncio.run(RetryPolicy(base_delay=0.5).run_async(tx))
+
+    assert resp["transaction_id"] == "ab" * 32
+    assert sleeps == [0.5]
@@ -0,0 +1,148 @@
+import pytest
+
+from litewax.serializer import AbiSerializer, string_to_name, name_to_string
+from litewax.exceptions import SerializationError
+
+ABI = {
+    "version": "eosio::abi/1.1",
+    "types": [{"new_type_name": "account_name", "type": "name"}],
+    "structs": [
+        {"name": "transfer", "base": "", "fields": [
+            {"name": "from", "type": "account_name"},
+            {"name": "to", "type": "name"},
+            {"name": "quantity", "type": "asset"},
+            {"name": "memo", "type": "string"}
+        ]},
+        {"name": "base_args", "base": "", "fields": [
+            {"name": "owner", "type": "name"}
+        ]},
+        {"name": "complex", "base": "base_args", "fields": [
+            {"name": "ids", "type": "uint64[]"},
+            {"name": "note", "type": "string?"},
+            {"name": "value", "type": "atomic_value"},
+            {"name": "price", "type": "extended_asset"},
+            {"name": "sym", "type": "symbol"},
+            {"name": "ext", "type": "uint8$"}
+        ]}
+    ],
+    "actions": [
+        {"name": "transfer", "type": "transfer"},
+        {"name": "complexact", "type": "complex"}
+    ],
+    "tables": [],
+    "variants": [{"name": "atomic_value", "types": ["int8", "string"]}]
+}
+
+
+def test_names():
+    assert string_to_name("eosio") == 0x5530ea0000000000
+    assert name_to_string(string_to_name("eosio.token")) == "eosio.token"
+    assert name_to_string(string_to_name("zknmi.wam")) == "zknmi.wam"
+
+    with pytest.raises(SerializationError):
+        string_to_name("BAD")
+
+def test_transfer():
+    s = AbiSerializer(ABI)
+    data = s.json_to_bin("transfer", {
+        "from": "eosio",
+        "to": "eosio.token",
+        "quantity": "1.0000 EOS",
+        "memo": "hi"
+    })
+    assert data == "0000000000ea3055" "00a6823403ea3055" "1027000000000000" "04454f5300000000" "026869"
+
+def test_complex():
+    s = AbiSerializer(ABI)
+    data = s.serialize_action("complexact", {
+        "owner": "eosio",
+        "ids": [1, "2"],
+        "note": None,
+        "value": ["string", "a"],
+        "price": {"quantity": "0.00000001 WAX", "contract": "eosio.token"},
+        "sym": "8,WAX"
+    })
+    assert data == bytes.fromhex(
+        "0000000000ea3055"
+        "02" "0100000000000000" "0200000000000000"
+        "00"
+        "01" "0161"
+        "0100000000000000" "0857415800000000" "00a6823403ea3055"
+        "0857415800000000"
+    )
+
+def test_missing_field():
+    s = AbiSerializer(ABI)
+    with pytest.raises(SerializationError):
+        s.json_to_bin("transfer", {"from": "eosio"})
+
+    with pytest.raises(SerializationError):
+        s.json_to_bin("unknown", {})
+
+def test_top_level_errors():
+    s = AbiSerializer(ABI)
+    # builtin and alias types outside of a struct
+    for type_name, value in [("uint8", 256), ("uint64", "abc"), ("account_name", 5), ("asset", "1 WAX WAX"), ("uint64[]", [None])]:
+        with pytest.raises(SerializationError):
+            s.serialize(type_name, value)
+
+def test_deserialize():
+    s = AbiSerializer(ABI)
+    transfer = {"from": "eosio", "to": "eosio.token", "quantity": "-1.0000 EOS", "memo": "hi"}
+    assert s.bin_to_json("transfer", s.json_to_bin("transfer", transfer)) == transfer
+
+    complex_value = {
+        "owner": "eosio",
+        "ids": [1, 2],
+        "note": "x",
+        "value": ["string", "a"],
+        "price": {"quantity": "0.00000001 WAX", "contract": "eosio.token"},
+        "sym": "8,WAX"
+    }
+    assert s.deserialize("complex", s.serialize("complex", complex_value)) == complex_value
+    assert s.deserialize("complex", s.serialize("complex", dict(complex_value, ext=7)))["ext"] == 7
+
+    assert s.deserialize("time_point_sec", s.serialize("time_point_sec", "2021-06-01T12:00:00")) == "2021-06-01T12:00:00"
+    assert s.deserialize("time_point", s.serialize("time_point", "2021-06-01T12:00:00.500")) == "2021-06-01T12:00:00.500"
+    assert s.deserialize("asset", s.serialize("asset", "5 TLM")) == "5 TLM"
+
+    key = s.deserialize("public_key", s.serialize("public_key", "EOS6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV"))
+    assert key == "PUB_K1_6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5BoDq63"
+    assert s.serialize("public_key", key) == s.serialize("public_key", "EOS6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV")
+
+    with pytest.raises(SerializationError):
+        s.bin_to_json("transfer", "0000000000ea3055")
+
+def test_records():
+    s = AbiSerializer(ABI)
+    record = s.record_class("transfer")
+    assert s.record_class("transfer") is record
+    assert record.__slots__ == ("_from", "to", "quantity", "memo")
+
+    raw = s.serialize_action("transfer", {"from": "eosio", "to": "eosio.token", "quantity": "1.0000 EOS", "memo": "hi"})
+    row = record.from_hex(raw.hex())
+    assert row._raw == raw
+    assert record.OFFSETS == (0, 8, 16, 32)
+    assert row.quantity == "1.0000 EOS"
+    # fields at static offsets are decoded alone
+    assert row._raw == raw
+    assert row._from == row["from"] == "eosio"
+    assert row.to_dict() == {"from": "eosio", "to": "eosio.token", "quantity": "1.0000 EOS", "memo": "hi"}
+    assert row._raw is None
+    assert not hasattr(row, "__dict__")
+
+    numbers = s.record_class("complex")
+    rows = [numbers(s.serialize("complex", {
+        "owner": "eosio", "ids": [i], "note": None, "value": ["int8", i],
+        "price": {"quantity": "1.00000000 WAX", "contract": "eosio.token"}, "sym": "8,WAX"
+    })) for i in range(3)]
+    # field after a variable size one decodes the whole row
+    assert numbers.OFFSETS[-5:] == (None,) * 5
+    assert rows[1].sym == "8,WAX"
+    assert rows[1]._raw is None
+    assert rows[1].ids == [1]
+
+    columns = numbers.columns(rows)
+    assert columns["ids"] == [[0], [1], [2]]
+    assert columns["ext"] == [None, None, None]
+    assert columns["value"][2] == ["int8", 2]
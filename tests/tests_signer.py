@@ -0,0 +1,88 @@
+import hashlib
+
+import eospy.keys
+import pytest
+
+from litewax import signer as signer_module
+from litewax.signer import Signer, get_signer, sign_batch, batch_threshold, shutdown, coincurve
+from .fakes import FakeAction, FakeChain
+
+# well-known eosio development key
+WIF = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+PUBLIC = "EOS6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV"
+
+BACKENDS = ["ecdsa"] + (["coincurve"] if coincurve is not None else [])
+
+
+def digest(data) -> str:
+    return hashlib.sha256(str(data).encode()).hexdigest()
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_known_signatures(backend):
+    signer = Signer(WIF, backend=backend)
+    assert signer.to_public() == PUBLIC
+    assert signer.sign(digest("litewax")) == "SIG_K1_KiM5iKp77pY7nwy8wq2udiNGR2Bum3FgzTR9aN5Zn7QDuMjxWXeAymYWMsQCWsnCbQMAAW3ocm5b5bscGVutX5BQ4ywuqr"
+    # first nonce is not canonical, signer has to retry
+    assert signer.sign(digest(1)) == "SIG_K1_Kepg3ANzbNpGU3aGdcC6e3HCrLbKPsxpzn5ajhth5WgS6ALDYejqDvkTMAYzagMjccjPwT7tLdSJYsijtxcUvrbAFF2VzE"
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_same_as_eospy(backend):
+    key = eospy.keys.EOSKey(WIF)
+    signer = Signer(WIF, backend=backend)
+    for i in range(50):
+        assert signer.sign(digest(i)) == key.sign(digest(i))
+        assert key.verify(signer.sign(digest(i)), digest(i))
+
+def test_cached_signer():
+    assert get_signer(WIF) is get_signer(WIF)
+    assert get_signer(WIF, "ecdsa") is not get_signer(WIF)
+
+def test_bad_input():
+    with pytest.raises(ValueError):
+        Signer(WIF, backend="openssl")
+    with pytest.raises(ValueError):
+        Signer(WIF).sign("00")
+
+def test_sign_batch():
+    keys = [eospy.keys.EOSKey(WIF)] + [eospy.keys.EOSKey() for _ in range(3)]
+    items = [(digest(i), keys[i % len(keys)].to_wif()) for i in range(40)]
+    expected = [keys[i % len(keys)].sign(d) for i, (d, _) in enumerate(items)]
+
+    assert sign_batch(items, min_batch=1000) == expected
+    try:
+        assert sign_batch(items, processes=2, min_batch=1) == expected
+        assert sign_batch([(d, get_signer(k)) for d, k in items], processes=2, min_batch=1) == expected
+    finally:
+        shutdown()
+
+def test_batch_threshold(monkeypatch):
+    monkeypatch.setattr(signer_module, "CPUS", 4)
+    assert batch_threshold([get_signer(WIF, "ecdsa")]) == signer_module.MIN_BATCH["ecdsa"]
+    if coincurve is not None:
+        assert batch_threshold([get_signer(WIF, "coincurve")]) == signer_module.MIN_BATCH["coincurve"]
+        assert batch_threshold([get_signer(WIF, "coincurve"), get_signer(WIF, "ecdsa")]) == signer_module.MIN_BATCH["ecdsa"]
+
+    # no pool on a single CPU
+    monkeypatch.setattr(signer_module, "CPUS", 1)
+    assert batch_threshold([get_signer(WIF, "ecdsa")]) is None
+
+def test_multisig_uses_pool(monkeypatch):
+    from litewax.multisigclient import MultiSigClient
+
+    monkeypatch.setattr(signer_module, "CPUS", 4)
+    pooled = []
+    get_pool = signer_module._get_pool
+    monkeypatch.setattr(signer_module, "_get_pool", lambda processes=None: pooled.append(processes) or get_pool(2))
+
+    keys = [eospy.keys.EOSKey() for _ in range(10)]
+    names = {k.to_wif(): f"cosigner{chr(ord('a') + i)}" for i, k in enumerate(keys)}
+    client = MultiSigClient(private_keys=list(names), names=names, lazy=True, signer_backend="ecdsa")
+    client.chain = FakeChain()
+
+    try:
+        signed = client.Transaction(*[FakeAction(name) for name in names.values()]).get_trx_extend_info()
+    finally:
+        shutdown()
+    assert len(pooled) == 1
+    for key, signature in zip(keys, signed["signatures"]):
+        assert key.verify(signature, signed.digest)
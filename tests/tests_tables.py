@@ -0,0 +1,164 @@
+import array
+import asyncio
+import importlib.util
+import threading
+
+import pytest
+
+from litewax.abicache import AbiCache
+from litewax.abigen import abigen
+from litewax.serializer import AbiSerializer, string_to_name
+from litewax.tables import TableReader, AsyncTableReader
+from litewax.asyncclient import AsyncCleos
+
+ABI = {
+    "version": "eosio::abi/1.1",
+    "structs": [
+        {"name": "account", "base": "", "fields": [{"name": "balance", "type": "asset"}]},
+        {"name": "transfer", "base": "", "fields": [
+            {"name": "from", "type": "name"},
+            {"name": "to", "type": "name"},
+            {"name": "quantity", "type": "asset"},
+            {"name": "memo", "type": "string"}
+        ]},
+        {"name": "row", "base": "", "fields": [{"name": "id", "type": "uint64"}]}
+    ],
+    "actions": [{"name": "transfer", "type": "transfer"}],
+    "tables": [
+        {"name": "accounts", "index_type": "i64", "key_names": [], "key_types": [], "type": "account"},
+        {"name": "transfer", "index_type": "i64", "key_names": [], "key_types": [], "type": "row"}
+    ]
+}
+
+
+class FakeWax:
+    """
+    Table of ids 0..size-1 with nodeos pagination
+    """
+    url = "http://fake"
+
+    def __init__(self, size):
+        self.size = size
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def post(self, func, json=None, timeout=30):
+        assert func == "chain.get_table_rows"
+        with self.lock:
+            self.requests.append(json)
+        lower = int(json.get("lower_bound", 0))
+        upper = min(int(json.get("upper_bound", self.size - 1)), self.size - 1)
+        ids = list(range(lower, upper + 1))
+        if json["reverse"]:
+            ids.reverse()
+        page, rest = ids[:json["limit"]], ids[json["limit"]:]
+        return {
+            "rows": [{"id": x} if json["json"] else x.to_bytes(8, "little").hex() for x in page],
+            "more": bool(rest),
+            "next_key": str(rest[0]) if rest else ""
+        }
+
+
+def test_pagination():
+    wax = FakeWax(250)
+    reader = TableReader(wax, "eosio.token", "accounts", limit=100)
+    assert [x["id"] for x in reader] == list(range(250))
+    assert len(wax.requests) == 3
+    assert wax.requests[0]["scope"] == "eosio.token"
+    assert wax.requests[2]["lower_bound"] == "200"
+
+    rows = TableReader(wax, "eosio.token", "accounts", upper_bound=120, limit=50, reverse=True)
+    assert [x["id"] for x in rows] == list(range(120, -1, -1))
+
+class AsyncFakeWax(FakeWax):
+    async def post(self, func, json=None, timeout=30):
+        return FakeWax.post(self, func, json=json, timeout=timeout)
+
+
+def test_async_pagination():
+    async def scan():
+        return [x["id"] async for x in AsyncTableReader(AsyncFakeWax(250), "eosio.token", "accounts")]
+
+    assert asyncio.run(scan()) == list(range(250))
+
+def test_binary_rows():
+    wax = FakeWax(300)
+    record = AbiSerializer(ABI).table_record("transfer")
+    reader = TableReader(wax, "eosio.token", "transfer", limit=100, record=record)
+
+    rows = list(reader)
+    assert wax.requests[0]["json"] is False
+    assert isinstance(rows[0], record)
+    assert [x.id for x in rows] == list(range(300))
+
+    columns = reader.columns()
+    assert columns["id"] == array.array("Q", range(300))
+
+    with pytest.raises(ValueError):
+        TableReader(wax, "eosio.token", "transfer").columns()
+
+def test_lazy():
+    wax = FakeWax(1000)
+    rows = iter(TableReader(wax, "eosio.token", "accounts", limit=10))
+    assert wax.requests == []
+    assert next(rows) == {"id": 0}
+    assert len(wax.requests) == 1
+
+def test_split_and_parallel():
+    wax = FakeWax(1000)
+    reader = TableReader(wax, "eosio.token", "accounts", lower_bound=0, upper_bound=999, limit=64)
+    parts = reader.split(4)
+    assert [(x.lower_bound, x.upper_bound) for x in parts] == [(0, 248), (249, 497), (498, 746), (747, 999)]
+
+    assert sorted(x["id"] for x in reader.parallel(parts=4, max_pages=2)) == list(range(1000))
+
+    with pytest.raises(ValueError):
+        TableReader(wax, "eosio.token", "accounts", key_type="sha256").split(2)
+
+    assert TableReader(wax, "eosio.token", "accounts", lower_bound="eosio").split(2)[0].lower_bound == 6138663577826885632
+
+def test_split_name_keys():
+    reader = TableReader(FakeWax(0), "eosio.token", "accounts", lower_bound="12345", upper_bound="zzzzz", key_type="name")
+    parts = reader.split(3)
+    # bounds stay account names, digits are name characters
+    assert parts[0].lower_bound == "12345"
+    assert parts[-1].upper_bound == "zzzzz"
+    assert all(isinstance(x.lower_bound, str) and isinstance(x.upper_bound, str) for x in parts)
+    assert [string_to_name(x.lower_bound) for x in parts[1:]] == [string_to_name(x.upper_bound) + 1 for x in parts[:-1]]
+    assert TableReader(FakeWax(0), "eosio.token", "accounts", key_type="name").split(2)[-1].upper_bound == "zzzzzzzzzzzzj"
+
+def test_parallel_early_stop():
+    wax = FakeWax(10 ** 5)
+    rows = TableReader(wax, "eosio.token", "accounts", upper_bound=10 ** 5 - 1, limit=10).parallel(parts=4, max_pages=2)
+    assert len([x for _, x in zip(range(25), rows)]) == 25
+    rows.close()
+    assert len(wax.requests) < 30
+
+def test_generated_tables(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = AbiCache(path=str(tmp_path / ".abi_cache"))
+    cache.fetch = lambda account_name, known_hash=None: ("aa" * 32, ABI)
+    abigen(cache=cache).gen("eosio.token")
+
+    spec = importlib.util.spec_from_file_location("eosio_token", tmp_path / "contracts" / "eosio_token.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    contract = mod.eosio_token(actor="abuztradewax")
+
+    assert mod.eosio_token.TABLES == {"accounts": ("balance",), "transfer": ("id",)}
+    reader = contract.accounts(scope="abuztradewax", limit=10)
+    assert (reader.code, reader.table, reader.scope, reader.limit) == ("eosio.token", "accounts", "abuztradewax", 10)
+    # table named like an action gets suffix
+    assert contract.transfer_table().table == "transfer"
+    assert contract.transfer(_from="a", to="b", quantity="1.00000000 WAX", memo="").name == "transfer"
+    with pytest.raises(ValueError):
+        contract.table("unknown")
+    assert contract.accounts(binary=True).record.FIELDS == ("balance",)
+    # row struct named like a class attribute does not shadow it (and is no action method)
+    assert contract.account == "eosio.token"
+    assert not hasattr(contract, "account_action")
+
+    # contract of async client reads tables with `async for`
+    async_contract = mod.eosio_token(actor="abuztradewax", wax=AsyncCleos("http://fake", session=object()))
+    assert isinstance(async_contract.accounts(), AsyncTableReader)
+    assert type(contract.accounts()) is TableReader
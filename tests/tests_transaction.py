@@ -0,0 +1,48 @@
+import datetime as dt
+
+from eospy.types import Transaction
+from eospy.utils import sig_digest
+import pytz
+
+from litewax.transaction import PackedTransaction, SignedTransaction
+
+CHAIN_ID = "1064487b3cd1a897ce03ae5b6a865651747e2e152090f99c1d19d44e01aea5a4"
+CHAIN_INFO = {"chain_id": CHAIN_ID, "last_irreversible_block_num": 100}
+LIB_INFO = {"ref_block_prefix": 12345}
+ACTIONS = [{
+    "account": "res.pink",
+    "name": "noop",
+    "authorization": [{"actor": "abuztradewax", "permission": "active"}],
+    "data": ""
+}]
+
+
+def test_packed_transaction():
+    trx = PackedTransaction.build(ACTIONS, CHAIN_INFO, LIB_INFO)
+    assert isinstance(trx.raw, bytes)
+
+    # same bytes as eospy with the same expiration
+    expiration = bytes(trx.raw[:4])
+    eospy_trx = Transaction({
+        "actions": ACTIONS,
+        "expiration": str(dt.datetime.fromtimestamp(int.from_bytes(expiration, 'little'), tz=pytz.UTC))
+    }, CHAIN_INFO, LIB_INFO)
+    assert trx.raw == bytes(eospy_trx.encode())
+
+    assert trx.hex == trx.raw.hex()
+    assert trx.serealized == list(trx.raw)
+    assert trx.serealized is trx.serealized
+    assert trx.digest == sig_digest(bytearray(trx.raw), CHAIN_ID)
+
+def test_signed_transaction():
+    trx = PackedTransaction.build(ACTIONS, CHAIN_INFO, LIB_INFO)
+    signed = SignedTransaction(trx, ["SIG_K1_x"])
+
+    assert dict(signed) == {
+        "signatures": ["SIG_K1_x"],
+        "packed": trx.hex,
+        "serealized": list(trx.raw)
+    }
+    assert signed["packed"] == signed.packed
+    assert signed.digest == trx.digest
+    assert signed.get("packed_trx") is None
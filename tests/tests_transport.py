@@ -0,0 +1,55 @@
+import pytest
+
+from litewax.transport import Transport, PooledCleos
+
+
+def reply(method, path, body):
+    if method == "GET":
+        return 200, {"chain_id": "00" * 32, "path": path}
+    if path == "/v1/chain/get_abi":
+        return 500, {"code": 500, "error": {"what": "unknown key"}}
+    return 200, {"path": path, "body": body or {}}
+
+
+@pytest.fixture()
+def connections():
+    return set()
+
+@pytest.fixture()
+def node(http_nodes, connections):
+    url, _ = http_nodes.start(reply, connections=connections)
+    return url
+
+def test_cleos_shared(node, connections):
+    transport = Transport()
+    wax = transport.cleos(node)
+
+    assert isinstance(wax, PooledCleos)
+    assert transport.cleos(node) is wax
+
+    for _ in range(10):
+        assert wax.get_info()["path"] == "/v1/chain/get_info"
+    assert wax.post("chain.get_block", json={"block_num_or_id": 1})["body"] == {"block_num_or_id": 1}
+
+    # all requests went through one keep-alive connection
+    assert len(connections) == 1
+
+def test_scrapers_share_pool(node, connections):
+    transport = Transport()
+    first = transport.scraper()
+    second = transport.scraper()
+
+    assert first is not second
+    assert first.adapters["http://"] is second.adapters["http://"] is transport.adapter
+    assert transport.scraper(key="nefty") is transport.scraper(key="nefty")
+
+    first.get(f"{node}/a")
+    second.get(f"{node}/b")
+    transport.cleos(node).get_info()
+    assert len(connections) == 1
+
+def test_cleos_errors(node):
+    import requests
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        Transport().cleos(node).get_abi("badcontract")
@@ -1,16 +1,23 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
 import pytest
-from dotenv import dotenv_values
-ENV = dotenv_values(".env")
 
-PVT_KEY = ENV.get("PVT_KEY")
-COOKIE = ENV.get("COOKIE")
+import litewax
+from litewax.wcw import AsyncWCWSession, get_wcw_session, sign_body
+from litewax.exceptions import CookiesExpired
+from .fakes import SIGNATURE
 
-from requests.exceptions import ConnectionError
 
-from litewax import WCW
+def wcw_client(chain, cookie="cookie", **kwargs) -> litewax.Client:
+    _, url, transport = chain
+    return litewax.Client(cookie=cookie, node=url, transport=transport, **kwargs)
 
-def test_contract():
-    wcw = WCW(session_token=COOKIE)
+def test_contract(chain):
+    wcw = wcw_client(chain)
     contract = wcw.Contract("eosio.token")
 
     from contracts.eosio_token import eosio_token
@@ -18,37 +25,36 @@ def test_contract():
     assert isinstance(contract, eosio_token)
     assert contract.actor == "zknmi.wam"
     assert contract.permission == "active"
-    assert contract.wax._prod_url == "https://wax.greymass.com"
+    assert contract.wax.url == chain[1]
 
-def test_set_node():
-    wcw = WCW(session_token=COOKIE)
+def test_set_node(chain):
+    wcw = wcw_client(chain)
 
-    assert wcw.node == "https://wax.greymass.com"
+    assert wcw.node == chain[1]
 
     wcw.SetNode('http://wax.pink.gg')
 
     assert wcw.node == "http://wax.pink.gg"
 
-def test_get_name():
-    wcw = WCW(session_token=COOKIE)
+def test_get_name(chain):
+    wcw = wcw_client(chain)
 
     assert wcw.GetName() == "zknmi.wam"
 
-def test_transaction_fail():
-    wcw = WCW(session_token=COOKIE)
+def test_transaction_fail(chain):
+    wcw = wcw_client(chain)
 
     with pytest.raises(ValueError):
-        trx = wcw.Transaction()
-
+        wcw.Transaction()
 
+def test_transaction_good(chain):
+    node, _, _ = chain
+    wcw = wcw_client(chain)
 
-def test_transaction_good():
-    wcw = WCW(session_token=COOKIE)
-
-    from litewax.wcw import TX
+    from litewax.client import TX
 
     trx = wcw.Transaction(
-        wcw.Contract("res.pink").noop()
+        wcw.Contract("eosio.token").transfer(_from=wcw.name, to="eosio", quantity="1.00000000 WAX", memo="")
     )
 
     assert isinstance(trx, TX)
@@ -57,7 +63,76 @@ def test_transaction_good():
 
     assert isinstance(res, dict)
     assert res.get("transaction_id") is not None
-
-
-
-
+    assert node.pushed[0]["signatures"] == [SIGNATURE]
+
+def test_sign_body():
+    body = json.loads(sign_body(b"\x01\xff"))
+    assert body["serializedTransaction"] == [1, 255]
+    assert body["freeBandwidth"] is True
+
+def test_preflight_once_and_shared_session(chain):
+    node, _, _ = chain
+    first = wcw_client(chain)
+    second = wcw_client(chain)
+    assert first.wcw is second.wcw
+
+    for _ in range(3):
+        assert first.sign(b"\x00" * 32) == second.sign(b"\x00" * 32)
+    assert node.calls["/wam/sign"] == 6
+    assert node.calls["OPTIONS /wam/sign"] == 1
+
+    client = wcw_client(chain)
+    client.Transaction(client.Contract("eosio.token").transfer(_from=client.name, to="eosio", quantity="1.00000000 WAX", memo="")).push()
+    assert node.calls["OPTIONS /wam/sign"] == 1
+
+def test_concurrency_limit(chain):
+    node, _, transport = chain
+    node.sign_delay = 0.1
+    client = wcw_client(chain, cookie="limited", wcw_concurrency=2)
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(client.sign, [b"\x00" * 32] * 6))
+    assert node.peak == 2
+    assert get_wcw_session("limited", transport, 2) is client.wcw
+
+def test_other_concurrency_gets_own_session(chain):
+    _, _, transport = chain
+    limited = wcw_client(chain, cookie="limited", wcw_concurrency=2)
+    slots = limited.wcw._slots
+
+    other = wcw_client(chain, cookie="limited", wcw_concurrency=8)
+    # sign requests of the first client keep their semaphore
+    assert other.wcw is not limited.wcw
+    assert limited.wcw._slots is slots
+    assert (limited.wcw.concurrency, other.wcw.concurrency) == (2, 8)
+    assert get_wcw_session("limited", transport) is wcw_client(chain, cookie="limited").wcw
+
+def test_async_session():
+    state = {"options": 0, "in_flight": 0, "peak": 0}
+    lock = threading.Lock()
+
+    async def handler(request):
+        if request.method == "OPTIONS":
+            state["options"] += 1
+            return httpx.Response(204)
+        if request.url.path == "/v1/accounts/auto-accept/login":
+            return httpx.Response(200, json={"message": "expired"})
+        assert request.headers["x-access-token"] == "cookie"
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.05)
+        with lock:
+            state["in_flight"] -= 1
+        return httpx.Response(200, json={"signatures": ["SIG_K1_x"]})
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as session:
+            wcw = AsyncWCWSession("cookie", session, concurrency=3)
+            results = await asyncio.gather(*[wcw.sign(b"\x00" * 32) for _ in range(9)])
+            assert results == [["SIG_K1_x"]] * 9
+            with pytest.raises(CookiesExpired):
+                await wcw.login()
+
+    asyncio.run(main())
+    assert state["options"] == 1
+    assert state["peak"] == 3